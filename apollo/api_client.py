@@ -1,6 +1,20 @@
+import json
+import random
 import requests
+import threading
+from requests.adapters import HTTPAdapter
 import time
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
+from apollo.circuit_breaker import CircuitBreaker
+from apollo.rate_limiter import RateLimiter
+from apollo.single_flight import SingleFlight
+from metrics import (
+    APOLLO_REQUEST_SECONDS, APOLLO_REQUESTS, APOLLO_RETRIES,
+    APOLLO_RATE_LIMITED, APOLLO_CREDITS, APOLLO_COALESCED
+)
+
+# Free, read-only endpoint families whose identical concurrent calls are merged
+COALESCED_FAMILIES = frozenset({'people_search', 'organizations'})
 
 
 class ApolloAPIError(Exception):
@@ -31,19 +45,79 @@ class InsufficientCreditsError(ApolloAPIError):
     pass
 
 
+class ServerError(ApolloAPIError):
+    """Apollo server-side failure (HTTP 5xx)."""
+    pass
+
+
+class CircuitOpenError(ApolloAPIError):
+    """Endpoint family is failing; request rejected without calling Apollo."""
+
+    def __init__(self, message, retry_after_seconds=0.0):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+def endpoint_family(path: str) -> str:
+    """Group an API path into the family that shares a circuit breaker."""
+    if '/mixed_people/' in path:
+        return 'people_search'
+    if '/people/' in path:
+        return 'enrichment'
+    if '/organizations/' in path or '/mixed_companies/' in path:
+        return 'organizations'
+    return 'other'
+
+
 class ApolloClient:
     """Low-level HTTP wrapper for Apollo API endpoints."""
 
-    def __init__(self, api_key: str, base_url: str = "https://api.apollo.io"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.apollo.io",
+        rate_limiter: Optional[RateLimiter] = None,
+        request_deadline: float = 30.0,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 10.0,
+        breaker_failure_threshold: int = 5,
+        breaker_recovery_seconds: float = 30.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        keep_alive: bool = True
+    ):
         """
         Initialize Apollo API client.
 
         Args:
             api_key: Apollo API key
             base_url: API base URL (default: https://api.apollo.io)
+            rate_limiter: Limiter shared by all requests made through this client (optional)
+            request_deadline: Max seconds one call may spend including retries
+            backoff_base: Base of the full-jitter exponential backoff, in seconds
+            backoff_cap: Max backoff between two attempts, in seconds
+            breaker_failure_threshold: Consecutive failures that open an endpoint family's circuit
+            breaker_recovery_seconds: Seconds an open circuit fails fast before probing
+            connect_timeout: Seconds to wait for a TCP/TLS connection
+            read_timeout: Seconds to wait between bytes of a response
+            pool_connections: Number of host pools kept by the HTTP adapter
+            pool_maxsize: Max pooled connections per host (size to your worker count)
+            keep_alive: Reuse connections between requests
         """
         self.api_key = api_key
         self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.request_deadline = request_deadline
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_recovery_seconds = breaker_recovery_seconds
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._single_flight = SingleFlight()
+        self.timeout = (connect_timeout, read_timeout)
         self.session = requests.Session()
         self.session.headers.update({
             'accept': 'application/json',
@@ -51,6 +125,48 @@ class ApolloClient:
             'Content-Type': 'application/json',
             'x-api-key': api_key
         })
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        # Retries are handled in _make_request, not by urllib3
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def from_config(cls, config) -> 'ApolloClient':
+        """
+        Build a client (with its rate limiter) from Config settings.
+
+        Args:
+            config: Config class/instance
+
+        Returns:
+            Configured ApolloClient
+        """
+        rate_limiter = RateLimiter.per_minute(
+            config.APOLLO_RATE_LIMIT_PER_MINUTE,
+            burst=config.APOLLO_RATE_LIMIT_BURST
+        )
+        return cls(
+            config.APOLLO_API_KEY,
+            config.API_BASE_URL,
+            rate_limiter=rate_limiter,
+            request_deadline=config.APOLLO_REQUEST_DEADLINE,
+            backoff_base=config.APOLLO_BACKOFF_BASE,
+            backoff_cap=config.APOLLO_BACKOFF_CAP,
+            breaker_failure_threshold=config.APOLLO_BREAKER_FAILURE_THRESHOLD,
+            breaker_recovery_seconds=config.APOLLO_BREAKER_RECOVERY_SECONDS,
+            connect_timeout=config.APOLLO_CONNECT_TIMEOUT,
+            read_timeout=config.APOLLO_READ_TIMEOUT,
+            pool_connections=config.APOLLO_POOL_CONNECTIONS,
+            pool_maxsize=config.APOLLO_POOL_MAXSIZE,
+            keep_alive=config.APOLLO_KEEP_ALIVE
+        )
 
     def search_companies(
         self,
@@ -78,6 +194,25 @@ class ApolloClient:
 
         return self._make_request('POST', endpoint, params=params)
 
+    def search_organizations(self, name: str, per_page: int = 5) -> Dict[str, Any]:
+        """
+        Search organizations by name (v1 organization search).
+
+        Args:
+            name: Company name to search for
+            per_page: Results per page (default: 5)
+
+        Returns:
+            API response dictionary with 'organizations'
+        """
+        endpoint = f"{self.base_url}/v1/organizations/search"
+        data = {
+            'q_organization_name': name,
+            'per_page': per_page
+        }
+
+        return self._make_request('POST', endpoint, json_data=data)
+
     def search_people(
         self,
         organization_domains: Optional[List[str]] = None,
@@ -86,8 +221,9 @@ class ApolloClient:
         person_seniorities: Optional[List[str]] = None,
         include_similar_titles: bool = True,
         per_page: int = 100,
-        page: int = 1
-    ) -> Dict[str, Any]:
+        page: int = 1,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> Any:
         """
         Search for people at companies (FREE - no credits consumed).
 
@@ -99,9 +235,12 @@ class ApolloClient:
             include_similar_titles: Include similar job titles in search
             per_page: Results per page (max 100)
             page: Page number
+            decode: Decoder for the raw response body (e.g.
+                contact_search.decode_people_page); default parses the JSON
 
         Returns:
-            API response dictionary with people data (without emails)
+            API response dictionary with people data (without emails), or
+            whatever `decode` returns
         """
         endpoint = f"{self.base_url}/api/v1/mixed_people/api_search"
 
@@ -123,7 +262,7 @@ class ApolloClient:
         if person_seniorities:
             data['person_seniorities'] = person_seniorities
 
-        return self._make_request('POST', endpoint, json_data=data)
+        return self._make_request('POST', endpoint, json_data=data, decode=decode)
 
     def enrich_person(
         self,
@@ -174,72 +313,195 @@ class ApolloClient:
 
         return self._make_request('POST', endpoint, json_data=data)
 
+    def breaker(self, family: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker of an endpoint family."""
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            with self._breakers_lock:
+                breaker = self._breakers.setdefault(family, CircuitBreaker(
+                    family,
+                    failure_threshold=self.breaker_failure_threshold,
+                    recovery_timeout=self.breaker_recovery_seconds
+                ))
+        return breaker
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Current state of every endpoint family's circuit."""
+        return {family: breaker.state for family, breaker in list(self._breakers.items())}
+
+    def _backoff(self, attempt: int, floor: float = 0.0) -> float:
+        """Full-jitter backoff: floor + uniform(0, min(cap, base * 2**attempt))."""
+        return floor + random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
     def _make_request(
         self,
         method: str,
         endpoint: str,
         params: Optional[Dict] = None,
         json_data: Optional[Dict] = None,
-        max_retries: int = 3
-    ) -> Dict[str, Any]:
+        max_retries: int = 3,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> Any:
+        """
+        Make HTTP request, sharing identical in-flight search calls.
+
+        Concurrent calls to a people/organization search endpoint with the
+        same canonical body are sent once; every caller gets the same parsed
+        response (or exception), so callers must treat it as read-only.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: Full endpoint URL
+            params: Query parameters
+            json_data: JSON body data
+            max_retries: Maximum number of retry attempts
+            decode: Decoder for a successful response body (default: JSON)
+
+        Returns:
+            Parsed JSON response (or the decoded body)
+        """
+        path = endpoint[len(self.base_url):] if endpoint.startswith(self.base_url) else endpoint
+        if endpoint_family(path) not in COALESCED_FAMILIES:
+            return self._send_with_retries(method, endpoint, params, json_data, max_retries, decode)
+
+        key = (
+            method.upper(),
+            endpoint,
+            json.dumps(json_data if json_data else params, sort_keys=True, default=str),
+            decode
+        )
+        result, shared = self._single_flight.do(
+            key,
+            lambda: self._send_with_retries(method, endpoint, params, json_data, max_retries, decode)
+        )
+        if shared:
+            APOLLO_COALESCED.inc(endpoint=path)
+        return result
+
+    def _send_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json_data: Optional[Dict] = None,
+        max_retries: int = 3,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> Any:
         """
         Make HTTP request with error handling and retries.
 
+        Network errors, 5xx and 429 responses are retried with full-jitter
+        backoff as long as the call stays within request_deadline, and count
+        as failures for the endpoint family's circuit breaker. While that
+        circuit is open the call fails immediately.
+
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: Full endpoint URL
             params: Query parameters
             json_data: JSON body data
             max_retries: Maximum number of retry attempts
+            decode: Decoder for a successful response body (default: JSON)
 
         Returns:
-            Parsed JSON response
+            Parsed JSON response (or the decoded body)
 
         Raises:
             AuthenticationError: Invalid API key
             RateLimitError: Rate limit exceeded
             NotFoundError: Resource not found
+            CircuitOpenError: Endpoint family circuit is open
             ApolloAPIError: Other API errors
         """
+        path = endpoint[len(self.base_url):] if endpoint.startswith(self.base_url) else endpoint
+        breaker = self.breaker(endpoint_family(path))
+        deadline = time.monotonic() + self.request_deadline
+
         for attempt in range(max_retries):
+            retry_in = breaker.allow_request()
+            if retry_in is not None:
+                APOLLO_REQUESTS.inc(endpoint=path, status='circuit_open')
+                raise CircuitOpenError(
+                    f"Apollo {breaker.name} endpoints are failing; retry in {retry_in:.1f}s",
+                    retry_after_seconds=retry_in
+                )
+
             try:
-                if method.upper() == 'GET':
-                    response = self.session.get(endpoint, params=params)
-                elif method.upper() == 'POST':
-                    if json_data:
-                        response = self.session.post(endpoint, json=json_data)
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+
+                with APOLLO_REQUEST_SECONDS.time(endpoint=path):
+                    if method.upper() == 'GET':
+                        response = self.session.get(endpoint, params=params, timeout=self.timeout)
+                    elif method.upper() == 'POST':
+                        if json_data:
+                            response = self.session.post(endpoint, json=json_data, timeout=self.timeout)
+                        else:
+                            response = self.session.post(endpoint, params=params, timeout=self.timeout)
                     else:
-                        response = self.session.post(endpoint, params=params)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
+                        raise ValueError(f"Unsupported HTTP method: {method}")
+
+                APOLLO_REQUESTS.inc(endpoint=path, status=response.status_code)
+                result = self._handle_response(response, decode)
+                breaker.record_success()
 
-                return self._handle_response(response)
+                if path.endswith('/people/match') and result.get('person'):
+                    APOLLO_CREDITS.inc(endpoint=path)
+
+                return result
 
             except RateLimitError as e:
-                if attempt < max_retries - 1:
-                    wait_time = e.retry_after_seconds * (2 ** attempt)
-                    print(f"Rate limit hit. Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
-                else:
+                APOLLO_RATE_LIMITED.inc(endpoint=path)
+                breaker.record_failure()
+                wait_time = self._backoff(attempt, floor=e.retry_after_seconds)
+                if attempt == max_retries - 1 or time.monotonic() + wait_time > deadline:
+                    raise
+                APOLLO_RETRIES.inc(endpoint=path, reason='rate_limit')
+                print(f"Rate limit hit. Waiting {wait_time:.1f} seconds before retry...")
+                time.sleep(wait_time)
+
+            except ServerError:
+                breaker.record_failure()
+                wait_time = self._backoff(attempt)
+                if attempt == max_retries - 1 or time.monotonic() + wait_time > deadline:
                     raise
+                APOLLO_RETRIES.inc(endpoint=path, reason='server_error')
+                print(f"Apollo server error. Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
 
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    print(f"Network error. Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    raise ApolloAPIError(f"Network error after {max_retries} attempts: {str(e)}")
-
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
+                APOLLO_REQUESTS.inc(endpoint=path, status='network_error')
+                breaker.record_failure()
+                wait_time = self._backoff(attempt)
+                if attempt == max_retries - 1 or time.monotonic() + wait_time > deadline:
+                    raise ApolloAPIError(f"Network error after {attempt + 1} attempts: {str(e)}")
+                APOLLO_RETRIES.inc(endpoint=path, reason='network')
+                print(f"Network error. Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
+
+            except ApolloAPIError:
+                # 4xx: Apollo is up, the request itself was rejected
+                breaker.record_success()
+                raise
+
+            except Exception:
+                breaker.record_failure()
+                raise
+
+    def _handle_response(
+        self,
+        response: requests.Response,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> Any:
         """
         Handle API response and raise appropriate exceptions.
 
         Args:
             response: requests Response object
+            decode: Decoder for a successful response body (default: JSON)
 
         Returns:
-            Parsed JSON response
+            Parsed JSON response (or the decoded body)
 
         Raises:
             AuthenticationError: Invalid API key (401)
@@ -249,6 +511,8 @@ class ApolloClient:
             ApolloAPIError: Other API errors
         """
         if response.status_code == 200:
+            if decode is not None:
+                return decode(response.content)
             return response.json()
 
         elif response.status_code == 401:
@@ -293,6 +557,10 @@ class ApolloClient:
             except:
                 error_message = response.text
 
+            if response.status_code >= 500:
+                raise ServerError(
+                    f"Apollo API error (HTTP {response.status_code}): {error_message}"
+                )
             raise ApolloAPIError(
                 f"Apollo API error (HTTP {response.status_code}): {error_message}"
             )
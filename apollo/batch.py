@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import List, Dict, Optional, Any, Callable
+from config import Config
+from apollo.company_resolver import resolve_company_input, CompanyNotFoundError
+from apollo.contact_search import search_contacts
+
+
+# Statuses that are final and skipped when a checkpointed batch is resumed;
+# 'error' (e.g. Apollo outage or throttling) is retried
+DONE_STATUSES = ('done', 'not_found')
+
+
+def read_company_list(path: str) -> List[str]:
+    """
+    Read company inputs from a text file (one name/URL/domain per line).
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path: Path to the text file
+
+    Returns:
+        List of company inputs in file order
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+
+    return [line for line in lines if line and not line.startswith('#')]
+
+
+def load_checkpoint(checkpoint_path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Load per-company results from a batch checkpoint file.
+
+    Args:
+        checkpoint_path: Path to checkpoint JSON (optional)
+
+    Returns:
+        Dictionary mapping company input to its result
+    """
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return {}
+
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('results', {})
+    except (OSError, ValueError):
+        print(f"Warning: Ignoring unreadable checkpoint {checkpoint_path}")
+        return {}
+
+
+def save_checkpoint(checkpoint_path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """Atomically write per-company results to the checkpoint file."""
+    directory = os.path.dirname(checkpoint_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'results': results}, f, indent=2)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def run_batch_search(
+    companies: List[str],
+    target_roles: List[str],
+    client,
+    store: Callable[[Dict[str, Any], List[Dict[str, Any]]], Any],
+    max_results: Optional[int] = None,
+    config: Optional[Config] = None,
+    checkpoint_path: Optional[str] = None,
+    resolve_workers: int = 4,
+    search_workers: int = 4,
+    store_workers: int = 1,
+    directory=None,
+    role_stats=None
+) -> List[Dict[str, Any]]:
+    """
+    Search many companies through a resolve -> search -> store pipeline.
+
+    Each stage runs in its own bounded thread pool, so resolution of the
+    next companies overlaps with searches and DB writes of earlier ones.
+    All Apollo traffic goes through `client`, so its rate limiter is shared
+    by every stage. Finished companies are written to the checkpoint as
+    they complete; companies already done (or not found) in the checkpoint
+    are skipped, while any resolve, search or store failure ends in 'error'
+    and is retried on resume.
+
+    Args:
+        companies: Company names, URLs, or domains
+        target_roles: List of role types to search for
+        client: ApolloClient instance (ideally with a rate_limiter)
+        store: Callable(company_info, contacts) persisting one company's
+            results; its return value is recorded as 'stored'
+        max_results: Maximum number of contacts per company
+        config: Config instance (optional)
+        checkpoint_path: Path to checkpoint JSON for resuming (optional)
+        resolve_workers: Concurrent company resolutions
+        search_workers: Concurrent people searches
+        store_workers: Concurrent store calls
+        directory: CompanyDirectory tried before Apollo for each company (optional)
+        role_stats: RoleYieldStats for the search planner (optional)
+
+    Returns:
+        List of per-company result dictionaries, in input order
+    """
+    results = load_checkpoint(checkpoint_path)
+    results_lock = threading.Lock()
+
+    # Dedupe while keeping input order
+    unique_companies = list(dict.fromkeys(c.strip() for c in companies if c.strip()))
+    pending = [c for c in unique_companies if results.get(c, {}).get('status') not in DONE_STATUSES]
+
+    skipped = len(unique_companies) - len(pending)
+    retrying = sum(1 for c in pending if results.get(c, {}).get('status') == 'error')
+    if skipped or retrying:
+        print(f"Resuming batch: {skipped} companies already done, {len(pending)} to go"
+              + (f" ({retrying} failed before, retrying)" if retrying else ''))
+
+    resolve_pool = ThreadPoolExecutor(max_workers=resolve_workers, thread_name_prefix='resolve')
+    search_pool = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix='search')
+    store_pool = ThreadPoolExecutor(max_workers=store_workers, thread_name_prefix='store')
+
+    def finish(company: str, result: Dict[str, Any], done: Future) -> None:
+        result['input'] = company
+        with results_lock:
+            results[company] = result
+            completed = sum(1 for r in results.values() if r.get('status') in DONE_STATUSES)
+            if checkpoint_path:
+                try:
+                    save_checkpoint(checkpoint_path, results)
+                except OSError as e:
+                    print(f"Warning: Could not write checkpoint: {str(e)}")
+
+        print(f"  [{completed}/{len(unique_companies)}] {company}: {result['status']}"
+              + (f" ({result.get('found', 0)} contacts)" if result['status'] == 'done' else ''))
+        done.set_result(result)
+
+    def do_search(company_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return search_contacts(
+            company_domain=company_info['domain'],
+            target_roles=target_roles,
+            client=client,
+            max_results=max_results,
+            config=config,
+            company_info=company_info,
+            role_stats=role_stats
+        )
+
+    def start(company: str) -> Future:
+        done = Future()
+
+        def on_stored(future: Future, company_info: Dict[str, Any], found: int) -> None:
+            try:
+                stored = future.result()
+            except Exception as e:
+                finish(company, {'status': 'error', 'stage': 'store', 'error': str(e)}, done)
+                return
+            finish(company, {
+                'status': 'done',
+                'name': company_info.get('name'),
+                'domain': company_info.get('domain'),
+                'organization_id': company_info.get('organization_id'),
+                'found': found,
+                'stored': stored
+            }, done)
+
+        def on_searched(future: Future, company_info: Dict[str, Any]) -> None:
+            try:
+                contacts = future.result()
+            except Exception as e:
+                finish(company, {'status': 'error', 'stage': 'search', 'error': str(e)}, done)
+                return
+            store_pool.submit(store, company_info, contacts).add_done_callback(
+                lambda f: on_stored(f, company_info, len(contacts))
+            )
+
+        def on_resolved(future: Future) -> None:
+            try:
+                company_info = future.result()
+            except CompanyNotFoundError as e:
+                finish(company, {'status': 'not_found', 'stage': 'resolve', 'error': str(e)}, done)
+                return
+            except Exception as e:
+                finish(company, {'status': 'error', 'stage': 'resolve', 'error': str(e)}, done)
+                return
+            search_pool.submit(do_search, company_info).add_done_callback(
+                lambda f: on_searched(f, company_info)
+            )
+
+        resolve_pool.submit(resolve_company_input, company, client, directory).add_done_callback(on_resolved)
+        return done
+
+    try:
+        wait([start(company) for company in pending])
+    finally:
+        resolve_pool.shutdown(wait=True)
+        search_pool.shutdown(wait=True)
+        store_pool.shutdown(wait=True)
+
+    return [results[c] for c in unique_companies if c in results]
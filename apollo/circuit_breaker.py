@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Optional
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker shared by all threads of a client.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast for `recovery_timeout` seconds. Then a single probe request is
+    let through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Endpoint family this breaker protects (for messages)
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before probing again
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> Optional[float]:
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            None if the call may proceed, otherwise seconds until it is
+            worth trying again (circuit open, or half-open with a probe
+            already in flight)
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                self.state = self.HALF_OPEN
+
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return 1.0
+                self._probe_in_flight = True
+
+            return None
+
+    def record_success(self) -> None:
+        """The endpoint answered (even with a client error): close the circuit."""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """The endpoint failed (network error, 5xx or 429)."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
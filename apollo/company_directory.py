@@ -0,0 +1,240 @@
+import csv
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from apollo.domains import canonical_domain
+
+
+# Legal-form and filler words dropped when normalizing company names
+COMPANY_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp',
+    'corporation', 'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'sas', 'bv',
+    'nv', 'oy', 'ab', 'pty', 'srl', 'spa', 'kk', 'the', 'group', 'holdings'
+})
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name for lookups.
+
+    Lowercases, turns '&' into 'and', strips punctuation and drops legal
+    suffixes, e.g. 'The Google, LLC' -> 'google'.
+
+    Args:
+        name: Company name as typed or stored
+
+    Returns:
+        Space-separated normalized name ('' if nothing is left)
+    """
+    words = _NON_ALNUM.sub(' ', (name or '').lower().replace('&', ' and ')).split()
+    kept = [w for w in words if w not in COMPANY_SUFFIXES]
+    # A name made only of suffix words ("The Company") keeps its words
+    return ' '.join(kept or words)
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'entry')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.entry: Optional[int] = None
+
+
+class CompanyDirectory:
+    """
+    In-memory company directory for resolving names without calling Apollo.
+
+    Entries are indexed three ways:
+      - normalized name and domain hash maps (exact hits, O(1))
+      - a prefix trie over normalized names (autocomplete, suggestions)
+      - a trigram index (fuzzy suggestions, Dice similarity)
+
+    Only exact normalized-name hits resolve a company ('Meta' must not
+    become metabase.com); prefix and fuzzy hits are only suggestions.
+
+    Writers take a lock; lookups are lock-free.
+    """
+
+    def __init__(self, fuzzy_threshold: float = 0.6, min_prefix: int = 4):
+        """
+        Initialize an empty directory.
+
+        Args:
+            fuzzy_threshold: Minimum trigram Dice similarity for a fuzzy suggestion
+            min_prefix: Shortest normalized prefix that gets autocomplete suggestions
+        """
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_prefix = min_prefix
+        self._entries: List[Dict[str, Optional[str]]] = []
+        self._by_name: Dict[str, int] = {}
+        self._by_domain: Dict[str, int] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._gram_counts: List[int] = []
+        self._trie = _TrieNode()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, name: str, domain: str, organization_id: Optional[str] = None) -> None:
+        """
+        Add (or update) a company.
+
+        Args:
+            name: Company name
+            domain: Company domain
+            organization_id: Apollo organization ID (optional)
+        """
+        domain = canonical_domain(domain)
+        key = normalize_company_name(name)
+        if not domain or not key:
+            return
+
+        with self._lock:
+            index = self._by_domain.get(domain)
+            if index is not None:
+                entry = self._entries[index]
+                entry['organization_id'] = organization_id or entry['organization_id']
+                entry['name'] = name or entry['name']
+                self._by_name.setdefault(key, index)
+                return
+
+            index = len(self._entries)
+            self._entries.append({'domain': domain, 'organization_id': organization_id, 'name': name})
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            self._by_domain[domain] = index
+            self._by_name.setdefault(key, index)
+
+            node = self._trie
+            for char in key:
+                node = node.children.setdefault(char, _TrieNode())
+            if node.entry is None:
+                node.entry = index
+
+            for gram in grams:
+                self._trigrams.setdefault(gram, set()).add(index)
+
+    def add_many(self, rows: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        """
+        Add (name, domain, organization_id) rows.
+
+        Returns:
+            Number of entries in the directory afterwards
+        """
+        for name, domain, organization_id in rows:
+            self.add(name, domain, organization_id)
+        return len(self)
+
+    def load_csv(self, path: str) -> int:
+        """
+        Load a CSV with 'name' and 'domain' columns (and optional 'organization_id').
+
+        Args:
+            path: Path to the CSV file
+
+        Returns:
+            Number of entries in the directory afterwards
+        """
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            return self.add_many(
+                (row.get('name') or '', row.get('domain') or '', row.get('organization_id') or None)
+                for row in reader
+            )
+
+    def by_domain(self, domain: str) -> Optional[Dict[str, Optional[str]]]:
+        """Exact lookup by domain."""
+        index = self._by_domain.get(canonical_domain(domain))
+        return dict(self._entries[index]) if index is not None else None
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Optional[str]]]:
+        """
+        Autocomplete: companies whose normalized name starts with `prefix`.
+
+        Args:
+            prefix: Name prefix as typed
+            limit: Max results
+
+        Returns:
+            Matching entries, shortest names first
+        """
+        node = self._trie
+        for char in normalize_company_name(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        found = []
+        level = [node]
+        while level and len(found) < limit:
+            next_level = []
+            for current in level:
+                if current.entry is not None:
+                    found.append(dict(self._entries[current.entry]))
+                    if len(found) >= limit:
+                        break
+                next_level.extend(current.children.values())
+            level = next_level
+        return found
+
+    def resolve(self, name: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Resolve a company name by exact normalized name.
+
+        Args:
+            name: Company name as typed (e.g. 'Google LLC')
+
+        Returns:
+            Dictionary with 'domain', 'organization_id', 'name', or None
+        """
+        index = self._by_name.get(normalize_company_name(name))
+        return dict(self._entries[index]) if index is not None else None
+
+    def suggest(self, name: str, limit: int = 5) -> List[Dict[str, Optional[str]]]:
+        """
+        Companies the user may have meant: name completions, then fuzzy matches.
+
+        Args:
+            name: Company name as typed (e.g. 'Stripes')
+            limit: Max results
+
+        Returns:
+            Candidate entries, best first (never used to resolve automatically)
+        """
+        key = normalize_company_name(name)
+        if not key:
+            return []
+
+        found = self.complete(key, limit=limit) if len(key) >= self.min_prefix else []
+        seen = {entry['domain'] for entry in found}
+        for index in self._fuzzy(key):
+            if len(found) >= limit:
+                break
+            if self._entries[index]['domain'] not in seen:
+                found.append(dict(self._entries[index]))
+                seen.add(self._entries[index]['domain'])
+        return found
+
+    def _fuzzy(self, key: str) -> List[int]:
+        """Entry indexes with Dice similarity >= fuzzy_threshold, best first."""
+        grams = _trigrams(key)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            # tuple() copies atomically under the GIL, so concurrent add() is safe
+            for index in tuple(self._trigrams.get(gram, ())):
+                shared[index] = shared.get(index, 0) + 1
+
+        scored = []
+        for index, count in shared.items():
+            score = 2.0 * count / (len(grams) + self._gram_counts[index])
+            if score >= self.fuzzy_threshold:
+                scored.append((-score, index))
+        return [index for _, index in sorted(scored)]
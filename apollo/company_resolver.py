@@ -1,27 +1,38 @@
 import re
-from urllib.parse import urlparse
-from typing import Dict, Optional
-import validators
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+from apollo.company_directory import normalize_company_name
+from apollo.domains import canonical_domain
 
 
-def resolve_company_input(user_input: str, client) -> Dict[str, str]:
+class CompanyNotFoundError(ValueError):
+    """Apollo answered, but has no organization matching the input."""
+    pass
+
+
+def resolve_company_input(user_input: str, client, directory=None) -> Dict[str, str]:
     """
     Convert user input (name/URL/domain) to company information.
 
     Args:
         user_input: Company name, URL, or domain
         client: ApolloClient instance
+        directory: CompanyDirectory consulted before calling Apollo (optional)
 
     Returns:
         Dictionary with keys: 'domain', 'organization_id', 'name'
 
     Raises:
-        ValueError: If company cannot be resolved
+        CompanyNotFoundError: If Apollo has no matching company
+        ApolloAPIError: If Apollo could not be asked (e.g. CircuitOpenError)
     """
     user_input = user_input.strip()
 
     if is_url(user_input):
         domain = extract_domain_from_url(user_input)
+        known = directory.by_domain(domain) if directory is not None else None
+        if known:
+            return known
         return {
             'domain': domain,
             'organization_id': None,
@@ -29,7 +40,12 @@ def resolve_company_input(user_input: str, client) -> Dict[str, str]:
         }
 
     elif is_domain(user_input):
-        domain = user_input.lower()
+        domain = canonical_domain(user_input)
+        # A directory hit already carries the organization ID, no network needed
+        known = directory.by_domain(domain) if directory is not None else None
+        if known:
+            return known
+
         # Try to resolve domain to an organization ID for better search results
         # We can reuse the name search or try to find a direct domain lookup
         # For now, let's treat the domain as a name query which Apollo handles reasonably well
@@ -41,7 +57,7 @@ def resolve_company_input(user_input: str, client) -> Dict[str, str]:
         if org_data:
              return org_data
         
-        # Fallback if API lookup fails but it looks like a domain
+        # Fallback if Apollo has no organization for it
         return {
             'domain': domain,
             'organization_id': None,
@@ -49,34 +65,128 @@ def resolve_company_input(user_input: str, client) -> Dict[str, str]:
         }
 
     else:
+        company_data = directory.resolve(user_input) if directory is not None else None
+        if company_data:
+            return company_data
+
         company_data = search_company_by_name(user_input, client)
         if not company_data:
-            raise ValueError(
-                f"Could not find company '{user_input}'. "
+            suggestions = directory.suggest(user_input, limit=3) if directory is not None else []
+            hint = (
+                f" Did you mean: {', '.join(s['domain'] for s in suggestions)}?" if suggestions else ''
+            )
+            raise CompanyNotFoundError(
+                f"Could not find company '{user_input}'.{hint} "
                 "Please try providing the company's domain (e.g., 'google.com') instead."
             )
+        if directory is not None and company_data.get('domain'):
+            directory.add(company_data['name'], company_data['domain'], company_data.get('organization_id'))
         return company_data
 
 
-def extract_domain_from_url(url: str) -> str:
+def canonical_company_key(user_input: str) -> str:
     """
-    Parse URL and extract domain.
+    Canonical form of a company input, used to dedupe inputs.
+
+    URLs and domains map to 'domain:<domain>', names to 'name:<normalized>',
+    so 'https://www.stripe.com/about', 'Stripe.com' and 'stripe.com' collide.
 
     Args:
-        url: URL string (e.g., 'https://www.google.com/about')
+        user_input: Company name, URL, or domain
 
     Returns:
-        Domain string (e.g., 'google.com')
+        Canonical key string
+    """
+    user_input = user_input.strip()
+    if is_url(user_input):
+        return 'domain:' + extract_domain_from_url(user_input)
+    if is_domain(user_input):
+        return 'domain:' + canonical_domain(user_input)
+    return 'name:' + normalize_company_name(user_input)
+
+
+def resolve_companies(inputs: Iterable[str], client, directory=None,
+                      workers: int = 4) -> Dict[str, Dict[str, Any]]:
     """
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    Resolve many company inputs at once.
 
-    parsed = urlparse(url)
-    domain = parsed.netloc or parsed.path
+    Inputs are deduplicated by canonical form. Anything the directory (or
+    the input itself, for URLs) can answer is resolved offline; the rest is
+    resolved concurrently through `client`, so the shared rate limiter and
+    request coalescing still apply.
 
-    domain = domain.replace('www.', '')
+    Args:
+        inputs: Company names, URLs, or domains
+        client: ApolloClient instance
+        directory: CompanyDirectory consulted first (optional)
+        workers: Concurrent Apollo lookups
 
-    return domain.lower()
+    Returns:
+        Dictionary mapping each input to {'status': 'resolved' | 'not_found' |
+        'error', 'source': 'directory' | 'input' | 'apollo', 'company': {...}}
+        ('error' instead of 'company' when not resolved)
+    """
+    groups: Dict[str, list] = {}
+    for user_input in inputs:
+        if user_input and user_input.strip():
+            groups.setdefault(canonical_company_key(user_input), []).append(user_input)
+
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    remote: Dict[str, str] = {}
+
+    for key, originals in groups.items():
+        kind, value = key.split(':', 1)
+        # A bare domain is worth an Apollo lookup (organization ID); a URL is not
+        representative = next((o for o in originals if not is_url(o.strip())), originals[0])
+
+        known = None
+        if directory is not None:
+            known = directory.by_domain(value) if kind == 'domain' else directory.resolve(representative)
+
+        if known:
+            outcomes[key] = {'status': 'resolved', 'source': 'directory', 'company': known}
+        elif kind == 'domain' and is_url(representative.strip()):
+            # URLs resolve from the input alone, like resolve_company_input
+            outcomes[key] = {
+                'status': 'resolved',
+                'source': 'input',
+                'company': resolve_company_input(representative, client)
+            }
+        else:
+            remote[key] = representative
+
+    def lookup(key: str) -> None:
+        try:
+            company = resolve_company_input(remote[key], client, directory)
+            outcomes[key] = {'status': 'resolved', 'source': 'apollo', 'company': company}
+        except CompanyNotFoundError as e:
+            outcomes[key] = {'status': 'not_found', 'source': 'apollo', 'error': str(e)}
+        except Exception as e:
+            # Apollo unavailable (circuit open, throttled, network): worth retrying
+            outcomes[key] = {'status': 'error', 'source': 'apollo', 'error': str(e)}
+
+    if remote:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='resolve') as pool:
+            list(pool.map(lookup, remote))
+
+    return {
+        original: outcomes[key]
+        for key, originals in groups.items()
+        for original in originals
+    }
+
+
+def extract_domain_from_url(url: str) -> str:
+    """
+    Parse URL and extract its canonical (registrable) domain.
+
+    Args:
+        url: URL string (e.g., 'https://careers.google.com/about')
+
+    Returns:
+        Domain string (e.g., 'google.com')
+    """
+    return canonical_domain(url)
 
 
 def is_url(text: str) -> bool:
@@ -89,11 +199,13 @@ def is_url(text: str) -> bool:
     Returns:
         True if text appears to be a URL
     """
-    return (
-        text.startswith(('http://', 'https://')) or
-        text.startswith('www.') or
-        (validators.url('https://' + text) and '/' in text)
-    )
+    if text.startswith(('http://', 'https://', 'www.')):
+        return True
+    if '/' not in text:
+        return False
+
+    import validators  # slow to import; only needed for bare "host/path" input
+    return bool(validators.url('https://' + text))
 
 
 def is_domain(text: str) -> bool:
@@ -140,39 +252,31 @@ def search_company_by_name(name: str, client) -> Optional[Dict[str, str]]:
         client: ApolloClient instance
 
     Returns:
-        Dictionary with company info, or None if not found
-    """
-    try:
-        # Use the organization search endpoint (v1, not mixed_companies)
-        endpoint = f"{client.base_url}/v1/organizations/search"
-        data = {
-            'q_organization_name': name,
-            'per_page': 5
-        }
+        Dictionary with company info, or None if Apollo has no match
 
-        response = client.session.post(endpoint, json=data)
-        result = response.json()
+    Raises:
+        ApolloAPIError: Apollo could not be asked (circuit open, rate limit,
+            network or server error); callers must not treat this as "not found"
+    """
+    # Use the organization search endpoint (v1, not mixed_companies)
+    result = client.search_organizations(name, per_page=5)
 
-        organizations = result.get('organizations', [])
+    organizations = result.get('organizations', [])
 
-        if not organizations:
-            return None
+    if not organizations:
+        return None
 
-        top_match = organizations[0]
+    top_match = organizations[0]
 
-        domain = top_match.get('primary_domain') or top_match.get('website_url', '')
-        if domain:
-            domain = extract_domain_from_url(domain)
+    domain = top_match.get('primary_domain') or top_match.get('website_url', '')
+    if domain:
+        domain = extract_domain_from_url(domain)
 
-        return {
-            'domain': domain,
-            'organization_id': top_match.get('id'),
-            'name': top_match.get('name', name)
-        }
-
-    except Exception as e:
-        print(f"Warning: Error searching for company: {str(e)}")
-        return None
+    return {
+        'domain': domain,
+        'organization_id': top_match.get('id'),
+        'name': top_match.get('name', name)
+    }
 
 
 def validate_domain(domain: str) -> bool:
@@ -0,0 +1,132 @@
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+
+class ContactRecord:
+    """
+    One contact as it moves through search -> enrichment -> export/storage.
+
+    A __slots__ object is several times smaller than the equivalent dict and
+    copies field by field without rehashing. It also answers the dict
+    read/write calls the rest of the code uses (get, [], keys), so it can be
+    passed wherever a contact dictionary is expected.
+    """
+
+    FIELDS = (
+        'id', 'name', 'first_name', 'last_name', 'title', 'company',
+        'company_domain', 'location', 'linkedin_url', 'seniority',
+        'departments', 'email', 'personal_email', 'phone', 'photo_url',
+        'headline', 'has_email', 'has_phone'
+    )
+    __slots__ = FIELDS
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        name: Optional[str] = '',
+        first_name: Optional[str] = '',
+        last_name: Optional[str] = '',
+        title: Optional[str] = '',
+        company: Optional[str] = '',
+        company_domain: Optional[str] = '',
+        location: Optional[str] = '',
+        linkedin_url: Optional[str] = '',
+        seniority: Optional[str] = '',
+        departments: Optional[List[str]] = None,
+        email: Optional[str] = None,
+        personal_email: Optional[str] = None,
+        phone: Optional[str] = None,
+        photo_url: Optional[str] = '',
+        headline: Optional[str] = '',
+        has_email: Any = False,
+        has_phone: Any = False
+    ):
+        self.id = id
+        self.name = name
+        self.first_name = first_name
+        self.last_name = last_name
+        self.title = title
+        self.company = company
+        self.company_domain = company_domain
+        self.location = location
+        self.linkedin_url = linkedin_url
+        self.seniority = seniority
+        self.departments = departments if departments is not None else []
+        self.email = email
+        self.personal_email = personal_email
+        self.phone = phone
+        self.photo_url = photo_url
+        self.headline = headline
+        self.has_email = has_email
+        self.has_phone = has_phone
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'ContactRecord':
+        """
+        Build a record from a contact dictionary (unknown keys are dropped).
+
+        Args:
+            data: Contact dictionary (e.g. from a request body or JSON export)
+
+        Returns:
+            ContactRecord (data itself if it already is one)
+        """
+        if isinstance(data, cls):
+            return data
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Contact dictionary with every field."""
+        return dict(zip(self.FIELDS, _all_fields(self)))
+
+    def merged(self, updates: Mapping[str, Any]) -> 'ContactRecord':
+        """
+        Copy of this record with `updates` applied (replaces {**contact, **updates}).
+
+        Args:
+            updates: Field values to override; unknown keys are ignored
+
+        Returns:
+            New ContactRecord; this record is left unchanged
+        """
+        record = ContactRecord(*_all_fields(self))
+        for field, value in updates.items():
+            if field in self._FIELD_SET:
+                setattr(record, field, value)
+        return record
+
+    # Dict-style access for code written against contact dictionaries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self._FIELD_SET else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELD_SET
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ContactRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"<ContactRecord(id='{self.id}', name='{self.name}', email='{self.email}')>"
+
+
+# Reads every field in FIELDS order (positional __init__ order) in one C call
+_all_fields = attrgetter(*ContactRecord.FIELDS)
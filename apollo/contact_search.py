@@ -1,18 +1,42 @@
-import time
-from typing import List, Dict, Optional, Any
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Dict, Optional, Any, Set, Mapping, Tuple
 from config import Config
+from apollo.contact_record import ContactRecord
+from apollo.search_planner import RoleYieldStats, SearchPlan, plan_search
 
+try:
+    # Decodes search pages straight into the few fields we keep
+    import msgspec
+except ImportError:
+    msgspec = None
 
-def search_contacts(
+
+def iter_contact_pages(
     company_domain: str,
     target_roles: List[str],
     client,
     max_results: Optional[int] = None,
     config: Optional[Config] = None,
-    company_info: Optional[Dict] = None
-) -> List[Dict[str, Any]]:
+    company_info: Optional[Dict] = None,
+    known_ids: Optional[Set[str]] = None,
+    role_stats: Optional[RoleYieldStats] = None
+) -> Iterator[List[ContactRecord]]:
     """
-    Search for people at target company filtered by roles (FREE operation).
+    Search for people at target company, yielding contacts page by page (FREE operation).
+
+    The next Apollo page is fetched in the background while the caller
+    handles the current one, so storing or displaying a page overlaps with
+    the wait for the next.
+
+    The queries come from search_planner.plan_search: page size follows
+    max_results, and with role_stats a large multi-role search may run as
+    parallel per-role queries.
+
+    When known_ids is given the search is incremental: people already in
+    known_ids are dropped, and pagination stops at the first page that
+    contains nobody new.
 
     Args:
         company_domain: Company domain (e.g., 'google.com')
@@ -21,101 +45,219 @@ def search_contacts(
         max_results: Maximum number of contacts to return
         config: Config instance (optional)
         company_info: Company info dict with organization_id (optional)
+        known_ids: Apollo person IDs we already have (optional)
+        role_stats: Learned role yields for the planner (optional)
 
-    Returns:
-        List of contact dictionaries (without emails yet)
+    Yields:
+        Non-empty lists of ContactRecord (without emails yet)
+
+    Raises:
+        ApolloAPIError: A page could not be fetched (e.g. CircuitOpenError);
+            pages already yielded stay valid, but the search is incomplete
     """
     if config is None:
         from config import load_config
         config = load_config()
 
-    filters = map_roles_to_filters(target_roles, config)
-
     print(f"Searching for {', '.join(target_roles)} at {company_domain}...")
 
-    per_page = min(config.DEFAULT_PER_PAGE, 100)
-    page = 1
-    all_contacts = []
+    plan = plan_search(
+        target_roles, company_domain, config.ROLE_FILTERS,
+        company_info=company_info,
+        max_results=max_results,
+        default_per_page=config.DEFAULT_PER_PAGE,
+        incremental=known_ids is not None,
+        stats=role_stats
+    )
+    if len(plan.queries) > 1:
+        print(f"  Query plan: {plan.reason}")
+        yield from _iter_split_pages(client, plan, max_results)
+        return
+
+    found = 0
+    pages = iter_search_pages(client, plan.queries[0], max_pages=plan.max_pages, max_results=max_results, delay=0.3)
+    try:
+        for response in pages:
+            page = response['page']
+            contacts = response['contacts']
+            if known_ids is not None:
+                contacts = [c for c in contacts if c.id not in known_ids]
+            if max_results:
+                contacts = contacts[:max_results - found]
+            found += len(contacts)
+
+            print(f"  Found {found} contacts so far...")
+
+            if contacts:
+                yield contacts
+
+            if known_ids is not None and not contacts:
+                print(f"  Page {page} contained only known contacts, stopping")
+                break
 
-    while True:
-        try:
-            # Use organization_ids if available (more reliable than domains)
-            search_params = {
-                'per_page': per_page,
-                'page': page,
-            }
-            
-            # Apply filters ONLY if provided
-            if filters['person_titles']:
-                 search_params['person_titles'] = filters['person_titles']
-                 search_params['include_similar_titles'] = True
-            
-            if filters['person_seniorities']:
-                 search_params['person_seniorities'] = filters['person_seniorities']
-
-            if company_info and company_info.get('organization_id'):
-                search_params['organization_ids'] = [company_info['organization_id']]
-            else:
-                search_params['organization_domains'] = [company_domain]
+            if max_results and found >= max_results:
+                break
+    finally:
+        pages.close()
 
-            response = client.search_people(**search_params)
 
-            people = response.get('people', [])
-            if not people:
+def _iter_split_pages(client, plan: SearchPlan, max_results: Optional[int]) -> Iterator[List[ContactRecord]]:
+    """Run a multi-query plan in parallel, yielding each query's new contacts as it finishes."""
+    def collect(params: Dict[str, Any], limit: Optional[int]) -> List[ContactRecord]:
+        contacts = []
+        for response in iter_search_pages(client, params, max_pages=plan.max_pages, max_results=limit, delay=0.3):
+            contacts.extend(response['contacts'])
+            if limit and len(contacts) >= limit:
                 break
+        return contacts[:limit] if limit else contacts
+
+    seen: Set[str] = set()
+    found = 0
+    with ThreadPoolExecutor(max_workers=len(plan.queries), thread_name_prefix='search-plan') as executor:
+        futures = [executor.submit(collect, query, limit) for query, limit in zip(plan.queries, plan.limits)]
+        for future in as_completed(futures):
+            try:
+                contacts = future.result()
+            except Exception:
+                # A missing role query makes the whole search incomplete
+                for other in futures:
+                    other.cancel()
+                raise
+
+            # The same person can match several role queries
+            fresh = [c for c in contacts if c.id is None or c.id not in seen]
+            seen.update(c.id for c in fresh)
+            if max_results:
+                fresh = fresh[:max_results - found]
+            found += len(fresh)
+
+            print(f"  Found {found} contacts so far...")
+            if fresh:
+                yield fresh
 
-            for person in people:
-                contact = extract_contact_data(person)
-                all_contacts.append(contact)
 
-            pagination = response.get('pagination', {})
-            total_pages = pagination.get('total_pages', 1)
+def search_contacts(
+    company_domain: str,
+    target_roles: List[str],
+    client,
+    max_results: Optional[int] = None,
+    config: Optional[Config] = None,
+    company_info: Optional[Dict] = None,
+    known_ids: Optional[Set[str]] = None,
+    role_stats: Optional[RoleYieldStats] = None
+) -> List[ContactRecord]:
+    """
+    Search for people at target company filtered by roles (FREE operation).
 
-            print(f"  Found {len(all_contacts)} contacts so far...")
+    Collects iter_contact_pages into one list; see there for the incremental
+    (known_ids) behaviour.
 
-            if max_results and len(all_contacts) >= max_results:
-                all_contacts = all_contacts[:max_results]
-                break
+    Args:
+        company_domain: Company domain (e.g., 'google.com')
+        target_roles: List of role types to search for
+        client: ApolloClient instance
+        max_results: Maximum number of contacts to return
+        config: Config instance (optional)
+        company_info: Company info dict with organization_id (optional)
+        known_ids: Apollo person IDs we already have (optional)
+        role_stats: Learned role yields for the planner (optional)
 
-            if page >= total_pages or page >= 10:  # Limit to 10 pages max
-                break
+    Returns:
+        List of ContactRecord (without emails yet)
 
-            page += 1
-            time.sleep(0.3)
+    Raises:
+        ApolloAPIError: The search failed (see iter_contact_pages)
+    """
+    all_contacts = []
+    for contacts in iter_contact_pages(
+        company_domain, target_roles, client,
+        max_results=max_results, config=config, company_info=company_info,
+        known_ids=known_ids, role_stats=role_stats
+    ):
+        all_contacts.extend(contacts)
+    return all_contacts
 
-        except Exception as e:
-            print(f"Warning: Error during search on page {page}: {str(e)}")
-            break
 
-    return all_contacts
+def iter_search_pages(
+    client,
+    search_params: Dict[str, Any],
+    max_pages: Optional[int] = None,
+    max_results: Optional[int] = None,
+    delay: float = 0.0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield decoded people search pages, prefetching the next page.
+
+    While the caller handles page N, page N+1 is already being requested
+    on a background thread (after `delay` seconds). No page is prefetched
+    once `max_results` people have been returned; closing the generator
+    early drops any prefetched page.
+
+    Args:
+        client: ApolloClient instance
+        search_params: search_people arguments (without 'page')
+        max_pages: Stop after this many pages (None = all)
+        max_results: Don't prefetch past this many people (None = no limit)
+        delay: Seconds to wait before requesting each following page
+
+    Yields:
+        Dictionaries with 'page', 'contacts' (ContactRecord list, never
+        empty) and 'total_pages'
+
+    Raises:
+        Whatever client.search_people raised for the page being fetched
+    """
+    closed = threading.Event()
+
+    def fetch(page: int, wait: float) -> Optional[Dict[str, Any]]:
+        # Waiting on the event lets a closed generator skip the request
+        if wait and closed.wait(wait):
+            return None
+        return client.search_people(**{**search_params, 'page': page}, decode=decode_people_page)
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search-prefetch')
+    prefetched = None
+    try:
+        page = 1
+        seen = 0
+        response = fetch(page, 0)
+        while response['contacts']:
+            seen += len(response['contacts'])
+            total_pages = response['total_pages'] or 1
+            last = page >= total_pages or (max_pages is not None and page >= max_pages)
+
+            if not last and not (max_results and seen >= max_results):
+                prefetched = executor.submit(fetch, page + 1, delay)
+
+            yield {'page': page, 'contacts': response['contacts'], 'total_pages': total_pages}
+
+            if last:
+                break
+            if prefetched is not None:
+                response, prefetched = prefetched.result(), None
+            else:
+                response = fetch(page + 1, delay)
+            page += 1
+    finally:
+        closed.set()
+        if prefetched is not None:
+            prefetched.cancel()
+        executor.shutdown(wait=False)
 
 
-def map_roles_to_filters(roles: List[str], config: Config) -> Dict[str, List[str]]:
+def map_roles_to_filters(roles: List[str], config: Config) -> Mapping[str, Optional[Tuple[str, ...]]]:
     """
     Convert user-friendly roles to Apollo API filters.
 
     Args:
         roles: List of role types (e.g., ['recruiter', 'engineering_manager'])
-        config: Config instance with TITLE_MAPPINGS
+        config: Config instance with ROLE_FILTERS
 
     Returns:
-        Dictionary with 'person_titles' and 'person_seniorities' lists
+        Read-only mapping with deduplicated 'person_titles' and
+        'person_seniorities' (None when no seniorities apply)
     """
-    all_titles = []
-    all_seniorities = set()
-
-    for role in roles:
-        role_key = role.lower()
-
-        if role_key in config.TITLE_MAPPINGS:
-            role_config = config.TITLE_MAPPINGS[role_key]
-            all_titles.extend(role_config.get('titles', []))
-            all_seniorities.update(role_config.get('seniorities', []))
-
-    return {
-        'person_titles': all_titles,
-        'person_seniorities': list(all_seniorities) if all_seniorities else None
-    }
+    return config.ROLE_FILTERS.filters_for(roles)
 
 
 def extract_contact_data(person: Dict[str, Any]) -> Dict[str, Any]:
@@ -130,14 +272,18 @@ def extract_contact_data(person: Dict[str, Any]) -> Dict[str, Any]:
     """
     # Handle obfuscated data from search results
     first_name = person.get('first_name', '')
-    last_name = person.get('last_name', person.get('last_name_obfuscated', ''))
+    # Search results send last_name null (or leave it out) and the masked
+    # form in last_name_obfuscated
+    last_name = person.get('last_name')
+    if last_name is None:
+        last_name = person.get('last_name_obfuscated', '')
 
     # Build full name from available parts
     name_parts = [first_name, last_name] if last_name else [first_name]
     name = ' '.join(filter(None, name_parts)) or person.get('name', '')
 
     # Get company name from organization object or direct field
-    org = person.get('organization', {})
+    org = person.get('organization')
     company = org.get('name') if isinstance(org, dict) else person.get('organization_name', '')
 
     contact = {
@@ -163,6 +309,115 @@ def extract_contact_data(person: Dict[str, Any]) -> Dict[str, Any]:
     return contact
 
 
+if msgspec is not None:
+    class _Organization(msgspec.Struct):
+        name: Optional[str] = None
+        domain: Optional[str] = None
+
+    class _PhoneNumber(msgspec.Struct):
+        sanitized_number: Optional[str] = None
+        raw_number: Optional[str] = None
+
+    class _Person(msgspec.Struct):
+        """The person fields extract_contact_data reads; the rest is skipped."""
+        id: Optional[str] = None
+        name: Optional[str] = ''
+        first_name: Optional[str] = ''
+        last_name: Optional[str] = None
+        last_name_obfuscated: Optional[str] = ''
+        title: Optional[str] = ''
+        organization: Optional[_Organization] = None
+        organization_name: Optional[str] = ''
+        organization_domain: Optional[str] = ''
+        city: Optional[str] = ''
+        state: Optional[str] = ''
+        country: Optional[str] = ''
+        linkedin_url: Optional[str] = ''
+        seniority: Optional[str] = ''
+        departments: Optional[List[str]] = msgspec.field(default_factory=list)
+        email: Optional[str] = None
+        phone_numbers: Optional[List[_PhoneNumber]] = None
+        phone_number: Optional[str] = None
+        photo_url: Optional[str] = ''
+        headline: Optional[str] = ''
+        has_email: Any = False
+        has_direct_phone: Any = None
+
+    class _Pagination(msgspec.Struct):
+        total_pages: Optional[int] = 1
+
+    class _PeoplePage(msgspec.Struct):
+        people: Optional[List[_Person]] = None
+        pagination: _Pagination = msgspec.field(default_factory=_Pagination)
+
+    _people_page_decoder = msgspec.json.Decoder(_PeoplePage)
+
+
+def _struct_contact(person: '_Person') -> ContactRecord:
+    """extract_contact_data for a decoded _Person."""
+    first_name = person.first_name
+    last_name = person.last_name if person.last_name is not None else person.last_name_obfuscated
+    name = ' '.join(filter(None, [first_name, last_name] if last_name else [first_name])) or person.name
+
+    org = person.organization
+    phone = person.phone_numbers
+    city, state, country = person.city, person.state, person.country
+    location_parts = [part for part in (city, state or (country if country != city else '')) if part]
+
+    return ContactRecord(
+        id=person.id,
+        name=name,
+        first_name=first_name,
+        last_name=last_name,
+        title=person.title,
+        company=org.name if org is not None else person.organization_name,
+        company_domain=org.domain if org is not None else person.organization_domain,
+        location=', '.join(location_parts),
+        linkedin_url=person.linkedin_url,
+        seniority=person.seniority,
+        departments=person.departments,
+        email=person.email,
+        phone=(phone[0].sanitized_number or phone[0].raw_number) if phone else person.phone_number,
+        photo_url=person.photo_url,
+        headline=person.headline,
+        has_email=person.has_email,
+        has_phone=person.has_direct_phone == 'Yes'
+    )
+
+
+def decode_people_page(body: bytes) -> Dict[str, Any]:
+    """
+    Decode a raw people search response into contacts.
+
+    With msgspec installed the body is decoded straight into typed structs
+    holding only the fields we keep; nested objects and fields we never read
+    are skipped instead of being built as dicts. Without msgspec (or if a
+    page does not match the expected types) the full JSON is parsed and run
+    through extract_contact_data.
+
+    Args:
+        body: Response body bytes from mixed_people/api_search
+
+    Returns:
+        Dictionary with 'contacts' (ContactRecord list) and 'total_pages'
+    """
+    if msgspec is not None:
+        try:
+            page = _people_page_decoder.decode(body)
+            return {
+                'contacts': [_struct_contact(person) for person in page.people or ()],
+                'total_pages': page.pagination.total_pages
+            }
+        except msgspec.ValidationError:
+            pass
+
+    data = json.loads(body)
+    return {
+        'contacts': [ContactRecord.from_dict(extract_contact_data(person)) for person in data.get('people') or ()],
+        'total_pages': (data.get('pagination') or {}).get('total_pages', 1)
+    }
+
+
 def extract_location(person: Dict[str, Any]) -> str:
     """
     Extract location information from person data.
@@ -209,7 +464,7 @@ def paginate_results(
     client,
     initial_params: Dict[str, Any],
     max_results: Optional[int] = None
-) -> List[Dict[str, Any]]:
+) -> List[ContactRecord]:
     """
     Fetch all pages of results up to max_results.
 
@@ -219,29 +474,13 @@ def paginate_results(
         max_results: Maximum number of results to fetch
 
     Returns:
-        List of all contacts across pages
+        List of all contacts (ContactRecord) across pages
     """
+    params = {k: v for k, v in initial_params.items() if k != 'page'}
     all_contacts = []
-    page = 1
-
-    while True:
-        params = {**initial_params, 'page': page}
-        response = client.search_people(**params)
-
-        people = response.get('people', [])
-        for person in people:
-            all_contacts.append(extract_contact_data(person))
-
-        pagination = response.get('pagination', {})
-        total_pages = pagination.get('total_pages', 1)
-
+    for response in iter_search_pages(client, params, max_results=max_results, delay=0.5):
+        all_contacts.extend(response['contacts'])
         if max_results and len(all_contacts) >= max_results:
-            return all_contacts[:max_results]
-
-        if page >= total_pages:
             break
 
-        page += 1
-        time.sleep(0.5)
-
-    return all_contacts
+    return all_contacts[:max_results] if max_results else all_contacts
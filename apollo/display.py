@@ -1,5 +1,24 @@
-from typing import List, Dict, Any, Optional
-from tabulate import tabulate
+from typing import Iterable, List, Dict, Any, Optional
+
+PREVIEW_HEADERS = ['#', 'Name', 'Title', 'Location']
+
+
+def _preview_row(idx: int, contact: Dict[str, Any]) -> List[Any]:
+    """One preview table row: index, name and shortened title/location."""
+    location = contact.get('location', '')
+    if len(location) > 25:
+        location = location[:22] + '...'
+
+    title = contact.get('title', '')
+    if len(title) > 40:
+        title = title[:37] + '...'
+
+    return [
+        idx,
+        contact.get('name', 'N/A'),
+        title,
+        location
+    ]
 
 
 def show_contact_preview(contacts: List[Dict[str, Any]], max_display: int = 50) -> None:
@@ -14,30 +33,44 @@ def show_contact_preview(contacts: List[Dict[str, Any]], max_display: int = 50)
         print("\nNo contacts found.")
         return
 
-    table_data = []
-    for idx, contact in enumerate(contacts[:max_display], start=1):
-        location = contact.get('location', '')
-        if len(location) > 25:
-            location = location[:22] + '...'
+    table_data = [_preview_row(idx, contact) for idx, contact in enumerate(contacts[:max_display], start=1)]
 
-        title = contact.get('title', '')
-        if len(title) > 40:
-            title = title[:37] + '...'
+    from tabulate import tabulate
+    print("\n" + tabulate(table_data, headers=PREVIEW_HEADERS, tablefmt='grid'))
 
-        table_data.append([
-            idx,
-            contact.get('name', 'N/A'),
-            title,
-            location
-        ])
+    if len(contacts) > max_display:
+        print(f"\n... and {len(contacts) - max_display} more contacts")
 
-    headers = ['#', 'Name', 'Title', 'Location']
 
-    print("\n" + tabulate(table_data, headers=headers, tablefmt='grid'))
+def stream_contact_preview(pages: Iterable[List[Dict[str, Any]]], max_display: int = 50) -> List[Dict[str, Any]]:
+    """
+    Display preview rows page by page as search results arrive.
+
+    Args:
+        pages: Iterable of contact lists (e.g. contact_search.iter_contact_pages)
+        max_display: Maximum number of contacts to display in total
+
+    Returns:
+        All contacts from all pages
+    """
+    from tabulate import tabulate
+
+    contacts = []
+    for page in pages:
+        start = len(contacts)
+        contacts.extend(page)
+        table_data = [
+            _preview_row(idx, contact)
+            for idx, contact in enumerate(page[:max(0, max_display - start)], start=start + 1)
+        ]
+        if table_data:
+            print("\n" + tabulate(table_data, headers=PREVIEW_HEADERS if start == 0 else (), tablefmt='grid'))
 
     if len(contacts) > max_display:
         print(f"\n... and {len(contacts) - max_display} more contacts")
 
+    return contacts
+
 
 def show_summary(
     total: int,
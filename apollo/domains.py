@@ -0,0 +1,117 @@
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    # Full Mozilla Public Suffix List (ICANN and private suffixes), bundled offline
+    from publicsuffixlist import PublicSuffixList
+except ImportError:
+    PublicSuffixList = None
+
+_psl = None
+_psl_lock = threading.Lock()
+
+
+def _public_suffix_list():
+    """PublicSuffixList instance, parsed on first use (None if not installed)."""
+    global _psl
+    if _psl is None and PublicSuffixList is not None:
+        with _psl_lock:
+            if _psl is None:
+                _psl = PublicSuffixList()
+    return _psl
+
+
+def normalize_host(value: str) -> str:
+    """
+    Extract a bare lowercase host from a URL or host string.
+
+    Strips scheme, credentials, port, path, query and trailing dots, and
+    converts internationalized names to their ASCII (punycode) form.
+
+    Args:
+        value: URL, host or domain (e.g. 'https://Careers.Stripe.com:443/jobs')
+
+    Returns:
+        Host (e.g. 'careers.stripe.com'), or '' if nothing usable is found
+    """
+    value = (value or '').strip()
+    if not value:
+        return ''
+    if '://' not in value:
+        value = '//' + value
+
+    try:
+        host = urlsplit(value).hostname or ''
+    except ValueError:
+        return ''
+
+    host = host.strip('.').lower()
+    try:
+        host = host.encode('idna').decode('ascii')
+    except UnicodeError:
+        pass
+    return host
+
+
+def _is_ip(labels) -> bool:
+    return all(label.isdigit() for label in labels)
+
+
+def registrable_domain(host: str) -> str:
+    """
+    Reduce a host to its registrable domain (public suffix + one label).
+
+    Uses the Public Suffix List, so 'acme.com.do', 'foo.s3.amazonaws.com'
+    and 'x.y.k12.ca.us' keep their own registrable domain instead of
+    collapsing onto a shared suffix. Without the publicsuffixlist package
+    the suffix is unknown, so only a leading 'www.' is removed.
+
+    Args:
+        host: Bare host (see normalize_host)
+
+    Returns:
+        Registrable domain (e.g. 'careers.bbc.co.uk' -> 'bbc.co.uk');
+        IP addresses, single-label hosts and hosts that are themselves a
+        public suffix are returned unchanged
+    """
+    labels = [label for label in host.split('.') if label]
+    host = '.'.join(labels)
+    if len(labels) <= 1 or ':' in host or _is_ip(labels):
+        return host
+
+    psl = _public_suffix_list()
+    if psl is None:
+        return host[4:] if labels[0] == 'www' and len(labels) > 2 else host
+    return psl.privatesuffix(host) or host
+
+
+def is_public_suffix(domain: str) -> bool:
+    """
+    Check whether a domain is itself a public suffix (e.g. 'co.uk', 'com.do').
+
+    Args:
+        domain: Bare domain
+
+    Returns:
+        True for public suffixes and single-label names; False otherwise,
+        including whenever the Public Suffix List is not installed
+    """
+    labels = [label for label in (domain or '').split('.') if label]
+    if len(labels) <= 1:
+        return True
+    psl = _public_suffix_list()
+    return psl is not None and psl.is_public('.'.join(labels))
+
+
+def canonical_domain(value: Optional[str]) -> str:
+    """
+    Canonical company domain for a URL, host or domain.
+
+    Args:
+        value: e.g. 'https://www.careers.stripe.com:8443/', 'Stripe.com.'
+
+    Returns:
+        Registrable domain (e.g. 'stripe.com'), or '' if none can be found
+    """
+    return registrable_domain(normalize_host(value or ''))
@@ -1,25 +1,28 @@
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping, Optional, Union
+from apollo.contact_record import ContactRecord
 from apollo.display import show_enrichment_progress, print_warning
 
 
 def enrich_contacts(
-    contacts: List[Dict[str, Any]],
+    contacts: List[Union[ContactRecord, Mapping[str, Any]]],
     client,
     show_progress: bool = True,
     batch_delay: float = 0.5
-) -> List[Dict[str, Any]]:
+) -> List[Union[ContactRecord, Mapping[str, Any]]]:
     """
     Enrich contact data with emails and phone numbers (COSTS CREDITS).
 
     Args:
-        contacts: List of contact dictionaries
+        contacts: ContactRecords (or contact dictionaries)
         client: ApolloClient instance
         show_progress: Whether to show progress indicator
         batch_delay: Delay between requests in seconds
 
     Returns:
-        List of enriched contacts with email/phone data
+        List of enriched ContactRecords with email/phone data. Contacts
+        that could not be enriched or that Apollo did not match (neither
+        is charged) are returned as the same, unchanged object.
     """
     enriched_contacts = []
     total = len(contacts)
@@ -28,8 +31,10 @@ def enrich_contacts(
         try:
             enriched_data = enrich_person(contact, client)
 
-            contact_with_email = {**contact, **enriched_data}
-            enriched_contacts.append(contact_with_email)
+            if enriched_data is None:
+                enriched_contacts.append(contact)
+            else:
+                enriched_contacts.append(ContactRecord.from_dict(contact).merged(enriched_data))
 
             if show_progress:
                 show_enrichment_progress(idx, total)
@@ -48,16 +53,17 @@ def enrich_contacts(
     return enriched_contacts
 
 
-def enrich_person(contact: Dict[str, Any], client) -> Dict[str, Any]:
+def enrich_person(contact: Mapping[str, Any], client) -> Optional[Dict[str, Any]]:
     """
     Enrich a single person's data with email and phone.
 
     Args:
-        contact: Contact dictionary
+        contact: ContactRecord or contact dictionary
         client: ApolloClient instance
 
     Returns:
-        Dictionary with enriched data (email, phone, etc.)
+        Dictionary with enriched data (email, phone, etc.), or None when
+        Apollo found no matching person (no credit is charged)
     """
     person_id = contact.get('id')
     first_name = contact.get('first_name')
@@ -73,6 +79,9 @@ def enrich_person(contact: Dict[str, Any], client) -> Dict[str, Any]:
         reveal_phone_number=False  # Requires webhook_url
     )
 
+    if not response.get('person'):
+        return None
+
     return extract_email_data(response)
 
 
@@ -86,7 +95,7 @@ def extract_email_data(enrichment_response: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dictionary with extracted data
     """
-    person = enrichment_response.get('person', {})
+    person = enrichment_response.get('person') or {}
 
     email = person.get('email')
 
@@ -140,10 +149,10 @@ def extract_email_data(enrichment_response: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def batch_enrich(
-    contacts: List[Dict[str, Any]],
+    contacts: List[Union[ContactRecord, Mapping[str, Any]]],
     client,
     batch_size: int = 10
-) -> List[Dict[str, Any]]:
+) -> List[Union[ContactRecord, Mapping[str, Any]]]:
     """
     Process enrichment in batches to manage rate limits.
 
@@ -151,12 +160,12 @@ def batch_enrich(
     This function currently processes one at a time with batching for future use.
 
     Args:
-        contacts: List of contact dictionaries
+        contacts: ContactRecords (or contact dictionaries)
         client: ApolloClient instance
         batch_size: Number of contacts per batch
 
     Returns:
-        List of enriched contacts
+        List of enriched ContactRecords (failed and unmatched ones unchanged)
     """
     enriched_contacts = []
     total = len(contacts)
@@ -167,7 +176,10 @@ def batch_enrich(
         for contact in batch:
             try:
                 enriched_data = enrich_person(contact, client)
-                enriched_contacts.append({**contact, **enriched_data})
+                if enriched_data is None:
+                    enriched_contacts.append(contact)
+                else:
+                    enriched_contacts.append(ContactRecord.from_dict(contact).merged(enriched_data))
             except Exception as e:
                 print_warning(f"Failed to enrich {contact.get('name')}: {str(e)}")
                 enriched_contacts.append(contact)
@@ -1,6 +1,7 @@
 import os
 from typing import Dict, Any, Optional
 import json
+from metrics import LLM_REQUEST_SECONDS, LLM_TOKENS, LLM_ERRORS
 
 class EmailGenerator:
     def __init__(self, provider: str = "mock", api_key: Optional[str] = None, model: str = "gpt-4"):
@@ -15,9 +16,11 @@ class EmailGenerator:
         if self.provider == "mock":
             return self._generate_mock(contact, user_context)
         elif self.provider == "openai":
-            return self._generate_openai(contact, user_context, job_link)
+            with LLM_REQUEST_SECONDS.time(provider=self.provider, model=self.model):
+                return self._generate_openai(contact, user_context, job_link)
         elif self.provider == "gemini":
-            return self._generate_gemini(contact, user_context, job_link)
+            with LLM_REQUEST_SECONDS.time(provider=self.provider, model=self.model):
+                return self._generate_gemini(contact, user_context, job_link)
         else:
             print(f"Warning: Unknown provider {self.provider}, falling back to mock.")
             return self._generate_mock(contact, user_context)
@@ -57,9 +60,15 @@ Best,
                 response_format={"type": "json_object"}
             )
             
+            usage = getattr(response, 'usage', None)
+            if usage:
+                LLM_TOKENS.inc(usage.prompt_tokens or 0, provider='openai', kind='prompt')
+                LLM_TOKENS.inc(usage.completion_tokens or 0, provider='openai', kind='completion')
+
             content = response.choices[0].message.content
             return json.loads(content)
         except Exception as e:
+            LLM_ERRORS.inc(provider='openai')
             print(f"OpenAI Error: {e}")
             return self._generate_mock(contact, user_context + f"\n(Fallback due to error: {str(e)})")
 
@@ -83,8 +92,14 @@ Best,
                 config={"response_mime_type": "application/json"}
             )
 
+            usage = getattr(response, 'usage_metadata', None)
+            if usage:
+                LLM_TOKENS.inc(usage.prompt_token_count or 0, provider='gemini', kind='prompt')
+                LLM_TOKENS.inc(usage.candidates_token_count or 0, provider='gemini', kind='completion')
+
             return json.loads(response.text)
         except Exception as e:
+            LLM_ERRORS.inc(provider='gemini')
             print(f"Gemini Error: {e}")
             return self._generate_mock(contact, user_context + f"\n(Fallback due to error: {str(e)})")
 
@@ -6,7 +6,7 @@ from email.mime.application import MIMEApplication
 from email import encoders
 from email import encoders
 import os
-import markdown
+from metrics import SMTP_SEND_SECONDS, SMTP_SEND_FAILURES
 
 class EmailSender:
     def __init__(self, provider: str = "mock", smtp_config: dict = None):
@@ -20,7 +20,8 @@ class EmailSender:
         if self.provider == "mock":
             return self._send_mock(to_email, subject, body, attachment_path)
         elif self.provider == "smtp":
-            return self._send_smtp(to_email, subject, body, attachment_path)
+            with SMTP_SEND_SECONDS.time(provider=self.provider):
+                return self._send_smtp(to_email, subject, body, attachment_path)
         else:
             return self._send_mock(to_email, subject, body, attachment_path)
 
@@ -53,6 +54,7 @@ class EmailSender:
 
             # 2. HTML Version (Preferred)
             # Convert Markdown -> HTML
+            import markdown  # only needed when actually sending
             html_body = markdown.markdown(body)
             # Wrap in minimal CSS for nice fonts
             html_content = f"""
@@ -93,5 +95,6 @@ class EmailSender:
             server.quit()
             return True
         except Exception as e:
+            SMTP_SEND_FAILURES.inc(provider=self.provider)
             print(f"SMTP Error: {e}")
             raise e
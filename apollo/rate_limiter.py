@@ -0,0 +1,47 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every caller of one ApolloClient."""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate_per_second: Sustained number of requests allowed per second
+            burst: Number of requests that may be made back to back
+        """
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: int = 1) -> 'RateLimiter':
+        """Build a limiter from a requests-per-minute budget."""
+        return cls(requests_per_minute / 60.0, burst=burst)
+
+    def acquire(self) -> None:
+        """Block until a request token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_time = (1 - self._tokens) / self.rate
+
+            time.sleep(wait_time)
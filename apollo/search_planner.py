@@ -0,0 +1,194 @@
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Apollo caps per_page at 100; search_contacts never pages past MAX_PAGES
+MAX_PER_PAGE = 100
+MAX_PAGES = 10
+
+# Only role sets with at least this many titles are considered for splitting
+SPLIT_MIN_TITLES = 40
+
+
+class RoleYieldStats:
+    """
+    Learned people-per-search yield of each role.
+
+    Fed from the searches table (roles, total_found, search_limit). A search
+    that came back under its limit saw every match, so total_found divided
+    by its number of roles is a sample of each role's yield; searches cut
+    off by their limit are skipped since they only give a lower bound.
+    """
+
+    def __init__(self, max_samples: int = 200):
+        """
+        Initialize empty stats.
+
+        Args:
+            max_samples: Samples kept per role (oldest are dropped)
+        """
+        self.max_samples = max_samples
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, roles: Sequence[str], total_found: int, limit: Optional[int] = None) -> None:
+        """
+        Add one finished search.
+
+        Args:
+            roles: Roles the search asked for
+            total_found: People it returned
+            limit: Its max_results (None = unlimited)
+        """
+        roles = [r.lower() for r in roles or ()]
+        if not roles or total_found is None or (limit and total_found >= limit):
+            return
+        share = total_found / len(roles)
+        with self._lock:
+            for role in roles:
+                samples = self._samples.setdefault(role, [])
+                samples.append(share)
+                if len(samples) > self.max_samples:
+                    del samples[0]
+
+    def load(self, rows: Iterable[Tuple[Sequence[str], int, Optional[int]]]) -> int:
+        """
+        Add (roles, total_found, search_limit) rows, oldest first.
+
+        Returns:
+            Number of roles with samples afterwards
+        """
+        for roles, total_found, limit in rows:
+            self.record(roles, total_found, limit)
+        return len(self._samples)
+
+    def expected(self, role: str) -> Optional[float]:
+        """Mean people per search for `role`, or None without samples."""
+        samples = self._samples.get(role.lower())
+        return sum(samples) / len(samples) if samples else None
+
+
+class SearchPlan:
+    """Apollo people-search queries chosen for one search_contacts call."""
+
+    __slots__ = ('queries', 'limits', 'max_pages', 'expected', 'reason')
+
+    def __init__(self, queries: List[Dict[str, Any]], limits: List[Optional[int]], max_pages: int,
+                 expected: Optional[float], reason: str):
+        self.queries = queries
+        self.limits = limits
+        self.max_pages = max_pages
+        self.expected = expected
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"<SearchPlan(queries={len(self.queries)}, per_page={self.queries[0]['per_page']}, reason='{self.reason}')>"
+
+
+def _pages(wanted: float, per_page: int, max_pages: int) -> Tuple[int, float]:
+    """(pages fetched, people covered) for one query that should return `wanted` people."""
+    pages = min(max_pages, max(1, math.ceil(wanted / per_page)))
+    return pages, min(wanted, pages * per_page)
+
+
+def _query(filters: Mapping[str, Optional[Tuple[str, ...]]], org_filter: Dict[str, List[str]],
+           per_page: int) -> Dict[str, Any]:
+    params: Dict[str, Any] = {'per_page': per_page, **org_filter}
+    if filters['person_titles']:
+        params['person_titles'] = filters['person_titles']
+        params['include_similar_titles'] = True
+    if filters['person_seniorities']:
+        params['person_seniorities'] = filters['person_seniorities']
+    return params
+
+
+def plan_search(
+    roles: Sequence[str],
+    company_domain: str,
+    role_filters,
+    company_info: Optional[Dict] = None,
+    max_results: Optional[int] = None,
+    default_per_page: int = MAX_PER_PAGE,
+    incremental: bool = False,
+    stats: Optional[RoleYieldStats] = None
+) -> SearchPlan:
+    """
+    Choose the cheapest set of people-search queries for a search.
+
+    - per_page is sized from max_results, so a 10-contact search asks for
+      10 people instead of 100 (incremental searches keep full pages, since
+      known people are dropped after the fact).
+    - organization_ids is used when the organization ID is known (exact),
+      q_organization_domains otherwise.
+    - With learned yields for every role, a large multi-role title list is
+      split into one query per role (run in parallel) when that covers more
+      people, or the same number in no more pages and fewer sequential
+      rounds, than one combined query.
+
+    Args:
+        roles: Role types (e.g. ['recruiter', 'cto'])
+        company_domain: Company domain
+        role_filters: RoleFilterIndex (Config.ROLE_FILTERS)
+        company_info: Company info dict with organization_id (optional)
+        max_results: Maximum number of contacts wanted
+        default_per_page: Page size when nothing better is known
+        incremental: Known people will be filtered out of the results
+        stats: Learned role yields (optional)
+
+    Returns:
+        SearchPlan: search_people kwargs per query (without 'page') and the
+        number of people each query should stop at (None = no limit)
+    """
+    if company_info and company_info.get('organization_id'):
+        org_filter = {'organization_ids': [company_info['organization_id']]}
+    else:
+        org_filter = {'organization_domains': [company_domain]}
+
+    default_per_page = max(1, min(default_per_page, MAX_PER_PAGE))
+    if max_results and not incremental:
+        per_page = min(default_per_page, max_results)
+    else:
+        per_page = default_per_page
+
+    combined = role_filters.filters_for(roles)
+    single = SearchPlan([_query(combined, org_filter, per_page)], [max_results], MAX_PAGES, None, 'single query')
+
+    role_keys = [r.lower() for r in dict.fromkeys(roles) if r.lower() in role_filters.titles]
+    titles = combined['person_titles'] or ()
+    if stats is None or incremental or len(role_keys) < 2 or len(titles) < SPLIT_MIN_TITLES:
+        return single
+
+    expected = {role: stats.expected(role) for role in role_keys}
+    if any(value is None for value in expected.values()):
+        return single
+
+    total_expected = sum(expected.values())
+    single.expected = total_expected
+    if total_expected <= 0:
+        return single
+
+    wanted = min(total_expected, max_results) if max_results else total_expected
+    single_pages, single_covered = _pages(wanted, per_page, MAX_PAGES)
+
+    # One query per role, each asking for its expected share of `wanted`
+    split_queries, split_limits = [], []
+    split_pages, split_rounds, split_covered = 0, 0, 0.0
+    for role in role_keys:
+        share = wanted * expected[role] / total_expected
+        role_wanted = max(1, math.ceil(share))
+        role_per_page = min(default_per_page, role_wanted) if max_results else default_per_page
+        pages, covered = _pages(share, role_per_page, MAX_PAGES)
+        split_pages += pages
+        split_rounds = max(split_rounds, pages)
+        split_covered += covered
+        split_queries.append(_query(role_filters.filters_for([role]), org_filter, role_per_page))
+        split_limits.append(role_wanted if max_results else None)
+
+    if split_covered > single_covered + 0.5 or (
+        split_covered >= single_covered - 0.5 and split_pages <= single_pages and split_rounds < single_pages
+    ):
+        return SearchPlan(
+            split_queries, split_limits, MAX_PAGES, total_expected,
+            f"split by role: {split_pages} pages in {split_rounds} rounds vs {single_pages} pages"
+        )
+    return single
@@ -0,0 +1,68 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    """One in-flight call: its outcome and a completion event."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent identical calls.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is running wait and receive the same result (or the
+    same exception). Nothing is cached once the call finishes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn() once for all concurrent callers of `key`.
+
+        Args:
+            key: Hashable identity of the call
+            fn: Zero-argument function doing the work
+
+        Returns:
+            Tuple of (result, shared) where shared is True for callers that
+            joined another caller's in-flight call
+
+        Raises:
+            Whatever fn() raised, in every caller that shared the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
@@ -0,0 +1,270 @@
+import re
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# Title shorthand expanded before matching (applied to mapped titles too)
+ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'mgr': 'manager', 'mngr': 'manager',
+    'dir': 'director', 'engr': 'engineer', 'eng': 'engineering', 'mktg': 'marketing',
+    'svp': 'senior vp', 'evp': 'executive vp', 'avp': 'associate vp',
+    'cofounder': 'co founder', 'hrbp': 'hr business partner',
+}
+
+# Words with no meaning for matching ("VP of Sales" == "VP Sales")
+STOP_WORDS = frozenset({'of', 'the', 'and', 'for', 'at', 'a', 'an', 'in'})
+
+# Title words -> Apollo seniority levels, most senior level first. Single
+# normalized words only ('cofounder' normalizes to 'co founder')
+SENIORITY_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('owner', ('owner',)),
+    ('founder', ('founder', 'founding')),
+    ('c_suite', ('chief', 'ceo', 'cto', 'cfo', 'coo', 'cio', 'cmo', 'cro', 'cpo', 'cpto', 'president')),
+    ('partner', ('partner',)),
+    ('vp', ('vp',)),
+    ('head', ('head',)),
+    ('director', ('director',)),
+    ('manager', ('manager',)),
+    ('senior', ('senior', 'lead', 'principal', 'staff')),
+    ('intern', ('intern', 'internship', 'trainee', 'student')),
+    ('entry', ('junior', 'associate', 'assistant', 'coordinator', 'entry')),
+)
+
+# Junior markers outside the matched phrase halve a role score
+JUNIOR_LEVELS = frozenset({'entry', 'intern'})
+
+
+def normalize_job_title(title: Optional[str]) -> str:
+    """
+    Normalize a job title for matching.
+
+    Lowercases, strips punctuation, expands abbreviations and drops stop
+    words, e.g. 'Sr. Mgr, Talent Acquisition' -> 'senior manager talent acquisition'.
+
+    Args:
+        title: Job title as returned by Apollo
+
+    Returns:
+        Space-separated normalized title ('' for empty input)
+    """
+    words = _NON_ALNUM.sub(' ', (title or '').lower()).split()
+    expanded = ' '.join(ABBREVIATIONS.get(w, w) for w in words if w not in STOP_WORDS)
+    return expanded.replace('vice president', 'vp')
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Regex alternation factored into a trie over words.
+
+    Shared prefixes are matched once, and a phrase that continues is always
+    tried before stopping, so every match is the longest phrase at its start.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for word in phrase.split():
+            node = node.setdefault(word, {})
+        node[''] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(word) + _continuation(child) for word, child in sorted(node.items()) if word]
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    def _continuation(child: Dict[str, Any]) -> str:
+        if not child.keys() - {''}:
+            return ''
+        rest = ' ' + build(child)
+        # Optional (greedy) when the phrase may also end here
+        return f'(?:{rest})?' if '' in child else rest
+
+    return r'\b' + build(trie) + r'\b'
+
+
+class TitleMatch:
+    """Classification of one job title."""
+
+    __slots__ = ('role', 'score', 'seniority', 'scores')
+
+    def __init__(self, role: Optional[str], score: float, seniority: Optional[str],
+                 scores: Mapping[str, float]):
+        self.role = role
+        self.score = score
+        self.seniority = seniority
+        self.scores = scores
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'match_role': self.role, 'match_score': self.score, 'match_seniority': self.seniority}
+
+    def __repr__(self) -> str:
+        return f"<TitleMatch(role='{self.role}', score={self.score}, seniority='{self.seniority}')>"
+
+
+_NO_MATCH_SCORES: Mapping[str, float] = {}
+
+
+class TitleClassifier:
+    """
+    Local role/seniority classifier for job titles, built from TITLE_MAPPINGS.
+
+    All mapped titles are normalized and compiled into one word-trie regex,
+    so a title is scanned once for every role. A role scores 1.0 when the
+    whole title is one of its phrases, otherwise 0.4 + 0.6 * the share of
+    the title its longest phrase covers. A seniority in the role's allowed
+    list adds 0.1; a junior marker outside the matched phrase ('Recruiter
+    Intern') halves the score. Results are cached per title.
+    """
+
+    def __init__(self, title_mappings: Mapping[str, Mapping], cache_size: int = 50000):
+        """
+        Compile the classifier.
+
+        Args:
+            title_mappings: Config.TITLE_MAPPINGS-style dict (role -> titles/seniorities)
+            cache_size: Titles remembered (cache is cleared when full)
+        """
+        self._phrase_roles: Dict[str, FrozenSet[str]] = {}
+        self._role_seniorities: Dict[str, FrozenSet[str]] = {}
+        phrase_roles: Dict[str, set] = {}
+        for role, role_config in title_mappings.items():
+            role = role.lower()
+            self._role_seniorities[role] = frozenset(role_config.get('seniorities', []))
+            for title in role_config.get('titles', []):
+                phrase = normalize_job_title(title)
+                if phrase:
+                    phrase_roles.setdefault(phrase, set()).add(role)
+        self._phrase_roles = {phrase: frozenset(roles) for phrase, roles in phrase_roles.items()}
+        self.roles: Tuple[str, ...] = tuple(self._role_seniorities)
+
+        self._pattern = re.compile(_trie_pattern(self._phrase_roles))
+        # word -> (rank, level); a dict lookup per word beats a regex per level
+        self._seniority_words: Dict[str, Tuple[int, str]] = {}
+        for rank, (level, words) in reversed(list(enumerate(SENIORITY_KEYWORDS))):
+            for word in words:
+                self._seniority_words[word] = (rank, level)
+        self._cache: Dict[str, Tuple[Mapping[str, float], Optional[str]]] = {}
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def _seniority(self, text: str, spans: Sequence[Tuple[int, int]]) -> Tuple[Optional[str], bool]:
+        """(most senior level in text, junior marker outside the matched spans)."""
+        level = None
+        best_rank = len(SENIORITY_KEYWORDS)
+        junior_outside = False
+        start = 0
+        for word in text.split(' '):
+            end = start + len(word)
+            found = self._seniority_words.get(word)
+            if found is not None:
+                rank, name = found
+                if rank < best_rank:
+                    level, best_rank = name, rank
+                if name in JUNIOR_LEVELS and not junior_outside:
+                    junior_outside = not any(s <= start and end <= e for s, e in spans)
+            start = end + 1
+        return level, junior_outside
+
+    def _classify_title(self, title: str) -> Tuple[Mapping[str, float], Optional[str]]:
+        cached = self._cache.get(title)
+        if cached is not None:
+            return cached
+
+        text = normalize_job_title(title)
+        best: Dict[str, int] = {}
+        spans = []
+        for match in self._pattern.finditer(text):
+            phrase = match.group(0)
+            spans.append(match.span())
+            for role in self._phrase_roles.get(phrase, ()):
+                best[role] = max(best.get(role, 0), len(phrase))
+
+        level, junior_outside = self._seniority(text, spans)
+
+        scores: Dict[str, float] = {}
+        for role, matched in best.items():
+            score = 1.0 if matched == len(text) else 0.4 + 0.6 * matched / len(text)
+            if level in self._role_seniorities[role]:
+                score += 0.1
+            if junior_outside:
+                score *= 0.5
+            scores[role] = round(min(score, 1.0), 3)
+
+        result = (scores or _NO_MATCH_SCORES, level)
+        with self._lock:
+            if len(self._cache) >= self._cache_size:
+                self._cache.clear()
+            self._cache[title] = result
+        return result
+
+    def classify(self, title: Optional[str], roles: Optional[Iterable[str]] = None,
+                 seniority: Optional[str] = None) -> TitleMatch:
+        """
+        Classify one job title.
+
+        Args:
+            title: Job title (e.g. 'Sr. Technical Recruiter')
+            roles: Only consider these roles (default: all mapped roles)
+            seniority: Apollo seniority of the person, used when the title
+                itself has no seniority words
+
+        Returns:
+            TitleMatch with the best role (None if nothing matched), its
+            score in [0, 1], the seniority level and every role's score
+        """
+        scores, level = self._classify_title(title or '')
+        if roles is not None:
+            wanted = {r.lower() for r in roles}
+            scores = {role: score for role, score in scores.items() if role in wanted}
+
+        role = max(scores, key=scores.get) if scores else None
+        return TitleMatch(role, scores[role] if role else 0.0, level or seniority or None, scores)
+
+    def classify_many(self, titles: Iterable[Optional[str]],
+                      roles: Optional[Iterable[str]] = None) -> List[TitleMatch]:
+        """Classify many titles (see classify)."""
+        roles = list(roles) if roles is not None else None
+        return [self.classify(title, roles) for title in titles]
+
+    def score_contacts(self, contacts: Iterable[Any], roles: Optional[Iterable[str]] = None) -> List[TitleMatch]:
+        """
+        Classify the title of each contact (dict or ContactRecord).
+
+        Args:
+            contacts: Contacts with 'title' (and optionally 'seniority')
+            roles: Roles searched for (default: all mapped roles)
+
+        Returns:
+            One TitleMatch per contact, in order
+        """
+        roles = list(roles) if roles is not None else None
+        return [self.classify(c.get('title'), roles, c.get('seniority')) for c in contacts]
+
+    def rank(self, contacts: Sequence[Any], roles: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Contacts ordered best match first (stable for equal scores).
+
+        Args:
+            contacts: Contacts with 'title'
+            roles: Roles searched for (default: all mapped roles)
+
+        Returns:
+            New list with the same contact objects
+        """
+        matches = self.score_contacts(contacts, roles)
+        order = sorted(range(len(contacts)), key=lambda i: -matches[i].score)
+        return [contacts[i] for i in order]
+
+
+_default_classifier: Optional[TitleClassifier] = None
+_default_lock = threading.Lock()
+
+
+def get_title_classifier() -> TitleClassifier:
+    """Classifier for Config.TITLE_MAPPINGS, compiled on first use."""
+    global _default_classifier
+    if _default_classifier is None:
+        with _default_lock:
+            if _default_classifier is None:
+                from config import Config
+                _default_classifier = TitleClassifier(Config.TITLE_MAPPINGS)
+    return _default_classifier
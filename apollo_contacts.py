@@ -5,22 +5,12 @@ Find recruiter, manager, and executive contacts at target companies.
 """
 
 import argparse
+import os
 import sys
-from config import load_config, validate_api_key, mask_api_key
-from apollo.api_client import ApolloClient, ApolloAPIError, AuthenticationError
-from apollo.company_resolver import resolve_company_input
-from apollo.contact_search import search_contacts
-from apollo.enrichment import enrich_contacts
-from apollo.export import export_to_json
-from apollo.display import (
-    show_contact_preview,
-    show_summary,
-    confirm_enrichment,
-    print_error,
-    print_success,
-    print_info,
-    print_warning
-)
+
+# Heavy modules (requests, validators, tabulate, config's title table) are
+# imported inside the functions that need them, so --help and argument
+# errors return immediately.
 
 
 def parse_args():
@@ -44,14 +34,29 @@ Examples:
 
   # Skip email enrichment (free search only)
   python apollo_contacts.py "Apple" --roles cto --skip-enrichment
+
+  # Search every company listed in a file (one per line, resumable)
+  python apollo_contacts.py --batch companies.txt --roles recruiter --limit 20
         '''
     )
 
     parser.add_argument(
         'company',
+        nargs='?',
         help='Company name, URL, or domain (e.g., "Google", "https://stripe.com", "shopify.com")'
     )
 
+    parser.add_argument(
+        '--batch', '-b',
+        metavar='FILE',
+        help='Text file with one company per line; searches all of them (no enrichment)'
+    )
+
+    parser.add_argument(
+        '--checkpoint',
+        help='Checkpoint file for --batch runs (default: <output-dir>/<batch file name>.checkpoint.json)'
+    )
+
     parser.add_argument(
         '--roles', '-r',
         nargs='+',
@@ -95,13 +100,86 @@ Examples:
         help='Verbose output with debug information'
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    if not args.company and not args.batch:
+        parser.error('a company or --batch FILE is required')
+
+    return args
+
+
+def run_batch(args, config, client, roles, directory=None):
+    """Search every company listed in args.batch and export one JSON file each."""
+    from apollo.batch import run_batch_search, read_company_list
+    from apollo.export import export_to_json
+    from apollo.display import print_success, print_info, print_warning
+
+    companies = read_company_list(args.batch)
+    if not companies:
+        print_warning(f"No companies found in {args.batch}")
+        return 1
+
+    checkpoint_path = args.checkpoint or os.path.join(
+        args.output_dir,
+        os.path.splitext(os.path.basename(args.batch))[0] + '.checkpoint.json'
+    )
+
+    print(f"Batch searching {len(companies)} companies for {', '.join(roles)} contacts...")
+    print(f"Checkpoint: {checkpoint_path}\n")
+
+    def store(company_info, contacts):
+        if not contacts:
+            return None
+        return export_to_json(
+            contacts=contacts,
+            output_dir=args.output_dir,
+            company_name=company_info['name'],
+            company_domain=company_info['domain'],
+            target_roles=roles,
+            enriched=False
+        )
+
+    results = run_batch_search(
+        companies,
+        roles,
+        client,
+        store=store,
+        max_results=args.limit,
+        config=config,
+        checkpoint_path=checkpoint_path,
+        directory=directory
+    )
+
+    done = [r for r in results if r['status'] == 'done']
+    failed = [r for r in results if r['status'] != 'done']
+    total_contacts = sum(r.get('found', 0) for r in done)
+
+    print_success(f"Searched {len(done)}/{len(results)} companies, {total_contacts} contacts exported to {args.output_dir}/")
+    for r in failed:
+        print(f"  - {r['input']}: {r['status']} ({r.get('error', '')})")
+
+    if failed:
+        print_info("Re-run the same command to retry failed companies.")
+
+    return 0 if not failed else 1
 
 
 def main():
     """Main execution flow."""
     args = parse_args()
 
+    from config import load_config, validate_api_key, mask_api_key
+    from apollo.api_client import ApolloClient, ApolloAPIError, AuthenticationError
+    from apollo.display import (
+        stream_contact_preview,
+        show_summary,
+        confirm_enrichment,
+        print_error,
+        print_success,
+        print_info,
+        print_warning
+    )
+
     try:
         print("\n" + "="*60)
         print("APOLLO COLD EMAILING TOOL")
@@ -115,26 +193,42 @@ def main():
             print(f"API Key: {mask_api_key(config.APOLLO_API_KEY)}")
             print(f"API Base URL: {config.API_BASE_URL}\n")
 
-        client = ApolloClient(config.APOLLO_API_KEY, config.API_BASE_URL)
+        client = ApolloClient.from_config(config)
 
-        print(f"Resolving company: {args.company}")
-        company_info = resolve_company_input(args.company, client)
-        print(f"Found: {company_info['name']} ({company_info['domain']})\n")
+        directory = None
+        if config.COMPANY_DIRECTORY_CSV:
+            from apollo.company_directory import CompanyDirectory
+            directory = CompanyDirectory()
+            directory.load_csv(config.COMPANY_DIRECTORY_CSV)
+            if args.verbose:
+                print(f"Company directory: {len(directory)} companies from {config.COMPANY_DIRECTORY_CSV}\n")
 
         if 'all' in args.roles:
             roles = ['recruiter', 'engineering_manager', 'cto']
         else:
             roles = args.roles
 
+        if args.batch:
+            return run_batch(args, config, client, roles, directory)
+
+        from apollo.company_resolver import resolve_company_input
+        from apollo.contact_search import iter_contact_pages
+        from apollo.export import export_to_json
+
+        print(f"Resolving company: {args.company}")
+        company_info = resolve_company_input(args.company, client, directory)
+        print(f"Found: {company_info['name']} ({company_info['domain']})\n")
+
         print(f"Searching for {', '.join(roles)} contacts...")
-        contacts = search_contacts(
+        # Rows are printed as each page arrives; the next page is prefetched meanwhile
+        contacts = stream_contact_preview(iter_contact_pages(
             company_domain=company_info['domain'],
             target_roles=roles,
             client=client,
             max_results=args.limit,
             config=config,
             company_info=company_info
-        )
+        ))
 
         if not contacts:
             print_warning(f"No contacts found matching criteria at {company_info['name']}.")
@@ -146,8 +240,6 @@ def main():
 
         print(f"\nFound {len(contacts)} contacts")
 
-        show_contact_preview(contacts)
-
         show_summary(
             total=len(contacts),
             company=company_info['name'],
@@ -164,6 +256,8 @@ def main():
                 proceed = confirm_enrichment(len(contacts))
 
             if proceed:
+                from apollo.enrichment import enrich_contacts
+
                 print("\nEnriching contacts with emails (this will consume credits)...")
                 contacts = enrich_contacts(contacts, client, show_progress=True)
                 enriched = True
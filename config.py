@@ -1,4 +1,7 @@
 import os
+from itertools import combinations
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,10 +11,36 @@ class Config:
     """Configuration management for Apollo API tool."""
 
     APOLLO_API_KEY = os.getenv('APOLLO_API_KEY', '')
-    API_BASE_URL = "https://api.apollo.io"
+    API_BASE_URL = os.getenv('APOLLO_API_BASE_URL', 'https://api.apollo.io')
     DEFAULT_PER_PAGE = int(os.getenv('DEFAULT_PER_PAGE', '100'))
     DEFAULT_PER_PAGE = int(os.getenv('DEFAULT_PER_PAGE', '100'))
     DEFAULT_OUTPUT_DIR = os.getenv('DEFAULT_OUTPUT_DIR', 'outputs')
+    APOLLO_RATE_LIMIT_PER_MINUTE = float(os.getenv('APOLLO_RATE_LIMIT_PER_MINUTE', '100'))
+    APOLLO_RATE_LIMIT_BURST = int(os.getenv('APOLLO_RATE_LIMIT_BURST', '5'))
+
+    # Retry budget and circuit breaker for Apollo calls
+    APOLLO_REQUEST_DEADLINE = float(os.getenv('APOLLO_REQUEST_DEADLINE', '30'))
+    APOLLO_BACKOFF_BASE = float(os.getenv('APOLLO_BACKOFF_BASE', '0.5'))
+    APOLLO_BACKOFF_CAP = float(os.getenv('APOLLO_BACKOFF_CAP', '10'))
+    APOLLO_BREAKER_FAILURE_THRESHOLD = int(os.getenv('APOLLO_BREAKER_FAILURE_THRESHOLD', '5'))
+    APOLLO_BREAKER_RECOVERY_SECONDS = float(os.getenv('APOLLO_BREAKER_RECOVERY_SECONDS', '30'))
+
+    # HTTP timeouts and connection pool for Apollo calls
+    APOLLO_CONNECT_TIMEOUT = float(os.getenv('APOLLO_CONNECT_TIMEOUT', '5'))
+    APOLLO_READ_TIMEOUT = float(os.getenv('APOLLO_READ_TIMEOUT', '30'))
+    APOLLO_POOL_CONNECTIONS = int(os.getenv('APOLLO_POOL_CONNECTIONS', '10'))
+    APOLLO_POOL_MAXSIZE = int(os.getenv('APOLLO_POOL_MAXSIZE', '32'))
+    APOLLO_KEEP_ALIVE = os.getenv('APOLLO_KEEP_ALIVE', 'true').lower() in ('1', 'true', 'yes')
+
+    # Credit budgets for people/match enrichment (0 = unlimited)
+    APOLLO_DAILY_CREDIT_BUDGET = int(os.getenv('APOLLO_DAILY_CREDIT_BUDGET', '0'))
+    APOLLO_MONTHLY_CREDIT_BUDGET = int(os.getenv('APOLLO_MONTHLY_CREDIT_BUDGET', '0'))
+
+    # Optional CSV (name,domain[,organization_id]) preloaded into the offline company directory
+    COMPANY_DIRECTORY_CSV = os.getenv('COMPANY_DIRECTORY_CSV', '')
+
+    # Stored emails older than this are re-enriched (0 = reuse forever)
+    ENRICHMENT_MAX_AGE_DAYS = int(os.getenv('ENRICHMENT_MAX_AGE_DAYS', '0'))
 
     # AI Config
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
@@ -253,6 +282,77 @@ class Config:
     }
 
 
+def normalize_title(title: str) -> str:
+    """Collapse whitespace in a job title (e.g. ' VP   Sales ' -> 'VP Sales')."""
+    return ' '.join(title.split())
+
+
+class RoleFilterIndex:
+    """
+    Read-only Apollo search filters precomputed from TITLE_MAPPINGS.
+
+    Titles are normalized and deduplicated (case-insensitively, first spelling
+    wins), and a filter bundle is built for every combination of roles up
+    front, so a search gets its payload with a single dict lookup.
+    """
+
+    __slots__ = ('role_order', 'titles', 'seniorities', '_bundles')
+
+    def __init__(self, title_mappings: Mapping[str, Mapping]):
+        self.role_order: Tuple[str, ...] = tuple(role.lower() for role in title_mappings)
+
+        titles: Dict[str, Tuple[str, ...]] = {}
+        seniorities: Dict[str, FrozenSet[str]] = {}
+        for role, role_config in title_mappings.items():
+            titles[role.lower()] = self._dedupe(role_config.get('titles', []))
+            seniorities[role.lower()] = frozenset(role_config.get('seniorities', []))
+
+        self.titles: Mapping[str, Tuple[str, ...]] = MappingProxyType(titles)
+        self.seniorities: Mapping[str, FrozenSet[str]] = MappingProxyType(seniorities)
+
+        bundles = {}
+        for size in range(len(self.role_order) + 1):
+            for roles in combinations(self.role_order, size):
+                bundles[frozenset(roles)] = self._build_bundle(roles)
+        self._bundles: Mapping[FrozenSet[str], Mapping] = MappingProxyType(bundles)
+
+    @staticmethod
+    def _dedupe(titles: Iterable[str]) -> Tuple[str, ...]:
+        seen = set()
+        unique = []
+        for title in titles:
+            title = normalize_title(title)
+            key = title.lower()
+            if title and key not in seen:
+                seen.add(key)
+                unique.append(title)
+        return tuple(unique)
+
+    def _build_bundle(self, roles: Tuple[str, ...]) -> Mapping:
+        person_seniorities = frozenset().union(*(self.seniorities[r] for r in roles))
+        return MappingProxyType({
+            'person_titles': self._dedupe(t for r in roles for t in self.titles[r]),
+            'person_seniorities': tuple(sorted(person_seniorities)) or None
+        })
+
+    def filters_for(self, roles: Iterable[str]) -> Mapping[str, Optional[Tuple[str, ...]]]:
+        """
+        Get the Apollo filter payload for a set of roles.
+
+        Args:
+            roles: Role keys (case-insensitive); unknown roles are ignored
+
+        Returns:
+            Read-only mapping with 'person_titles' and 'person_seniorities'
+        """
+        key = frozenset(r.lower() for r in roles if r.lower() in self.titles)
+        return self._bundles[key]
+
+
+# Built once at import time; shared by every Config instance
+Config.ROLE_FILTERS = RoleFilterIndex(Config.TITLE_MAPPINGS)
+
+
 def load_config():
     """Load and return configuration."""
     return Config()
@@ -1,25 +1,47 @@
 """Database package for Apollo Cold Emailer."""
-from .database import get_db, get_db_session, init_db, test_connection, engine, Base, IS_SUPABASE
-from .models import Company, Contact, Search, EmailDraft, EmailHistory, Tag, ContactTag
+from .database import get_db, get_db_session, init_db, test_connection, get_engine, Base, IS_SUPABASE
+from .models import Company, Contact, Search, EmailDraft, EmailHistory, Tag, ContactTag, CreditUsage
 from .db_operations import (
-    upsert_company, upsert_contact, create_search,
-    get_company_by_domain, get_contacts_by_company,
-    get_unenriched_contacts, search_contacts,
+    upsert_company, upsert_contact, upsert_contacts, create_search,
+    get_last_search, get_known_apollo_ids, get_role_yield_rows,
+    get_company_by_domain, get_or_create_companies, get_company_directory_rows,
+    get_contacts_by_company, get_company_contact_rows,
+    get_company_contacts_version, company_has_contacts,
+    get_unenriched_contacts, get_fresh_enriched_contacts, search_contacts,
     create_email_history, check_email_sent,
+    load_emailed_addresses, mark_address_emailed, is_address_emailed,
+    emailed_addresses_version,
     get_company_stats, get_all_companies,
-    export_contacts_to_dict
+    export_contacts_to_dict, contact_rows_to_dicts
+)
+from .credit_ledger import (
+    reserve_credits, release_credits, get_credit_status, admit_enrichment
 )
 
 __all__ = [
     # Database
-    'get_db', 'get_db_session', 'init_db', 'test_connection', 'engine', 'Base', 'IS_SUPABASE',
+    'get_db', 'get_db_session', 'init_db', 'test_connection', 'get_engine', 'Base', 'IS_SUPABASE',
     # Models
-    'Company', 'Contact', 'Search', 'EmailDraft', 'EmailHistory', 'Tag', 'ContactTag',
+    'Company', 'Contact', 'Search', 'EmailDraft', 'EmailHistory', 'Tag', 'ContactTag', 'CreditUsage',
     # Operations
-    'upsert_company', 'upsert_contact', 'create_search',
-    'get_company_by_domain', 'get_contacts_by_company',
-    'get_unenriched_contacts', 'search_contacts',
+    'upsert_company', 'upsert_contact', 'upsert_contacts', 'create_search',
+    'get_last_search', 'get_known_apollo_ids', 'get_role_yield_rows',
+    'get_company_by_domain', 'get_or_create_companies', 'get_company_directory_rows',
+    'get_contacts_by_company', 'get_company_contact_rows',
+    'get_company_contacts_version', 'company_has_contacts',
+    'get_unenriched_contacts', 'get_fresh_enriched_contacts', 'search_contacts',
     'create_email_history', 'check_email_sent',
+    'load_emailed_addresses', 'mark_address_emailed', 'is_address_emailed',
+    'emailed_addresses_version',
     'get_company_stats', 'get_all_companies',
-    'export_contacts_to_dict'
+    'export_contacts_to_dict', 'contact_rows_to_dicts',
+    # Credit ledger
+    'reserve_credits', 'release_credits', 'get_credit_status', 'admit_enrichment'
 ]
+
+
+def __getattr__(name):
+    # `engine` is created on first access (see database.get_engine)
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,150 @@
+"""
+Apollo credit ledger and enrichment admission control.
+
+Credits are reserved in the ledger before people/match is called and the
+unused part is released afterwards, so concurrent enrichments can never
+spend more than the daily/monthly budget between them.
+"""
+from datetime import date
+from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func
+from .models import CreditUsage
+from .db_operations import export_contacts_to_dict, get_fresh_enriched_contacts
+from metrics import timed, DB_QUERY_SECONDS
+
+
+def _month_used(db: Session, today: date) -> int:
+    return db.query(func.coalesce(func.sum(CreditUsage.credits_used), 0)).filter(
+        CreditUsage.usage_date >= today.replace(day=1),
+        CreditUsage.usage_date <= today
+    ).scalar() or 0
+
+
+@timed(DB_QUERY_SECONDS, operation='reserve_credits')
+def reserve_credits(db: Session, requested: int, daily_budget: int = 0,
+                    monthly_budget: int = 0, usage_date: Optional[date] = None) -> int:
+    """
+    Atomically reserve up to `requested` credits within the budgets.
+
+    The day's ledger row is locked (SELECT ... FOR UPDATE) for the duration
+    of the check-and-increment, which serializes concurrent reservations.
+
+    Args:
+        db: Database session
+        requested: Credits wanted
+        daily_budget: Max credits per day (0 = unlimited)
+        monthly_budget: Max credits per calendar month (0 = unlimited)
+        usage_date: Ledger day to reserve on (default: today)
+
+    Returns:
+        Number of credits granted (0..requested)
+    """
+    if requested <= 0:
+        return 0
+
+    today = usage_date or date.today()
+    db.execute(
+        insert(CreditUsage)
+        .values(usage_date=today, credits_used=0)
+        .on_conflict_do_nothing(index_elements=['usage_date'])
+    )
+    row = db.query(CreditUsage).filter(CreditUsage.usage_date == today).with_for_update().one()
+
+    granted = requested
+    if daily_budget:
+        granted = min(granted, max(0, daily_budget - row.credits_used))
+    if monthly_budget:
+        granted = min(granted, max(0, monthly_budget - _month_used(db, today)))
+
+    row.credits_used += granted
+    db.commit()
+    return granted
+
+
+@timed(DB_QUERY_SECONDS, operation='release_credits')
+def release_credits(db: Session, credits: int, usage_date: Optional[date] = None) -> None:
+    """
+    Return unused reserved credits to the budget they were reserved from.
+
+    Args:
+        db: Database session
+        credits: Credits to give back
+        usage_date: Ledger day of the reservation (default: today); pass the
+            reservation's day so a release after midnight hits the right row
+    """
+    if credits <= 0:
+        return
+
+    db.query(CreditUsage).filter(CreditUsage.usage_date == (usage_date or date.today())).update(
+        {CreditUsage.credits_used: func.greatest(CreditUsage.credits_used - credits, 0)},
+        synchronize_session=False
+    )
+    db.commit()
+
+
+@timed(DB_QUERY_SECONDS, operation='get_credit_status')
+def get_credit_status(db: Session, daily_budget: int = 0, monthly_budget: int = 0) -> Dict[str, Any]:
+    """
+    Get credit usage and remaining budget.
+
+    Returns:
+        Dictionary with daily/monthly used, budget and remaining
+        (remaining is None when the budget is unlimited)
+    """
+    today = date.today()
+    daily_used = db.query(CreditUsage.credits_used).filter(
+        CreditUsage.usage_date == today
+    ).scalar() or 0
+    monthly_used = _month_used(db, today)
+
+    return {
+        'daily_used': daily_used,
+        'daily_budget': daily_budget or None,
+        'daily_remaining': max(0, daily_budget - daily_used) if daily_budget else None,
+        'monthly_used': monthly_used,
+        'monthly_budget': monthly_budget or None,
+        'monthly_remaining': max(0, monthly_budget - monthly_used) if monthly_budget else None
+    }
+
+
+@timed(DB_QUERY_SECONDS, operation='admit_enrichment')
+def admit_enrichment(db: Session, contacts: List[Dict[str, Any]], daily_budget: int = 0,
+                     monthly_budget: int = 0, max_age_days: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Decide which contacts may be sent to people/match.
+
+    Contacts already enriched in the database (and not older than
+    max_age_days) are answered from storage without spending credits. The
+    rest are admitted in order while the budget allows; anything over
+    budget is rejected.
+
+    Args:
+        db: Database session
+        contacts: Contact dictionaries from the client (with Apollo 'id')
+        daily_budget: Max credits per day (0 = unlimited)
+        monthly_budget: Max credits per calendar month (0 = unlimited)
+        max_age_days: Re-enrich stored contacts older than this (None/0 = never)
+
+    Returns:
+        Dictionary with 'admitted' (contacts to enrich, credits reserved),
+        'stored' (API dicts of already-enriched contacts), 'rejected'
+        (contacts over budget) and 'reserved_on' (ledger day of the
+        reservation, for release_credits)
+    """
+    enriched_rows = get_fresh_enriched_contacts(
+        db, (c.get('id') for c in contacts), max_age_days
+    )
+    enriched_ids = {row.apollo_id for row in enriched_rows}
+
+    to_enrich = [c for c in contacts if c.get('id') not in enriched_ids]
+    today = date.today()
+    granted = reserve_credits(db, len(to_enrich), daily_budget, monthly_budget, usage_date=today)
+
+    return {
+        'admitted': to_enrich[:granted],
+        'stored': export_contacts_to_dict(enriched_rows),
+        'rejected': to_enrich[granted:],
+        'reserved_on': today
+    }
@@ -2,6 +2,7 @@
 Database connection and session management for PostgreSQL/Supabase.
 """
 import os
+import threading
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import declarative_base, sessionmaker
@@ -70,10 +71,41 @@ else:
         'max_overflow': 20,
     })
 
-engine = create_engine(DATABASE_URL, **engine_kwargs)
+# The engine (and the psycopg2 driver behind it) is created on first use,
+# so importing the package stays cheap for code paths that never query
+_engine = None
+_session_factory = None
+_engine_lock = threading.Lock()
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine():
+    """
+    Get the shared SQLAlchemy engine, creating it on first call.
+
+    Returns:
+        SQLAlchemy Engine
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(DATABASE_URL, **engine_kwargs)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+
+def SessionLocal():
+    """Create a new Session bound to the shared engine."""
+    get_engine()
+    return _session_factory()
+
+
+def __getattr__(name):
+    # Keeps `from database.database import engine` working (lazily)
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db():
@@ -112,13 +144,24 @@ def get_db_session():
         db.close()
 
 
+# Idempotent column additions for databases created by older versions
+SCHEMA_UPGRADES = (
+    "ALTER TABLE searches ADD COLUMN IF NOT EXISTS incremental BOOLEAN DEFAULT FALSE",
+)
+
+
 def init_db():
     """
     Initialize database tables.
     Creates all tables defined in models.py
     """
     from .models import Base
+    engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    # create_all never alters existing tables; add columns introduced later
+    with engine.begin() as connection:
+        for statement in SCHEMA_UPGRADES:
+            connection.execute(text(statement))
     print("Database tables created successfully")
 
 
@@ -128,7 +171,7 @@ def drop_all_tables():
     WARNING: This will delete all data!
     """
     from .models import Base
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
     print("All tables dropped")
 
 
@@ -148,7 +191,7 @@ def test_connection():
     Returns True if connection successful, False otherwise.
     """
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             result = conn.execute(text("SELECT version()"))
             version = result.scalar()
 
@@ -1,21 +1,33 @@
 """
 Database operations for contacts, companies, searches, and emails.
 """
-from typing import List, Dict, Optional, Any
+import threading
+from typing import List, Dict, Optional, Any, Iterable, Set
 from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy import func, or_, any_, bindparam, case, null, Integer
 from .models import Company, Contact, Search, EmailHistory, EmailDraft
-from datetime import datetime
+from metrics import timed, DB_QUERY_SECONDS
+from datetime import datetime, timedelta
 
 
-def upsert_company(db: Session, company_data: Dict[str, Any]) -> Company:
+# In-process cache of addresses that have already been emailed.
+# Reads are plain set lookups; writers swap/extend under the lock.
+_emailed_addresses: Set[str] = set()
+_emailed_addresses_lock = threading.Lock()
+# Bumped whenever the cache changes, so response ETags can include it
+_emailed_addresses_version = 0
+
+
+@timed(DB_QUERY_SECONDS, operation='upsert_company')
+def upsert_company(db: Session, company_data: Dict[str, Any], commit: bool = True) -> Company:
     """
     Insert or update company record.
 
     Args:
         db: Database session
         company_data: Dictionary with company fields
+        commit: Commit immediately (False = leave it to the caller's transaction)
 
     Returns:
         Company object
@@ -36,11 +48,13 @@ def upsert_company(db: Session, company_data: Dict[str, Any]) -> Company:
         }
     ).returning(Company)
 
-    result = db.execute(stmt)
-    db.commit()
-    return result.scalar_one()
+    company = db.execute(stmt).scalar_one()
+    if commit:
+        db.commit()
+    return company
 
 
+@timed(DB_QUERY_SECONDS, operation='upsert_contact')
 def upsert_contact(db: Session, contact_data: Dict[str, Any], company_id: int) -> Contact:
     """
     Insert or update contact record (smart merge).
@@ -105,8 +119,105 @@ def upsert_contact(db: Session, contact_data: Dict[str, Any], company_id: int) -
     return result.scalar_one()
 
 
+@timed(DB_QUERY_SECONDS, operation='upsert_contacts')
+def upsert_contacts(db: Session, contacts: List[Dict[str, Any]], company_id: int,
+                    commit: bool = True) -> List[Any]:
+    """
+    Insert or update many contacts of one company (one statement per key).
+
+    Same smart-merge rules as upsert_contact (empty values never overwrite
+    stored data). Contacts with an Apollo ID are matched on it regardless
+    of the company they are stored under, and moved to `company_id`;
+    contacts without one are matched on unique_contact. Duplicates within
+    the batch are collapsed, last one wins.
+
+    Args:
+        db: Database session
+        contacts: Contact dictionaries from search results
+        company_id: ID of the company
+        commit: Commit immediately (False = leave it to the caller's transaction)
+
+    Returns:
+        RETURNING rows with the _CONTACT_COLUMNS contact fields (no company columns)
+    """
+    by_apollo_id: Dict[str, Dict[str, Any]] = {}
+    by_name: Dict[tuple, Dict[str, Any]] = {}
+    for contact_data in contacts:
+        email = contact_data.get('email') or None
+        phone = contact_data.get('phone') or None
+        row = {
+            'company_id': company_id,
+            'apollo_id': contact_data.get('id'),
+            'first_name': contact_data['first_name'],
+            'last_name': contact_data.get('last_name'),
+            'title': contact_data.get('title') or None,
+            'email': email,
+            'phone': phone,
+            'linkedin_url': contact_data.get('linkedin_url') or None,
+            'location': contact_data.get('location') or None,
+            'seniority': contact_data.get('seniority') or None,
+            # JSONB binds None as the JSON literal 'null', which COALESCE keeps
+            'departments': contact_data.get('departments') or null(),
+            'photo_url': contact_data.get('photo_url') or None,
+            'headline': contact_data.get('headline') or None,
+            'enriched': email is not None,
+            'enriched_at': datetime.now() if email else None,
+            'has_email': email is not None,
+            'has_phone': phone is not None
+        }
+        # ON CONFLICT cannot touch the same row twice in one statement
+        if row['apollo_id']:
+            by_apollo_id[row['apollo_id']] = row
+        else:
+            by_name[(row['first_name'], row['last_name'])] = row
+
+    returned = []
+    if by_apollo_id:
+        # apollo_id is unique across companies: a person stored under another
+        # company row (job change, pre-canonical 'www.' row) is updated and
+        # moved here instead of violating the index and failing the batch
+        returned.extend(db.execute(_contact_upsert(
+            list(by_apollo_id.values()), index_elements=[Contact.apollo_id], move_company=True
+        )).all())
+    if by_name:
+        returned.extend(db.execute(_contact_upsert(
+            list(by_name.values()), constraint='unique_contact'
+        )).all())
+
+    if commit:
+        db.commit()
+    return returned
+
+
+def _contact_upsert(rows: List[Dict[str, Any]], move_company: bool = False, **conflict) -> Any:
+    """Multi-row contact INSERT ... ON CONFLICT DO UPDATE with the smart-merge rules."""
+    stmt = insert(Contact).values(rows)
+    excluded = stmt.excluded
+    set_ = {
+        'title': func.coalesce(excluded.title, Contact.title),
+        'email': func.coalesce(excluded.email, Contact.email),
+        'enriched': Contact.enriched | excluded.email.isnot(None),
+        'enriched_at': case((excluded.email.isnot(None), func.now()), else_=Contact.enriched_at),
+        'has_email': Contact.has_email | excluded.email.isnot(None),
+        'phone': func.coalesce(excluded.phone, Contact.phone),
+        'has_phone': Contact.has_phone | excluded.phone.isnot(None),
+        'linkedin_url': func.coalesce(excluded.linkedin_url, Contact.linkedin_url),
+        'location': func.coalesce(excluded.location, Contact.location),
+        'seniority': func.coalesce(excluded.seniority, Contact.seniority),
+        'departments': func.coalesce(excluded.departments, Contact.departments),
+        'photo_url': func.coalesce(excluded.photo_url, Contact.photo_url),
+        'headline': func.coalesce(excluded.headline, Contact.headline),
+        'updated_at': func.now()
+    }
+    if move_company:
+        set_['company_id'] = excluded.company_id
+    return stmt.on_conflict_do_update(set_=set_, **conflict).returning(*_CONTACT_COLUMNS)
+
+
+@timed(DB_QUERY_SECONDS, operation='create_search')
 def create_search(db: Session, company_id: int, roles: List[str],
-                  limit: int, total_found: int) -> Search:
+                  limit: int, total_found: int, commit: bool = True,
+                  incremental: bool = False) -> Search:
     """
     Create a search record.
 
@@ -116,6 +227,8 @@ def create_search(db: Session, company_id: int, roles: List[str],
         roles: List of roles searched
         limit: Search limit
         total_found: Total contacts found
+        commit: Commit immediately (False = only add it to the caller's transaction)
+        incremental: Known people were skipped, so total_found only counts new ones
 
     Returns:
         Search object
@@ -124,19 +237,119 @@ def create_search(db: Session, company_id: int, roles: List[str],
         company_id=company_id,
         roles=roles,
         search_limit=limit,
-        total_found=total_found
+        total_found=total_found,
+        incremental=incremental
     )
     db.add(search)
-    db.commit()
-    db.refresh(search)
+    if commit:
+        db.commit()
+        db.refresh(search)
     return search
 
 
+@timed(DB_QUERY_SECONDS, operation='get_last_search')
+def get_last_search(db: Session, company_id: int, roles: List[str]) -> Optional[Search]:
+    """
+    Get the most recent search for a company with exactly the same roles.
+
+    Args:
+        db: Database session
+        company_id: Company ID
+        roles: List of roles (order does not matter)
+
+    Returns:
+        Search object, or None if this combination was never searched
+    """
+    return db.query(Search).filter(
+        Search.company_id == company_id,
+        Search.roles.contains(roles),
+        Search.roles.contained_by(roles)
+    ).order_by(Search.created_at.desc()).first()
+
+
+@timed(DB_QUERY_SECONDS, operation='get_role_yield_rows')
+def get_role_yield_rows(db: Session, limit: int = 1000) -> List[Any]:
+    """
+    Get (roles, total_found, search_limit) of the most recent full searches, oldest first.
+
+    Incremental searches are left out: their total_found only counts people
+    not stored before, so it says nothing about a role's yield.
+    """
+    rows = db.query(Search.roles, Search.total_found, Search.search_limit).filter(
+        Search.incremental.isnot(True)
+    ).order_by(
+        Search.created_at.desc()
+    ).limit(limit).all()
+    return rows[::-1]
+
+
+@timed(DB_QUERY_SECONDS, operation='get_known_apollo_ids')
+def get_known_apollo_ids(db: Session, company_id: int) -> Set[str]:
+    """Get the Apollo person IDs already stored for a company."""
+    rows = db.query(Contact.apollo_id).filter(
+        Contact.company_id == company_id,
+        Contact.apollo_id.isnot(None)
+    ).all()
+    return {row[0] for row in rows}
+
+
+@timed(DB_QUERY_SECONDS, operation='get_company_by_domain')
 def get_company_by_domain(db: Session, domain: str) -> Optional[Company]:
     """Get company by domain."""
     return db.query(Company).filter(Company.domain == domain).first()
 
 
+@timed(DB_QUERY_SECONDS, operation='get_company_directory_rows')
+def get_company_directory_rows(db: Session) -> List[Any]:
+    """Get (name, domain, organization_id) of every stored company."""
+    return db.query(Company.name, Company.domain, Company.organization_id).all()
+
+
+@timed(DB_QUERY_SECONDS, operation='get_or_create_companies')
+def get_or_create_companies(db: Session, companies: Dict[str, str],
+                            commit: bool = True) -> Dict[str, Company]:
+    """
+    Resolve many domains to Company rows, creating the missing ones.
+
+    One IN query for the existing companies and one multi-row insert for
+    the rest; existing companies are left untouched.
+
+    Args:
+        db: Database session
+        companies: Mapping of domain -> name to use if the company is created
+        commit: Commit immediately (False = leave it to the caller's transaction)
+
+    Returns:
+        Mapping of domain -> Company
+    """
+    if not companies:
+        return {}
+
+    found = {
+        company.domain: company
+        for company in db.query(Company).filter(Company.domain.in_(list(companies))).all()
+    }
+
+    missing = [{'domain': domain, 'name': name} for domain, name in companies.items() if domain not in found]
+    if missing:
+        stmt = insert(Company).values(missing).on_conflict_do_nothing(
+            index_elements=['domain']
+        ).returning(Company)
+        for company in db.execute(stmt).scalars():
+            found[company.domain] = company
+
+        # Rows inserted concurrently by another request since our SELECT
+        lost = [row['domain'] for row in missing if row['domain'] not in found]
+        if lost:
+            for company in db.query(Company).filter(Company.domain.in_(lost)).all():
+                found[company.domain] = company
+
+    if commit:
+        db.commit()
+    return found
+
+
+@timed(DB_QUERY_SECONDS, operation='get_contacts_by_company')
 def get_contacts_by_company(db: Session, company_id: int,
                            enriched_only: bool = False) -> List[Contact]:
     """Get all contacts for a company."""
@@ -146,6 +359,100 @@ def get_contacts_by_company(db: Session, company_id: int,
     return query.all()
 
 
+# Columns the API returns for a contact, selected directly (no ORM objects)
+_CONTACT_COLUMNS = (
+    Contact.id, Contact.apollo_id, Contact.first_name, Contact.last_name,
+    Contact.title, Contact.location, Contact.email, Contact.phone,
+    Contact.linkedin_url, Contact.seniority, Contact.departments,
+    Contact.photo_url, Contact.headline, Contact.enriched,
+    Contact.has_email, Contact.has_phone
+)
+_CONTACT_API_COLUMNS = _CONTACT_COLUMNS + (
+    Company.name.label('company_name'), Company.domain.label('company_domain')
+)
+
+
+@timed(DB_QUERY_SECONDS, operation='get_company_contact_rows')
+def get_company_contact_rows(db: Session, company_id: int,
+                             exclude_ids: Optional[Iterable[int]] = None) -> List[Any]:
+    """
+    Get a company's contacts as plain rows for API responses.
+
+    Selects only the served columns in one joined query, skipping ORM object
+    construction, identity-map bookkeeping and the lazy company load.
+
+    Args:
+        db: Database session
+        company_id: Company ID
+        exclude_ids: Contact IDs to leave out (e.g. rows the caller already has)
+
+    Returns:
+        List of Row tuples (attribute access by column name)
+    """
+    query = db.query(*_CONTACT_API_COLUMNS).outerjoin(
+        Company, Contact.company_id == Company.id
+    ).filter(Contact.company_id == company_id)
+
+    exclude = list(exclude_ids or ())
+    if exclude:
+        query = query.filter(~(Contact.id == any_(bindparam('exclude_ids', exclude, type_=ARRAY(Integer)))))
+    return query.all()
+
+
+@timed(DB_QUERY_SECONDS, operation='company_has_contacts')
+def company_has_contacts(db: Session, company_id: int) -> bool:
+    """Check (EXISTS) whether any contact is stored for a company."""
+    return db.query(
+        db.query(Contact.id).filter(Contact.company_id == company_id).exists()
+    ).scalar()
+
+
+@timed(DB_QUERY_SECONDS, operation='get_company_contacts_version')
+def get_company_contacts_version(db: Session, company_id: int) -> tuple:
+    """
+    Get a cheap change marker for a company's contact list.
+
+    Args:
+        db: Database session
+        company_id: Company ID
+
+    Returns:
+        Tuple of (contact count, latest contacts.updated_at or None)
+    """
+    count, last_updated = db.query(
+        func.count(Contact.id), func.max(Contact.updated_at)
+    ).filter(Contact.company_id == company_id).one()
+    return count, last_updated
+
+
+@timed(DB_QUERY_SECONDS, operation='get_fresh_enriched_contacts')
+def get_fresh_enriched_contacts(db: Session, apollo_ids: Iterable[str],
+                                max_age_days: Optional[int] = None) -> List[Contact]:
+    """
+    Get already-enriched contacts by Apollo ID in a single query.
+
+    Args:
+        db: Database session
+        apollo_ids: Apollo person IDs to look up
+        max_age_days: Treat enrichments older than this as stale (None/0 = never stale)
+
+    Returns:
+        List of enriched Contact objects that are still fresh
+    """
+    ids = {apollo_id for apollo_id in apollo_ids if apollo_id}
+    if not ids:
+        return []
+
+    query = db.query(Contact).filter(
+        Contact.apollo_id.in_(ids),
+        Contact.enriched == True
+    )
+    if max_age_days:
+        query = query.filter(Contact.enriched_at >= func.now() - timedelta(days=max_age_days))
+    return query.all()
+
+
+@timed(DB_QUERY_SECONDS, operation='get_unenriched_contacts')
 def get_unenriched_contacts(db: Session, company_id: int) -> List[Contact]:
     """Get contacts without emails."""
     return db.query(Contact).filter(
@@ -154,6 +461,7 @@ def get_unenriched_contacts(db: Session, company_id: int) -> List[Contact]:
     ).all()
 
 
+@timed(DB_QUERY_SECONDS, operation='search_contacts')
 def search_contacts(db: Session, query: str, limit: int = 50) -> List[Contact]:
     """
     Full-text search contacts by name or title.
@@ -175,19 +483,20 @@ def search_contacts(db: Session, query: str, limit: int = 50) -> List[Contact]:
     ).limit(limit).all()
 
 
+@timed(DB_QUERY_SECONDS, operation='create_email_history')
 def create_email_history(db: Session, email_data: Dict[str, Any]) -> EmailHistory:
     """
     Create email history record.
 
     Args:
         db: Database session
-        email_data: Email details
+        email_data: Email details (contact_id may be omitted when unknown)
 
     Returns:
         EmailHistory object
     """
     email_record = EmailHistory(
-        contact_id=email_data['contact_id'],
+        contact_id=email_data.get('contact_id'),
         draft_id=email_data.get('draft_id'),
         to_email=email_data['to_email'],
         subject=email_data['subject'],
@@ -201,9 +510,14 @@ def create_email_history(db: Session, email_data: Dict[str, Any]) -> EmailHistor
     db.add(email_record)
     db.commit()
     db.refresh(email_record)
+
+    if email_record.status == 'sent':
+        mark_address_emailed(email_record.to_email)
+
     return email_record
 
 
+@timed(DB_QUERY_SECONDS, operation='check_email_sent')
 def check_email_sent(db: Session, contact_id: int) -> bool:
     """Check if contact has been emailed."""
     return db.query(EmailHistory).filter(
@@ -212,6 +526,56 @@ def check_email_sent(db: Session, contact_id: int) -> bool:
     ).first() is not None
 
 
+@timed(DB_QUERY_SECONDS, operation='load_emailed_addresses')
+def load_emailed_addresses(db: Session) -> int:
+    """
+    (Re)load the in-process cache of emailed addresses from email_history.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of cached addresses
+    """
+    rows = db.query(EmailHistory.to_email).filter(
+        EmailHistory.status == 'sent'
+    ).distinct().all()
+
+    addresses = {row[0].strip().lower() for row in rows if row[0]}
+
+    global _emailed_addresses, _emailed_addresses_version
+    with _emailed_addresses_lock:
+        _emailed_addresses = addresses
+        _emailed_addresses_version += 1
+
+    return len(addresses)
+
+
+def mark_address_emailed(email: Optional[str]) -> None:
+    """Record an address in the emailed-address cache."""
+    global _emailed_addresses_version
+    if not email:
+        return
+    address = email.strip().lower()
+    with _emailed_addresses_lock:
+        if address not in _emailed_addresses:
+            _emailed_addresses.add(address)
+            _emailed_addresses_version += 1
+
+
+def emailed_addresses_version() -> int:
+    """Current generation of the emailed-address cache."""
+    return _emailed_addresses_version
+
+
+def is_address_emailed(email: Optional[str]) -> bool:
+    """Check the in-process cache for an already-emailed address."""
+    if not email:
+        return False
+    return email.strip().lower() in _emailed_addresses
+
+
+@timed(DB_QUERY_SECONDS, operation='get_company_stats')
 def get_company_stats(db: Session, company_id: int) -> Dict[str, Any]:
     """
     Get statistics for a company.
@@ -239,6 +603,7 @@ def get_company_stats(db: Session, company_id: int) -> Dict[str, Any]:
     }
 
 
+@timed(DB_QUERY_SECONDS, operation='get_all_companies')
 def get_all_companies(db: Session) -> List[Company]:
     """Get all companies."""
     return db.query(Company).order_by(Company.name).all()
@@ -272,5 +637,49 @@ def export_contacts_to_dict(contacts: List[Contact]) -> List[Dict[str, Any]]:
         'headline': c.headline,
         'enriched': c.enriched,
         'has_email': c.has_email,
-        'has_phone': c.has_phone
+        'has_phone': c.has_phone,
+        'emailed': is_address_emailed(c.email)
     } for c in contacts]
+
+
+def _contact_row_dict(r: Any, company_name: Optional[str], company_domain: Optional[str]) -> Dict[str, Any]:
+    return {
+        'id': r.apollo_id or r.id,
+        'name': f"{r.first_name} {r.last_name}" if r.last_name else r.first_name,
+        'first_name': r.first_name,
+        'last_name': r.last_name,
+        'title': r.title,
+        'company': company_name,
+        'company_domain': company_domain,
+        'location': r.location,
+        'email': r.email,
+        'phone': r.phone,
+        'linkedin_url': r.linkedin_url,
+        'seniority': r.seniority,
+        'departments': r.departments,
+        'photo_url': r.photo_url,
+        'headline': r.headline,
+        'enriched': r.enriched,
+        'has_email': r.has_email,
+        'has_phone': r.has_phone,
+        'emailed': is_address_emailed(r.email)
+    }
+
+
+def contact_rows_to_dicts(rows: Iterable[Any], company: Optional[Company] = None) -> List[Dict[str, Any]]:
+    """
+    Convert rows from get_company_contact_rows / upsert_contacts to API dictionaries.
+
+    Produces the same keys as export_contacts_to_dict.
+
+    Args:
+        rows: Row tuples with the contact columns (plus company_name and
+            company_domain unless `company` is given)
+        company: Company all rows belong to (for upsert_contacts RETURNING rows)
+
+    Returns:
+        List of contact dictionaries
+    """
+    if company is not None:
+        return [_contact_row_dict(r, company.name, company.domain) for r in rows]
+    return [_contact_row_dict(r, r.company_name, r.company_domain) for r in rows]
@@ -0,0 +1,236 @@
+"""
+Merge companies whose domains canonicalize to the same registrable domain.
+
+Before domains were canonicalized, 'www.stripe.com', 'careers.stripe.com'
+and 'stripe.com' could each get their own companies row. This one-time job
+groups companies by canonical domain, keeps one row per group (the one
+already stored under the canonical domain, else the oldest), moves contacts
+and searches onto it and deletes the others. Each group is merged in its
+own transaction.
+
+Contacts with an apollo_id move without conflicts: apollo_id is unique
+across all companies. Contacts without one can collide on unique_contact
+(NULLS NOT DISTINCT over apollo_id, first_name, last_name, company_id), so
+same-name rows are first collapsed into one survivor per name (the keeper's
+row if it has one); emails, drafts and tags of the removed rows are moved
+to the survivor.
+
+Usage:
+    python -m database.merge_duplicate_companies [--dry-run]
+    OR from project root: python database/merge_duplicate_companies.py
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from database.database import get_db_session, test_connection
+from apollo.domains import canonical_domain, is_public_suffix, PublicSuffixList
+
+
+# Contacts without apollo_id that would collide once moved -> their survivor
+NAMELESS_DUPLICATES_SQL = text("""
+SELECT id, survivor FROM (
+    SELECT id, first_value(id) OVER (
+        PARTITION BY first_name, last_name
+        ORDER BY (company_id = :keeper) DESC, id
+    ) AS survivor
+    FROM contacts
+    WHERE apollo_id IS NULL AND (company_id = :keeper OR company_id = ANY(:duplicates))
+) ranked
+WHERE id <> survivor
+""")
+
+_SURVIVORS = "SELECT unnest(CAST(:ids AS integer[])) AS id, unnest(CAST(:survivors AS integer[])) AS survivor"
+
+FILL_SURVIVORS_SQL = text(f"""
+UPDATE contacts s SET
+    email = COALESCE(s.email, d.email),
+    phone = COALESCE(s.phone, d.phone),
+    linkedin_url = COALESCE(s.linkedin_url, d.linkedin_url),
+    has_email = s.has_email OR d.email IS NOT NULL,
+    has_phone = s.has_phone OR d.phone IS NOT NULL
+FROM (
+    SELECT m.survivor,
+        (array_agg(c.email ORDER BY c.id) FILTER (WHERE c.email IS NOT NULL))[1] AS email,
+        (array_agg(c.phone ORDER BY c.id) FILTER (WHERE c.phone IS NOT NULL))[1] AS phone,
+        (array_agg(c.linkedin_url ORDER BY c.id) FILTER (WHERE c.linkedin_url IS NOT NULL))[1] AS linkedin_url
+    FROM ({_SURVIVORS}) m JOIN contacts c ON c.id = m.id
+    GROUP BY m.survivor
+) d
+WHERE s.id = d.survivor
+""")
+REPOINT_HISTORY_SQL = text(f"""
+UPDATE email_history h SET contact_id = m.survivor FROM ({_SURVIVORS}) m WHERE h.contact_id = m.id
+""")
+REPOINT_DRAFTS_SQL = text(f"""
+UPDATE email_drafts d SET contact_id = m.survivor FROM ({_SURVIVORS}) m WHERE d.contact_id = m.id
+""")
+REPOINT_TAGS_SQL = text(f"""
+INSERT INTO contact_tags (contact_id, tag_id)
+SELECT m.survivor, t.tag_id FROM ({_SURVIVORS}) m JOIN contact_tags t ON t.contact_id = m.id
+ON CONFLICT DO NOTHING
+""")
+DELETE_CONTACTS_SQL = text("DELETE FROM contacts WHERE id = ANY(:ids)")
+
+MOVE_CONTACTS_SQL = text("UPDATE contacts SET company_id = :keeper WHERE company_id = ANY(:duplicates)")
+MOVE_SEARCHES_SQL = text("UPDATE searches SET company_id = :keeper WHERE company_id = ANY(:duplicates)")
+
+# Keep the keeper's fields, filling gaps from the duplicates (oldest first)
+FILL_COMPANY_SQL = text("""
+UPDATE companies k SET
+    organization_id = COALESCE(k.organization_id, d.organization_id),
+    industry = COALESCE(k.industry, d.industry),
+    website = COALESCE(k.website, d.website),
+    employee_count = COALESCE(k.employee_count, d.employee_count)
+FROM (
+    SELECT
+        (array_agg(organization_id ORDER BY id) FILTER (WHERE organization_id IS NOT NULL))[1] AS organization_id,
+        (array_agg(industry ORDER BY id) FILTER (WHERE industry IS NOT NULL))[1] AS industry,
+        (array_agg(website ORDER BY id) FILTER (WHERE website IS NOT NULL))[1] AS website,
+        (array_agg(employee_count ORDER BY id) FILTER (WHERE employee_count IS NOT NULL))[1] AS employee_count
+    FROM companies
+    WHERE id = ANY(:duplicates)
+) d
+WHERE k.id = :keeper
+""")
+
+DELETE_COMPANIES_SQL = text("DELETE FROM companies WHERE id = ANY(:duplicates)")
+SET_DOMAIN_SQL = text("UPDATE companies SET domain = :domain WHERE id = :keeper")
+
+
+def find_duplicate_groups(rows: List[tuple]) -> Dict[str, List[tuple]]:
+    """
+    Group (id, domain, name) company rows by canonical domain.
+
+    Args:
+        rows: Company rows
+
+    Returns:
+        Mapping of canonical domain -> rows, keeper first; only groups that
+        need work (more than one row, or a single non-canonical domain).
+        Groups keyed by a public suffix (e.g. 'com.do') are never returned:
+        their rows are unrelated companies
+    """
+    groups: Dict[str, List[tuple]] = {}
+    for row in rows:
+        domain = canonical_domain(row[1]) or row[1]
+        if is_public_suffix(domain):
+            continue
+        groups.setdefault(domain, []).append(row)
+
+    result = {}
+    for domain, group in groups.items():
+        if len(group) == 1 and group[0][1] == domain:
+            continue
+        group.sort(key=lambda r: (r[1] != domain, r[0]))
+        result[domain] = group
+    return result
+
+
+def collapse_nameless_duplicates(db, params: Dict) -> int:
+    """
+    Remove same-name contacts without apollo_id that would collide when moved.
+
+    Args:
+        db: Session inside the group's transaction
+        params: {'keeper': id, 'duplicates': [ids]}
+
+    Returns:
+        Number of contacts removed
+    """
+    pairs = db.execute(NAMELESS_DUPLICATES_SQL, params).fetchall()
+    if not pairs:
+        return 0
+
+    mapping = {'ids': [p[0] for p in pairs], 'survivors': [p[1] for p in pairs]}
+    db.execute(FILL_SURVIVORS_SQL, mapping)
+    db.execute(REPOINT_HISTORY_SQL, mapping)
+    db.execute(REPOINT_DRAFTS_SQL, mapping)
+    db.execute(REPOINT_TAGS_SQL, mapping)
+    db.execute(DELETE_CONTACTS_SQL, mapping)
+    return len(pairs)
+
+
+def merge_duplicate_companies(dry_run: bool = False) -> None:
+    """
+    Merge duplicate companies into one row per canonical domain.
+
+    Args:
+        dry_run: Only report what would be merged
+    """
+    if PublicSuffixList is None:
+        # Without the full list, suffixes are unknown and nothing can be grouped safely
+        print("[ERROR] The publicsuffixlist package is required: pip install publicsuffixlist")
+        return
+
+    if not test_connection():
+        print("[ERROR] Database connection failed!")
+        print("Please check your DATABASE_URL in .env file")
+        return
+
+    with get_db_session() as db:
+        rows = db.execute(text("SELECT id, domain, name FROM companies ORDER BY id")).fetchall()
+    groups = find_duplicate_groups([tuple(r) for r in rows])
+
+    print(f"\nFound {len(groups)} domains to canonicalize ({len(rows)} companies)")
+    print("=" * 60)
+
+    merged_companies = 0
+    errors = 0
+    for domain, group in groups.items():
+        keeper = group[0]
+        duplicates = [r[0] for r in group[1:]]
+        others = ', '.join(r[1] for r in group[1:]) or '-'
+        print(f"  {domain}: keep #{keeper[0]} ({keeper[1]}), merge: {others}")
+        if dry_run:
+            continue
+
+        try:
+            with get_db_session() as db:
+                params = {'keeper': keeper[0], 'duplicates': duplicates}
+                if duplicates:
+                    collapsed = collapse_nameless_duplicates(db, params)
+                    moved = db.execute(MOVE_CONTACTS_SQL, params).rowcount
+                    db.execute(MOVE_SEARCHES_SQL, params)
+                    db.execute(FILL_COMPANY_SQL, params)
+                    db.execute(DELETE_COMPANIES_SQL, params)
+                else:
+                    collapsed = moved = 0
+                # Duplicates are gone, so the canonical domain is free
+                db.execute(SET_DOMAIN_SQL, {'keeper': keeper[0], 'domain': domain})
+        except Exception as e:
+            print(f"[ERROR] {domain}: {e}")
+            errors += 1
+            continue
+
+        merged_companies += len(duplicates)
+        print(f"[OK] {domain}: merged {len(duplicates)} companies, moved {moved} contacts"
+              + (f", collapsed {collapsed} same-name contacts without apollo_id" if collapsed else ''))
+
+    print("\n" + "=" * 60)
+    if dry_run:
+        print("[DRY RUN] No changes written")
+    else:
+        print(f"[OK] Companies merged: {merged_companies}")
+        if errors > 0:
+            print(f"[ERROR] Errors:          {errors}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("MERGE DUPLICATE COMPANIES")
+    print("=" * 60)
+
+    parser = argparse.ArgumentParser(description='Merge companies that share a canonical domain')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would be merged')
+    args = parser.parse_args()
+
+    merge_duplicate_companies(dry_run=args.dry_run)
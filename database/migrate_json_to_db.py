@@ -1,29 +1,281 @@
 """
 Migrate existing JSON contact files to PostgreSQL database.
 
+Files are parsed in parallel by a process pool, streamed into a temporary
+staging table with COPY, and merged into companies/contacts with one
+set-based INSERT ... ON CONFLICT per file. Each file is committed on its
+own; the checkpoint is written every CHECKPOINT_EVERY files and on exit, so
+an interrupted run resumes where it left off (re-merging at most a few
+files, which is harmless since the merge is idempotent).
+
 Usage:
-    python -m database.migrate_json_to_db
+    python -m database.migrate_json_to_db [json_dir] [--workers N] [--restart]
     OR from project root: python database/migrate_json_to_db.py
 """
+import argparse
+import io
 import json
 import os
 import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database.database import get_db_session, init_db, test_connection
-from database.db_operations import upsert_company, upsert_contact
+from database.database import get_db_session, init_db, test_connection, get_engine
 from config import load_config
+from apollo.domains import canonical_domain
+
+
+CHECKPOINT_FILENAME = '.migration_checkpoint.json'
+
+# Files merged between checkpoint writes (the checkpoint is rewritten in full)
+CHECKPOINT_EVERY = 50
+
+# Parsed files buffered ahead of the DB merge, per parser process
+PARSE_AHEAD_PER_WORKER = 2
+
+# Column order shared by parse_json_file rows, the staging table and COPY
+STAGING_COLUMNS = [
+    'company_domain', 'company_name', 'apollo_id', 'first_name', 'last_name',
+    'title', 'email', 'phone', 'linkedin_url', 'location', 'seniority',
+    'departments', 'photo_url', 'headline'
+]
+
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS staging_contacts (
+    company_domain TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    apollo_id TEXT,
+    first_name TEXT NOT NULL,
+    last_name TEXT,
+    title TEXT,
+    email TEXT,
+    phone TEXT,
+    linkedin_url TEXT,
+    location TEXT,
+    seniority TEXT,
+    departments JSONB,
+    photo_url TEXT,
+    headline TEXT
+) ON COMMIT DELETE ROWS
+"""
+
+MERGE_COMPANIES_SQL = """
+INSERT INTO companies (domain, name)
+SELECT DISTINCT ON (company_domain) company_domain, company_name
+FROM staging_contacts
+ORDER BY company_domain
+ON CONFLICT (domain) DO UPDATE SET
+    name = EXCLUDED.name,
+    updated_at = now()
+"""
+
+# apollo_id is unique on its own: a person already stored under another
+# company or name (job change, pre-canonical 'www.' company row) cannot be
+# merged through unique_contact, so those staging rows are left out
+CONFLICTING_CONTACT_SQL = """EXISTS (
+    SELECT 1 FROM contacts c
+    WHERE c.apollo_id = s.apollo_id
+      AND (c.company_id, c.first_name, c.last_name) IS DISTINCT FROM (co.id, s.first_name, s.last_name)
+)"""
+
+SKIPPED_CONTACTS_SQL = f"""
+SELECT DISTINCT s.apollo_id
+FROM staging_contacts s
+JOIN companies co ON co.domain = s.company_domain
+WHERE {CONFLICTING_CONTACT_SQL}
+ORDER BY s.apollo_id
+"""
+
+# Mirrors upsert_contact(): fields are only overwritten when the file has a value.
+# One row per apollo_id (rows without one are keyed by name), since two rows
+# sharing an apollo_id under different names would violate its unique index
+MERGE_CONTACTS_SQL = f"""
+INSERT INTO contacts (
+    company_id, apollo_id, first_name, last_name, title, email, phone,
+    linkedin_url, location, seniority, departments, photo_url, headline,
+    enriched, enriched_at, has_email, has_phone
+)
+SELECT DISTINCT ON (
+    s.apollo_id,
+    CASE WHEN s.apollo_id IS NULL THEN s.first_name END,
+    CASE WHEN s.apollo_id IS NULL THEN s.last_name END,
+    co.id
+)
+    co.id, s.apollo_id, s.first_name, s.last_name, s.title, s.email, s.phone,
+    s.linkedin_url, s.location, s.seniority, s.departments, s.photo_url, s.headline,
+    s.email IS NOT NULL,
+    CASE WHEN s.email IS NOT NULL THEN now() END,
+    s.email IS NOT NULL,
+    s.phone IS NOT NULL
+FROM staging_contacts s
+JOIN companies co ON co.domain = s.company_domain
+WHERE NOT {CONFLICTING_CONTACT_SQL}
+ORDER BY
+    s.apollo_id,
+    CASE WHEN s.apollo_id IS NULL THEN s.first_name END,
+    CASE WHEN s.apollo_id IS NULL THEN s.last_name END,
+    co.id,
+    (s.email IS NULL)
+ON CONFLICT ON CONSTRAINT unique_contact DO UPDATE SET
+    title = COALESCE(NULLIF(EXCLUDED.title, ''), contacts.title),
+    email = COALESCE(EXCLUDED.email, contacts.email),
+    enriched = contacts.enriched OR EXCLUDED.email IS NOT NULL,
+    enriched_at = CASE WHEN EXCLUDED.email IS NOT NULL THEN now() ELSE contacts.enriched_at END,
+    has_email = contacts.has_email OR EXCLUDED.email IS NOT NULL,
+    phone = COALESCE(EXCLUDED.phone, contacts.phone),
+    has_phone = contacts.has_phone OR EXCLUDED.phone IS NOT NULL,
+    linkedin_url = COALESCE(NULLIF(EXCLUDED.linkedin_url, ''), contacts.linkedin_url),
+    location = COALESCE(NULLIF(EXCLUDED.location, ''), contacts.location),
+    seniority = COALESCE(NULLIF(EXCLUDED.seniority, ''), contacts.seniority),
+    departments = COALESCE(NULLIF(EXCLUDED.departments, '[]'::jsonb), contacts.departments),
+    photo_url = COALESCE(NULLIF(EXCLUDED.photo_url, ''), contacts.photo_url),
+    headline = COALESCE(NULLIF(EXCLUDED.headline, ''), contacts.headline),
+    updated_at = now()
+"""
+
+
+def parse_json_file(json_file):
+    """
+    Parse one exported JSON file into staging rows.
+
+    Runs inside a worker process, so it only touches the filesystem.
+
+    Args:
+        json_file: Path to the JSON file
+
+    Returns:
+        Tuple of (file name, company domain, list of row tuples, error message)
+    """
+    json_file = Path(json_file)
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        return json_file.name, None, [], f"Error reading file: {e}"
+
+    # Extract metadata
+    metadata = data.get('metadata', {})
+    contacts_data = data.get('contacts', [])
+
+    if not contacts_data:
+        return json_file.name, None, [], "No contacts in file"
+
+    # Get company info from metadata or first contact
+    company_name = metadata.get('company')
+    company_domain = metadata.get('company_domain')
+
+    if not company_domain:
+        # Try to get from first contact
+        company_domain = contacts_data[0].get('company_domain')
+        company_name = contacts_data[0].get('company') or company_name
+
+    # Old exports may hold 'www.' hosts or subdomains; store the registrable domain
+    company_domain = canonical_domain(company_domain)
+    if not company_domain:
+        return json_file.name, None, [], "No company domain found"
+
+    company_name = company_name or company_domain.split('.')[0].title()
+
+    rows = []
+    for contact_data in contacts_data:
+        departments = contact_data.get('departments')
+        rows.append((
+            company_domain,
+            company_name,
+            contact_data.get('id') or contact_data.get('apollo_id'),
+            contact_data.get('first_name') or '',
+            contact_data.get('last_name'),
+            contact_data.get('title'),
+            contact_data.get('email') or None,
+            contact_data.get('phone') or None,
+            contact_data.get('linkedin_url'),
+            contact_data.get('location'),
+            contact_data.get('seniority'),
+            json.dumps(departments) if departments is not None else None,
+            contact_data.get('photo_url'),
+            contact_data.get('headline')
+        ))
+
+    return json_file.name, company_domain, rows, None
+
+
+def _copy_value(value):
+    """Encode a value for COPY ... FROM STDIN text format."""
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def load_rows(cursor, rows):
+    """
+    COPY rows into the staging table and merge them into companies/contacts.
 
+    Args:
+        cursor: psycopg2 cursor inside an open transaction
+        rows: Row tuples in STAGING_COLUMNS order
 
-def migrate_json_files(json_dir='outputs'):
+    Returns:
+        Tuple of (contact rows inserted or updated, apollo_ids skipped because
+        the person is already stored under another company or name)
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(v) for v in row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    cursor.copy_expert(
+        f"COPY staging_contacts ({', '.join(STAGING_COLUMNS)}) FROM STDIN",
+        buffer
+    )
+    cursor.execute(MERGE_COMPANIES_SQL)
+    cursor.execute(SKIPPED_CONTACTS_SQL)
+    skipped = [row[0] for row in cursor.fetchall()]
+    cursor.execute(MERGE_CONTACTS_SQL)
+    return cursor.rowcount, skipped
+
+
+def load_checkpoint(json_dir):
+    """Return {file name: mtime} for files already migrated from json_dir."""
+    checkpoint_path = Path(json_dir) / CHECKPOINT_FILENAME
+    if not checkpoint_path.exists():
+        return {}
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"[WARN] Ignoring unreadable checkpoint {checkpoint_path}")
+        return {}
+
+
+def save_checkpoint(json_dir, done):
+    """Atomically write the checkpoint of migrated files."""
+    checkpoint_path = Path(json_dir) / CHECKPOINT_FILENAME
+    tmp_path = checkpoint_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(done, f, indent=2)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def migrate_json_files(json_dir='outputs', workers=None, restart=False):
     """
     Import all JSON files from outputs directory into database.
 
     Args:
         json_dir: Directory containing JSON files
+        workers: Number of parser processes (default: CPU count)
+        restart: Ignore the checkpoint and migrate every file again
     """
     config = load_config()
 
@@ -43,97 +295,109 @@ def migrate_json_files(json_dir='outputs'):
         print(f"[ERROR] Directory {json_dir} does not exist")
         return
 
-    json_files = list(json_path.glob('*.json'))
+    json_files = sorted(json_path.glob('*.json'))
     if not json_files:
         print(f"No JSON files found in {json_dir}/")
         return
 
-    print(f"\nFound {len(json_files)} JSON files")
+    done = {} if restart else load_checkpoint(json_dir)
+    pending = [
+        f for f in json_files
+        if done.get(f.name) != f.stat().st_mtime
+    ]
+
+    print(f"\nFound {len(json_files)} JSON files ({len(json_files) - len(pending)} already migrated)")
     print("=" * 60)
 
-    total_companies = 0
+    if not pending:
+        print("Nothing to do.")
+        return
+
+    total_companies = set()
     total_contacts = 0
+    total_skipped = 0
+    total_conflicts = 0
     total_errors = 0
-
-    with get_db_session() as db:
-        for json_file in json_files:
-            try:
-                print(f"\n[FILE] Processing: {json_file.name}")
-
-                # Load JSON file
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                # Extract metadata
-                metadata = data.get('metadata', {})
-                contacts_data = data.get('contacts', [])
-
-                if not contacts_data:
-                    print(f"  [WARN] No contacts in file, skipping")
+    unsaved = 0
+    started = time.perf_counter()
+
+    connection = get_engine().raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(CREATE_STAGING_SQL)
+        connection.commit()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Only a bounded window of files is parsed ahead of the merge, so a
+            # slow database never has the whole archive's rows in memory
+            window = max(1, (workers or os.cpu_count() or 1) * PARSE_AHEAD_PER_WORKER)
+            files = iter(pending)
+            in_flight = deque()
+            for json_file in files:
+                in_flight.append((json_file, executor.submit(parse_json_file, json_file)))
+                if len(in_flight) >= window:
+                    break
+
+            while in_flight:
+                json_file, future = in_flight.popleft()
+                next_file = next(files, None)
+                if next_file is not None:
+                    in_flight.append((next_file, executor.submit(parse_json_file, next_file)))
+
+                file_name, company_domain, rows, error = future.result()
+                if error:
+                    print(f"[WARN] {file_name}: {error}, skipping")
+                    total_skipped += 1
                     continue
 
-                # Get company info from metadata or first contact
-                company_name = metadata.get('company')
-                company_domain = metadata.get('company_domain')
-
-                if not company_domain and contacts_data:
-                    # Try to get from first contact
-                    company_domain = contacts_data[0].get('company_domain')
-                    company_name = contacts_data[0].get('company') or company_name
-
-                if not company_domain:
-                    print(f"  [WARN] No company domain found, skipping")
+                file_started = time.perf_counter()
+                try:
+                    merged, conflicts = load_rows(cursor, rows)
+                    connection.commit()
+                except Exception as e:
+                    connection.rollback()
+                    print(f"[ERROR] {file_name}: {e}")
+                    total_errors += 1
                     continue
 
-                # Upsert company
-                company = upsert_company(db, {
-                    'domain': company_domain,
-                    'name': company_name or company_domain.split('.')[0].title()
-                })
-                total_companies += 1
-
-                print(f"  [OK] Company: {company.name} ({company.domain})")
-
-                # Upsert contacts
-                contact_count = 0
-                for contact_data in contacts_data:
-                    try:
-                        # Map JSON fields to database fields
-                        db_contact = {
-                            'id': contact_data.get('id') or contact_data.get('apollo_id'),
-                            'first_name': contact_data.get('first_name', ''),
-                            'last_name': contact_data.get('last_name'),
-                            'title': contact_data.get('title'),
-                            'email': contact_data.get('email'),
-                            'phone': contact_data.get('phone'),
-                            'linkedin_url': contact_data.get('linkedin_url'),
-                            'location': contact_data.get('location'),
-                            'seniority': contact_data.get('seniority'),
-                            'departments': contact_data.get('departments'),
-                            'photo_url': contact_data.get('photo_url'),
-                            'headline': contact_data.get('headline')
-                        }
-
-                        upsert_contact(db, db_contact, company.id)
-                        contact_count += 1
-                        total_contacts += 1
-
-                    except Exception as e:
-                        print(f"    [ERROR] Error importing contact: {e}")
-                        total_errors += 1
-
-                print(f"  [OK] Imported {contact_count} contacts")
-
-            except Exception as e:
-                print(f"  [ERROR] Error processing file: {e}")
-                total_errors += 1
+                done[file_name] = json_file.stat().st_mtime
+                unsaved += 1
+                if unsaved >= CHECKPOINT_EVERY:
+                    save_checkpoint(json_dir, done)
+                    unsaved = 0
+
+                total_companies.add(company_domain)
+                total_contacts += merged
+                total_conflicts += len(conflicts)
+                if conflicts:
+                    shown = ', '.join(conflicts[:5]) + (', ...' if len(conflicts) > 5 else '')
+                    print(f"[WARN] {file_name}: skipped {len(conflicts)} contacts stored under "
+                          f"another company or name: {shown}")
+
+                elapsed = time.perf_counter() - file_started
+                overall = time.perf_counter() - started
+                print(
+                    f"[OK] {file_name}: {merged} contacts ({company_domain}) "
+                    f"in {elapsed:.2f}s | {total_contacts / overall:,.0f} rows/s overall"
+                )
+    finally:
+        connection.close()
+        if unsaved:
+            save_checkpoint(json_dir, done)
+
+    elapsed = time.perf_counter() - started
 
     # Summary
     print("\n" + "=" * 60)
     print("MIGRATION SUMMARY")
     print("=" * 60)
-    print(f"[OK] Companies imported: {total_companies}")
+    print(f"[OK] Companies imported: {len(total_companies)}")
     print(f"[OK] Contacts imported:  {total_contacts}")
+    print(f"[OK] Throughput:         {total_contacts / elapsed:,.0f} rows/s ({elapsed:.1f}s)")
+    if total_skipped > 0:
+        print(f"[WARN] Files skipped:     {total_skipped}")
+    if total_conflicts > 0:
+        print(f"[WARN] Contacts skipped:  {total_conflicts} (already stored under another company or name)")
     if total_errors > 0:
         print(f"[ERROR] Errors:             {total_errors}")
     print("=" * 60)
@@ -174,8 +438,14 @@ if __name__ == "__main__":
     print("JSON TO POSTGRESQL MIGRATION")
     print("=" * 60)
 
+    parser = argparse.ArgumentParser(description='Migrate JSON exports into PostgreSQL')
+    parser.add_argument('json_dir', nargs='?', default='outputs', help='Directory containing JSON files')
+    parser.add_argument('--workers', type=int, help='Number of parser processes (default: CPU count)')
+    parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and migrate every file again')
+    args = parser.parse_args()
+
     # Run migration
-    migrate_json_files()
+    migrate_json_files(args.json_dir, workers=args.workers, restart=args.restart)
 
     # Verify
     print()
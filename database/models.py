@@ -2,7 +2,7 @@
 SQLAlchemy ORM models for Apollo Cold Emailer.
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, DateTime, ForeignKey,
+    Column, Integer, String, Text, Boolean, Date, DateTime, ForeignKey,
     JSON, func, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
@@ -102,6 +102,7 @@ class Search(Base):
     # Search Parameters
     roles = Column(JSONB, nullable=False)  # ["recruiter", "engineering_manager"]
     search_limit = Column(Integer)
+    incremental = Column(Boolean, default=False, server_default='false')  # total_found counts only new people
 
     # Results
     total_found = Column(Integer, default=0)
@@ -187,6 +188,11 @@ class EmailHistory(Base):
     contact = relationship("Contact", back_populates="email_history")
     draft = relationship("EmailDraft", back_populates="email_sent")
 
+    # Constraints
+    __table_args__ = (
+        Index('idx_email_history_contact_status', 'contact_id', 'status'),
+    )
+
     def __repr__(self):
         return f"<EmailHistory(to='{self.to_email}', status='{self.status}', sent_at='{self.sent_at}')>"
 
@@ -219,3 +225,16 @@ class ContactTag(Base):
 
     def __repr__(self):
         return f"<ContactTag(contact_id={self.contact_id}, tag_id={self.tag_id})>"
+
+
+class CreditUsage(Base):
+    """Apollo credit ledger: credits reserved/spent per day."""
+    __tablename__ = 'credit_usage'
+
+    usage_date = Column(Date, primary_key=True)
+    credits_used = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CreditUsage(date='{self.usage_date}', credits_used={self.credits_used})>"
@@ -86,6 +86,7 @@ CREATE TABLE IF NOT EXISTS searches (
     -- Search Parameters
     roles JSONB NOT NULL,
     search_limit INTEGER,
+    incremental BOOLEAN DEFAULT FALSE,  -- total_found counts only new people
 
     -- Results
     total_found INTEGER DEFAULT 0,
@@ -96,6 +97,9 @@ CREATE TABLE IF NOT EXISTS searches (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Databases created before the incremental column existed
+ALTER TABLE searches ADD COLUMN IF NOT EXISTS incremental BOOLEAN DEFAULT FALSE;
+
 CREATE INDEX IF NOT EXISTS idx_searches_company_id ON searches(company_id);
 CREATE INDEX IF NOT EXISTS idx_searches_created_at ON searches(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_searches_roles ON searches USING GIN(roles);
@@ -166,6 +170,8 @@ CREATE INDEX IF NOT EXISTS idx_email_history_contact_id ON email_history(contact
 CREATE INDEX IF NOT EXISTS idx_email_history_status ON email_history(status);
 CREATE INDEX IF NOT EXISTS idx_email_history_sent_at ON email_history(sent_at DESC);
 CREATE INDEX IF NOT EXISTS idx_email_history_to_email ON email_history(to_email);
+-- Covering index for batch "already emailed?" lookups (index-only scans)
+CREATE INDEX IF NOT EXISTS idx_email_history_contact_status ON email_history(contact_id, status);
 
 -- ============================================================================
 -- TAGS TABLE
@@ -190,6 +196,15 @@ CREATE TABLE IF NOT EXISTS contact_tags (
 CREATE INDEX IF NOT EXISTS idx_contact_tags_contact_id ON contact_tags(contact_id);
 CREATE INDEX IF NOT EXISTS idx_contact_tags_tag_id ON contact_tags(tag_id);
 
+-- ============================================================================
+-- CREDIT_USAGE TABLE (Apollo credit ledger, one row per day)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS credit_usage (
+    usage_date DATE PRIMARY KEY,
+    credits_used INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================================================
 -- TRIGGERS FOR UPDATED_AT
 -- ============================================================================
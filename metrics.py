@@ -0,0 +1,242 @@
+"""
+Lightweight Prometheus-compatible metrics.
+
+Every thread records into its own shard, so the hot path is a dict update
+with no shared lock; shards are only summed when /metrics is scraped. When
+a thread exits its shard is folded into a retired total, so short-lived
+worker threads do not accumulate shards.
+"""
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: List['_Metric'] = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class _ShardHolder:
+    """Thread-local owner of a shard; freed (and finalized) when its thread exits."""
+
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self):
+        self.shard = {}
+
+
+class _Metric:
+    """Base class: per-thread shards of {label values: value}."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict] = []
+        self._retired: Dict = {}
+        self._shards_lock = threading.Lock()
+
+        with _registry_lock:
+            _registry.append(self)
+
+    def _shard(self) -> Dict:
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            # Taken once per thread, never on the per-request path
+            holder = self._local.holder = _ShardHolder()
+            with self._shards_lock:
+                self._shards.append(holder.shard)
+            finalizer = weakref.finalize(holder, self._retire, holder.shard)
+            finalizer.atexit = False
+        return holder.shard
+
+    def _retire(self, shard: Dict) -> None:
+        """Fold the shard of an exited thread into the retired total."""
+        with self._shards_lock:
+            self._shards = [s for s in self._shards if s is not shard]
+            for key, value in shard.items():
+                self._retired[key] = self._combine(self._retired.get(key), value)
+
+    def _combine(self, total, value):
+        """New total of two shard values (total may be None); must not mutate either."""
+        raise NotImplementedError
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _snapshots(self) -> List[Dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+            retired = dict(self._retired)
+        # dict() copies are atomic under the GIL
+        return [retired] + [dict(shard) for shard in shards]
+
+    def _format_labels(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def _combine(self, total, value):
+        return value if total is None else total + value
+
+    def render(self) -> List[str]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+
+        return [f"{self.name}{self._format_labels(key)} {value}" for key, value in sorted(totals.items())]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values (e.g. latency in seconds)."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        # [count per bucket..., +Inf count, sum]
+        cells = shard.get(key)
+        if cells is None:
+            cells = shard[key] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                cells[i] += 1
+                break
+        else:
+            cells[len(self.buckets)] += 1
+        cells[-1] += value
+
+    def _combine(self, total, value):
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of a with-block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        totals: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in self._snapshots():
+            for key, cells in shard.items():
+                cells = list(cells)
+                if key in totals:
+                    totals[key] = [a + b for a, b in zip(totals[key], cells)]
+                else:
+                    totals[key] = cells
+
+        lines = []
+        for key, cells in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), cells):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {cells[-1]}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator observing a function's duration in `histogram`."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text format (0.0.4)."""
+    with _registry_lock:
+        metrics = list(_registry)
+
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# --- Application metrics ---
+
+APOLLO_REQUEST_SECONDS = Histogram(
+    'apollo_request_duration_seconds', 'Apollo API request latency per attempt', ('endpoint',)
+)
+APOLLO_REQUESTS = Counter(
+    'apollo_requests_total', 'Apollo API responses by HTTP status', ('endpoint', 'status')
+)
+APOLLO_RETRIES = Counter(
+    'apollo_retries_total', 'Apollo API retries', ('endpoint', 'reason')
+)
+APOLLO_RATE_LIMITED = Counter(
+    'apollo_rate_limited_total', 'Apollo API 429 responses', ('endpoint',)
+)
+APOLLO_COALESCED = Counter(
+    'apollo_coalesced_requests_total', 'Apollo calls served by joining an identical in-flight call', ('endpoint',)
+)
+APOLLO_CREDITS = Counter(
+    'apollo_credits_consumed_total', 'Apollo credits consumed (one per matched person)', ('endpoint',)
+)
+
+DB_QUERY_SECONDS = Histogram(
+    'db_query_duration_seconds', 'Database operation latency', ('operation',)
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    'llm_request_duration_seconds', 'LLM draft generation latency', ('provider', 'model')
+)
+LLM_TOKENS = Counter(
+    'llm_tokens_total', 'LLM tokens used', ('provider', 'kind')
+)
+LLM_ERRORS = Counter(
+    'llm_errors_total', 'LLM generation failures (fell back to mock)', ('provider',)
+)
+
+SMTP_SEND_SECONDS = Histogram(
+    'smtp_send_duration_seconds', 'Email send latency', ('provider',)
+)
+SMTP_SEND_FAILURES = Counter(
+    'smtp_send_failures_total', 'Email send failures', ('provider',)
+)
@@ -2,25 +2,53 @@
 FastAPI server with PostgreSQL database support.
 This replaces JSON file storage with database operations.
 """
-from fastapi import FastAPI, HTTPException, Depends
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from config import load_config, find_resume_path
+from metrics import render_metrics
 from database import (
     get_db, init_db, test_connection,
-    upsert_company, upsert_contact, create_search, get_company_by_domain,
-    get_contacts_by_company, create_email_history, export_contacts_to_dict
+    upsert_company, create_search, get_company_by_domain, get_or_create_companies,
+    create_email_history,
+    get_company_contact_rows, contact_rows_to_dicts, company_has_contacts, upsert_contacts,
+    get_company_contacts_version, emailed_addresses_version,
+    get_db_session, load_emailed_addresses, mark_address_emailed,
+    get_last_search, get_known_apollo_ids, get_company_directory_rows, get_role_yield_rows,
+    admit_enrichment, release_credits, get_credit_status
 )
-from apollo.api_client import ApolloClient
-from apollo.company_resolver import resolve_company_input
-from apollo.contact_search import search_contacts
+from apollo.api_client import ApolloClient, CircuitOpenError
+from apollo.batch import run_batch_search
+from apollo.company_directory import CompanyDirectory
+from apollo.company_resolver import resolve_company_input, resolve_companies
+from apollo.domains import canonical_domain
+from apollo.contact_record import ContactRecord
+from apollo.contact_search import search_contacts, iter_contact_pages
 from apollo.enrichment import enrich_contacts
 from apollo.llm import EmailGenerator
 from apollo.mailer import EmailSender
+from apollo.search_planner import RoleYieldStats
+from apollo.title_classifier import get_title_classifier
+
+try:
+    # orjson serializes contact lists several times faster than the stdlib encoder
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+    import orjson  # noqa: F401  (ORJSONResponse only fails at render time without it)
+except ImportError:
+    from fastapi.responses import JSONResponse as FastJSONResponse
+    orjson = None
 
 app = FastAPI()
 
@@ -33,10 +61,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Contact lists compress well; small bodies are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Initialize services
 try:
     config = load_config()
-    client = ApolloClient(config.APOLLO_API_KEY, config.API_BASE_URL)
+    client = ApolloClient.from_config(config)
 
     llm_api_key = config.GEMINI_API_KEY if config.LLM_PROVIDER == 'gemini' else config.OPENAI_API_KEY
     llm_service = EmailGenerator(
@@ -71,10 +102,25 @@ class SearchRequest(BaseModel):
     company: str
     roles: List[str]
     limit: Optional[int] = 10
+    incremental: Optional[bool] = False
+    rank: Optional[bool] = True  # Best title matches first, with match_* fields
+
+
+class ResolveCompaniesRequest(BaseModel):
+    inputs: List[str]
+
+
+class BatchSearchRequest(BaseModel):
+    companies: List[str]
+    roles: List[str]
+    limit: Optional[int] = 10
+    job_id: Optional[str] = None
 
 
 class EnrichRequest(BaseModel):
     contacts: List[Dict[str, Any]]
+    max_age_days: Optional[int] = None  # Overrides ENRICHMENT_MAX_AGE_DAYS
+    roles: Optional[List[str]] = None  # Spend credits on the best matches for these roles first
 
 
 class EmailDraftRequest(BaseModel):
@@ -88,6 +134,14 @@ class SendEmailRequest(BaseModel):
     subject: str
     body: str
     attach_resume: Optional[bool] = True
+    contact_id: Optional[int] = None  # Links the email_history row to a stored contact
+
+
+# Company names resolved without Apollo; filled from the DB (and CSV) at startup
+company_directory = CompanyDirectory()
+
+# People found per role in past searches; lets the search planner pick cheaper queries
+role_stats = RoleYieldStats()
 
 
 # --- Startup Event ---
@@ -98,9 +152,27 @@ async def startup_event():
     try:
         init_db()
         print("[OK] Database initialized")
+
+        with get_db_session() as db:
+            count = load_emailed_addresses(db)
+        print(f"[OK] Loaded {count} already-emailed addresses")
+
+        with get_db_session() as db:
+            company_directory.add_many(get_company_directory_rows(db))
+
+        with get_db_session() as db:
+            roles_learned = role_stats.load(get_role_yield_rows(db))
+        print(f"[OK] Search planner: yield stats for {roles_learned} roles")
     except Exception as e:
         print(f"[ERROR] Database initialization failed: {e}")
 
+    try:
+        if config.COMPANY_DIRECTORY_CSV:
+            company_directory.load_csv(config.COMPANY_DIRECTORY_CSV)
+    except Exception as e:
+        print(f"Warning: Could not load company directory CSV: {e}")
+    print(f"[OK] Company directory: {len(company_directory)} companies")
+
 
 # --- Endpoints ---
 
@@ -114,14 +186,44 @@ def health_check(db: Session = Depends(get_db)):
     except:
         db_status = "disconnected"
 
+    credits = None
+    if db_status == "connected":
+        try:
+            credits = get_credit_status(
+                db, config.APOLLO_DAILY_CREDIT_BUDGET, config.APOLLO_MONTHLY_CREDIT_BUDGET
+            )
+        except Exception as e:
+            print(f"Warning: Could not read credit ledger: {e}")
+
     return {
         "status": "ok",
         "api_key_configured": client is not None,
-        "database": db_status
+        "database": db_status,
+        "credits": credits,
+        "apollo_circuits": client.circuit_states() if client else None
     }
 
 
-@app.post("/api/search")
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+def rank_contact_dicts(contacts: List[Dict[str, Any]], roles: List[str]) -> List[Dict[str, Any]]:
+    """
+    Label contact dicts with their title match and order them best first.
+
+    Adds match_role, match_score and match_seniority from the local title
+    classifier (no Apollo calls); equal scores keep their original order.
+    """
+    matches = get_title_classifier().score_contacts(contacts, roles)
+    for contact, match in zip(contacts, matches):
+        contact.update(match.to_dict())
+    return sorted(contacts, key=lambda c: -c['match_score'])
+
+
+@app.post("/api/search", response_class=FastJSONResponse)
 def search_api(req: SearchRequest, db: Session = Depends(get_db)):
     """
     Search for contacts at a company.
@@ -132,20 +234,23 @@ def search_api(req: SearchRequest, db: Session = Depends(get_db)):
 
     try:
         # Resolve company
-        company_info = resolve_company_input(req.company, client)
+        company_info = resolve_company_input(req.company, client, company_directory)
 
-        # Upsert company to database
-        company = upsert_company(db, {
-            'domain': company_info['domain'],
-            'name': company_info['name'],
-            'organization_id': company_info.get('organization_id')
-        })
+        # Read what we already know about this company
+        existing_company = get_company_by_domain(db, company_info['domain'])
+        has_existing = existing_company is not None and company_has_contacts(db, existing_company.id)
+
+        if has_existing:
+            print(f"Found existing contacts in database for {company_info['name']}")
 
-        # Check if we have existing contacts in database
-        existing_contacts = get_contacts_by_company(db, company.id)
-        existing_count = len(existing_contacts)
+        # Incremental mode: only fetch people we have not stored yet
+        known_ids = None
+        if req.incremental and has_existing and get_last_search(db, existing_company.id, req.roles):
+            known_ids = get_known_apollo_ids(db, existing_company.id)
+            print(f"Incremental search: skipping {len(known_ids)} known contacts")
 
-        print(f"Found {existing_count} existing contacts in database for {company.name}")
+        # Don't hold a connection/transaction open while Apollo is being called
+        db.rollback()
 
         # Fetch fresh contacts from Apollo
         fresh_contacts = search_contacts(
@@ -154,48 +259,344 @@ def search_api(req: SearchRequest, db: Session = Depends(get_db)):
             client=client,
             max_results=req.limit,
             config=config,
-            company_info=company_info
+            company_info=company_info,
+            known_ids=known_ids,
+            role_stats=role_stats
         )
 
-        # Upsert contacts to database (smart merge)
-        for contact_data in fresh_contacts:
-            # Ensure company_domain is set
-            if not contact_data.get('company_domain'):
-                contact_data['company_domain'] = company_info['domain']
+        # Write everything in one transaction: company, contacts (one
+        # multi-row upsert with RETURNING) and the search record
+        company = upsert_company(db, {
+            'domain': company_info['domain'],
+            'name': company_info['name'],
+            'organization_id': company_info.get('organization_id')
+        }, commit=False)
 
-            upsert_contact(db, contact_data, company.id)
+        upserted = upsert_contacts(db, fresh_contacts, company.id, commit=False)
 
-        # Record this search
         create_search(
             db,
             company_id=company.id,
             roles=req.roles,
             limit=req.limit,
-            total_found=len(fresh_contacts)
+            total_found=len(fresh_contacts),
+            commit=False,
+            incremental=known_ids is not None
         )
 
-        # Get all contacts for this company from database
-        all_contacts = get_contacts_by_company(db, company.id)
+        # Response = stored contacts not touched by this search + upserted rows
+        untouched = get_company_contact_rows(db, company.id, exclude_ids=[row.id for row in upserted])
+        contacts_dict = contact_rows_to_dicts(untouched) + contact_rows_to_dicts(upserted, company=company)
+        if req.rank:
+            contacts_dict = rank_contact_dicts(contacts_dict, req.roles)
+        company_summary = {"name": company.name, "domain": company.domain}
+        company_directory.add(company.name, company.domain, company.organization_id)
 
-        # Convert to dictionaries for JSON response
-        contacts_dict = export_contacts_to_dict(all_contacts)
+        db.commit()
 
-        return {
+        # Incremental searches only count new people, so they say nothing about yield
+        if known_ids is None:
+            role_stats.record(req.roles, len(fresh_contacts), req.limit)
+
+        # Returning the response directly skips FastAPI's jsonable_encoder pass
+        return FastJSONResponse({
+            "company": company_summary,
+            "contacts": contacts_dict,
+            "total_count": len(contacts_dict),
+            "new_contacts": len(fresh_contacts),
+            "cached": has_existing,
+            "incremental": known_ids is not None
+        })
+
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, int(e.retry_after_seconds)))}
+        )
+    except Exception as e:
+        # Nothing from a half-finished search is kept
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def ndjson_line(payload: Dict[str, Any]) -> bytes:
+    """Serialize one newline-delimited JSON record."""
+    if orjson is not None:
+        return orjson.dumps(payload) + b"\n"
+    return (json.dumps(payload, default=str) + "\n").encode('utf-8')
+
+
+@app.post("/api/search/stream")
+def search_stream_api(req: SearchRequest):
+    """
+    Search like /api/search, streaming contacts as newline-delimited JSON.
+
+    Each Apollo page is stored in its own short transaction and sent as soon
+    as it arrives, while the next page is fetched in the background. Lines:
+    {"type": "company"}, one {"type": "contacts"} per page, then
+    {"type": "done"} (or {"type": "error"}).
+    """
+    if not client:
+        raise HTTPException(status_code=500, detail="Apollo API Client not initialized")
+
+    try:
+        company_info = resolve_company_input(req.company, client, company_directory)
+
+        known_ids = None
+        if req.incremental:
+            with get_db_session() as db:
+                existing_company = get_company_by_domain(db, company_info['domain'])
+                if existing_company is not None and get_last_search(db, existing_company.id, req.roles):
+                    known_ids = get_known_apollo_ids(db, existing_company.id)
+
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, int(e.retry_after_seconds)))}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    company_data = {
+        'domain': company_info['domain'],
+        'name': company_info['name'],
+        'organization_id': company_info.get('organization_id')
+    }
+
+    def stream():
+        total = 0
+        try:
+            with get_db_session() as db:
+                company = upsert_company(db, company_data, commit=False)
+                # Detached before commit, so its loaded fields stay readable for every page
+                db.expunge(company)
+                company_id = company.id
+                company_summary = {"name": company.name, "domain": company.domain}
+            yield ndjson_line({
+                "type": "company",
+                "company": company_summary,
+                "incremental": known_ids is not None
+            })
+
+            pages = iter_contact_pages(
+                company_domain=company_info['domain'],
+                target_roles=req.roles,
+                client=client,
+                max_results=req.limit,
+                config=config,
+                company_info=company_info,
+                known_ids=known_ids,
+                role_stats=role_stats
+            )
+            for page, contacts in enumerate(pages, start=1):
+                with get_db_session() as db:
+                    rows = upsert_contacts(db, contacts, company_id, commit=False)
+                    page_dicts = contact_rows_to_dicts(rows, company=company)
+                if req.rank:
+                    page_dicts = rank_contact_dicts(page_dicts, req.roles)
+                payload = {"type": "contacts", "page": page, "contacts": page_dicts}
+                total += len(contacts)
+                yield ndjson_line(payload)
+
+            with get_db_session() as db:
+                create_search(db, company_id=company_id, roles=req.roles, limit=req.limit,
+                              total_found=total, commit=False, incremental=known_ids is not None)
+            company_directory.add(company_data['name'], company_data['domain'], company_data['organization_id'])
+            if known_ids is None:
+                role_stats.record(req.roles, total, req.limit)
+
+            yield ndjson_line({"type": "done", "new_contacts": total})
+
+        except Exception as e:
+            # Pages already sent are stored; the search record is not
+            yield ndjson_line({"type": "error", "detail": str(e), "new_contacts": total})
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def store_company_contacts(company_info: Dict[str, Any], contacts: List[Dict[str, Any]],
+                           roles: List[str], limit: Optional[int]) -> int:
+    """Persist one company's search results in its own transaction."""
+    with get_db_session() as db:
+        company = upsert_company(db, {
+            'domain': company_info['domain'],
+            'name': company_info['name'],
+            'organization_id': company_info.get('organization_id')
+        }, commit=False)
+
+        upsert_contacts(db, contacts, company.id, commit=False)
+
+        create_search(
+            db,
+            company_id=company.id,
+            roles=roles,
+            limit=limit,
+            total_found=len(contacts),
+            commit=False
+        )
+
+    role_stats.record(roles, len(contacts), limit)
+    return len(contacts)
+
+
+# Serialized company contact lists keyed by ETag (small LRU)
+CONTACTS_PAYLOAD_CACHE_SIZE = 128
+_contacts_payload_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_contacts_payload_cache_lock = threading.Lock()
+
+
+def company_contacts_etag(company, count: int, last_updated) -> str:
+    """
+    Weak ETag for a company's contact list.
+
+    Changes when a contact is added, removed or updated, when the company
+    row changes, or when the emailed-address cache (the 'emailed' flag)
+    changes.
+    """
+    marker = '|'.join(str(part) for part in (
+        company.id, company.updated_at, count, last_updated, emailed_addresses_version()
+    ))
+    return 'W/"' + hashlib.sha1(marker.encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    If-None-Match check using weak comparison (RFC 7232): 'W/"x"' and '"x"' match.
+
+    Args:
+        etag: Current ETag of the resource
+        if_none_match: If-None-Match request header ('' if absent)
+
+    Returns:
+        True if the client's copy is current (respond 304)
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+@app.get("/api/companies/{domain}/contacts")
+def company_contacts_api(domain: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Get a company's stored contacts, with ETag / If-None-Match support.
+
+    An unchanged list costs two small queries and returns 304; a changed
+    list is serialized once and served from the payload cache afterwards.
+    """
+    company = get_company_by_domain(db, canonical_domain(domain))
+    if not company:
+        raise HTTPException(status_code=404, detail=f"Company '{domain}' not found")
+
+    count, last_updated = get_company_contacts_version(db, company.id)
+    etag = company_contacts_etag(company, count, last_updated)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(etag, request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+
+    with _contacts_payload_cache_lock:
+        body = _contacts_payload_cache.get(etag)
+        if body is not None:
+            _contacts_payload_cache.move_to_end(etag)
+
+    if body is None:
+        contacts_dict = contact_rows_to_dicts(get_company_contact_rows(db, company.id))
+        body = FastJSONResponse({
             "company": {
                 "name": company.name,
                 "domain": company.domain
             },
             "contacts": contacts_dict,
-            "total_count": len(all_contacts),
-            "new_contacts": len(fresh_contacts),
-            "cached": existing_count > 0
+            "total_count": len(contacts_dict)
+        }).body
+
+        with _contacts_payload_cache_lock:
+            _contacts_payload_cache[etag] = body
+            while len(_contacts_payload_cache) > CONTACTS_PAYLOAD_CACHE_SIZE:
+                _contacts_payload_cache.popitem(last=False)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.post("/api/companies/resolve")
+def resolve_companies_api(req: ResolveCompaniesRequest):
+    """
+    Resolve many company names/URLs/domains at once.
+
+    Duplicates are collapsed, directory hits are answered offline and the
+    rest is looked up concurrently under the shared Apollo rate limit.
+    """
+    if not client:
+        raise HTTPException(status_code=500, detail="Apollo API Client not initialized")
+
+    results = resolve_companies(req.inputs, client, company_directory)
+    return {
+        "results": results,
+        "resolved": sum(1 for r in results.values() if r['status'] == 'resolved'),
+        "not_found": sum(1 for r in results.values() if r['status'] == 'not_found'),
+        "errors": sum(1 for r in results.values() if r['status'] == 'error')
+    }
+
+
+JOB_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+
+@app.post("/api/search/batch")
+def batch_search_api(req: BatchSearchRequest):
+    """
+    Search many companies at once.
+    Progress is checkpointed per job, so re-posting the same job resumes it.
+    """
+    if not client:
+        raise HTTPException(status_code=500, detail="Apollo API Client not initialized")
+
+    # job_id names a checkpoint file, so it must not be able to leave the directory
+    if req.job_id is not None and not JOB_ID_PATTERN.fullmatch(req.job_id):
+        raise HTTPException(status_code=400, detail="job_id must be 1-64 letters, digits, '_' or '-'")
+
+    job_id = req.job_id or hashlib.sha1(
+        json.dumps([req.companies, sorted(req.roles), req.limit]).encode('utf-8')
+    ).hexdigest()[:16]
+    checkpoint_dir = os.path.realpath(os.path.join(config.DEFAULT_OUTPUT_DIR, 'batch_checkpoints'))
+    checkpoint_path = os.path.realpath(os.path.join(checkpoint_dir, f"{job_id}.json"))
+    if os.path.dirname(checkpoint_path) != checkpoint_dir:
+        raise HTTPException(status_code=400, detail="Invalid job_id")
+
+    try:
+        results = run_batch_search(
+            req.companies,
+            req.roles,
+            client,
+            store=lambda company_info, contacts: store_company_contacts(
+                company_info, contacts, req.roles, req.limit
+            ),
+            max_results=req.limit,
+            config=config,
+            checkpoint_path=checkpoint_path,
+            directory=company_directory,
+            role_stats=role_stats
+        )
+
+        return {
+            "job_id": job_id,
+            "results": results,
+            "total_companies": len(results),
+            "completed": sum(1 for r in results if r['status'] == 'done'),
+            "total_contacts": sum(r.get('found', 0) for r in results if r['status'] == 'done')
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/enrich")
+@app.post("/api/enrich", response_class=FastJSONResponse)
 def enrich_api(req: EnrichRequest, db: Session = Depends(get_db)):
     """
     Enrich contacts with emails.
@@ -205,37 +606,74 @@ def enrich_api(req: EnrichRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Apollo API Client not initialized")
 
     try:
-        # Enrich via Apollo API
-        enriched_contacts = enrich_contacts(req.contacts, client, show_progress=False)
-
-        # Update database with enriched data
-        updated_contacts = []
+        # Best title matches first, so a tight budget is spent on them
+        records = [ContactRecord.from_dict(c) for c in req.contacts]
+        records = get_title_classifier().rank(records, req.roles)
+
+        # Admission control: answer already-enriched contacts from the DB,
+        # reserve credits for the rest and reject anything over budget
+        admission = admit_enrichment(
+            db, records,
+            daily_budget=config.APOLLO_DAILY_CREDIT_BUDGET,
+            monthly_budget=config.APOLLO_MONTHLY_CREDIT_BUDGET,
+            max_age_days=(
+                req.max_age_days if req.max_age_days is not None
+                else config.ENRICHMENT_MAX_AGE_DAYS
+            )
+        )
+        admitted = admission['admitted']
+
+        if admission['rejected'] and not admitted and not admission['stored']:
+            raise HTTPException(status_code=429, detail="Apollo credit budget exhausted")
+
+        # Enrich via Apollo API. Apollo only charges for matched people:
+        # failed and unmatched lookups come back unchanged, so their credits
+        # (and every unused one if enrichment raises) go back to the day
+        # they were reserved on
+        enriched_contacts = []
+        try:
+            if admitted:
+                enriched_contacts = enrich_contacts(admitted, client, show_progress=False)
+        finally:
+            charged = sum(1 for before, after in zip(admitted, enriched_contacts) if after is not before)
+            release_credits(db, len(admitted) - charged, admission['reserved_on'])
+
+        # Update database with enriched data: one IN query / bulk insert for
+        # all companies, then one bulk contact upsert per company
+        by_domain: Dict[str, List[Dict[str, Any]]] = {}
         for contact_data in enriched_contacts:
-            # Find company
-            company_domain = contact_data.get('company_domain')
-            if not company_domain:
-                continue
-
-            company = get_company_by_domain(db, company_domain)
-            if not company:
-                # Create company if doesn't exist
-                company = upsert_company(db, {
-                    'domain': company_domain,
-                    'name': contact_data.get('company', 'Unknown')
-                })
-
-            # Upsert enriched contact
-            contact = upsert_contact(db, contact_data, company.id)
-            updated_contacts.append(contact)
-
-        # Convert to dictionaries
-        contacts_dict = export_contacts_to_dict(updated_contacts)
+            company_domain = canonical_domain(contact_data.get('company_domain'))
+            if company_domain:
+                by_domain.setdefault(company_domain, []).append(contact_data)
 
-        return {
+        companies = get_or_create_companies(
+            db,
+            {domain: group[0].get('company') or 'Unknown' for domain, group in by_domain.items()},
+            commit=False
+        )
+
+        enriched_dicts = []
+        for domain, group in by_domain.items():
+            company = companies[domain]
+            rows = upsert_contacts(db, group, company.id, commit=False)
+            enriched_dicts.extend(contact_rows_to_dicts(rows, company=company))
+
+        db.commit()
+
+        contacts_dict = admission['stored'] + enriched_dicts
+
+        return FastJSONResponse({
             "contacts": contacts_dict,
-            "total_enriched": len(updated_contacts)
-        }
+            "total_enriched": len(enriched_dicts),
+            "from_database": len(admission['stored']),
+            "rejected": [c.get('id') for c in admission['rejected']],
+            "credits": get_credit_status(
+                db, config.APOLLO_DAILY_CREDIT_BUDGET, config.APOLLO_MONTHLY_CREDIT_BUDGET
+            )
+        })
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -268,15 +706,33 @@ def send_email_api(req: SendEmailRequest, db: Session = Depends(get_db)):
         # Send email
         success = email_service.send_email(req.to_email, req.subject, req.body, attachment_path)
 
-        # Record in database
-        # Note: We need contact_id, but we may not have it from the frontend
-        # For now, we'll create email history without contact_id
-        # TODO: Update frontend to send contact_id
-
         if success:
+            recorded = False
+            if email_service.provider != "mock":
+                # email_history is what every worker (and a restart) rebuilds the
+                # emailed-address cache from; create_email_history marks the
+                # cache once the row is committed
+                try:
+                    create_email_history(db, {
+                        'contact_id': req.contact_id,
+                        'to_email': req.to_email,
+                        'subject': req.subject,
+                        'body': req.body,
+                        'status': 'sent',
+                        'resume_attached': attachment_path is not None,
+                        'resume_path': attachment_path,
+                        'smtp_provider': email_service.provider
+                    })
+                    recorded = True
+                except Exception as e:
+                    # The email is out either way; don't report the send as failed
+                    db.rollback()
+                    print(f"Warning: Failed to record sent email to {req.to_email}: {e}")
+                    mark_address_emailed(req.to_email)
             return {
                 "status": "sent",
-                "mock": (email_service.provider == "mock")
+                "mock": (email_service.provider == "mock"),
+                "recorded": recorded
             }
         else:
             raise HTTPException(status_code=500, detail="Failed to send email")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark against the local fake Apollo server (no credits used).
+
+Starts tests/fake_apollo.py in-process, points ApolloClient at it and reports
+p50/p95 latency and throughput for resolve_company_input, search_contacts,
+enrich_contacts and, with --with-server, the server.py HTTP endpoints
+(those need a reachable database).
+
+Usage:
+    python tests/benchmark_e2e.py
+    python tests/benchmark_e2e.py --iterations 200 --concurrency 8 --latency-ms 80 --rate-429 0.01
+    python tests/benchmark_e2e.py --with-server
+"""
+
+import argparse
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+import uvicorn
+from tabulate import tabulate
+
+import fake_apollo
+
+
+def start_uvicorn(app, port: int) -> uvicorn.Server:
+    """Run an ASGI app on a background thread and wait until it accepts requests."""
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Server on port {port} did not start")
+        time.sleep(0.05)
+    return server
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(name: str, fn: Callable[[int], Any], iterations: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Call fn(i) for i in range(iterations) on `concurrency` threads.
+
+    Returns:
+        Dictionary with latency percentiles (ms), error count and throughput
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def run_one(i: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            fn(i)
+            ok = True
+        except Exception as e:
+            ok = False
+            print(f"  [{name}] error: {e}")
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(run_one, range(iterations)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'name': name,
+        'calls': iterations,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'throughput': iterations / wall if wall > 0 else 0.0
+    }
+
+
+def run_library_benchmarks(args, base_url: str) -> List[Dict[str, Any]]:
+    from config import load_config
+    from apollo.api_client import ApolloClient
+    from apollo.company_resolver import resolve_company_input
+    from apollo.contact_search import search_contacts
+    from apollo.enrichment import enrich_contacts
+
+    config = load_config()
+    client = ApolloClient('fake-key', base_url)
+    roles = args.roles
+
+    results = [
+        measure(
+            'resolve_company_input',
+            lambda i: resolve_company_input(f"Company {i % args.companies}", client),
+            args.iterations, args.concurrency
+        ),
+        measure(
+            'search_contacts',
+            lambda i: search_contacts(
+                company_domain=f"company{i % args.companies}.com",
+                target_roles=roles,
+                client=client,
+                max_results=args.limit,
+                config=config
+            ),
+            args.iterations, args.concurrency
+        )
+    ]
+
+    sample = search_contacts('enrich-sample.com', roles, client, max_results=args.enrich_batch, config=config)
+    results.append(measure(
+        f'enrich_contacts ({len(sample)} contacts)',
+        lambda i: enrich_contacts(sample, client, show_progress=False, batch_delay=0),
+        max(1, args.iterations // 10), args.concurrency
+    ))
+
+    return results
+
+
+def run_server_benchmarks(args, base_url: str) -> List[Dict[str, Any]]:
+    import server
+
+    start_uvicorn(server.app, args.server_port)
+    api = f"http://127.0.0.1:{args.server_port}"
+    session = requests.Session()
+
+    def post(path: str, payload: Dict[str, Any]) -> None:
+        response = session.post(api + path, json=payload, timeout=60)
+        response.raise_for_status()
+
+    def get(path: str) -> None:
+        response = session.get(api + path, timeout=60)
+        response.raise_for_status()
+
+    return [
+        measure('GET /api/health', lambda i: get('/api/health'), args.iterations, args.concurrency),
+        measure(
+            'POST /api/search',
+            lambda i: post('/api/search', {
+                'company': f"company{i % args.companies}.com",
+                'roles': args.roles,
+                'limit': args.limit
+            }),
+            args.iterations, args.concurrency
+        ),
+        measure(
+            'POST /api/generate-email',
+            lambda i: post('/api/generate-email', {
+                'contact': {'first_name': 'Alex', 'company': 'Acme', 'title': 'CTO'}
+            }),
+            args.iterations, args.concurrency
+        )
+    ]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the Apollo pipeline against a fake Apollo server')
+    parser.add_argument('--iterations', type=int, default=50, help='Calls per benchmark')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent callers')
+    parser.add_argument('--companies', type=int, default=20, help='Distinct synthetic companies to cycle through')
+    parser.add_argument('--roles', nargs='+', default=['recruiter', 'engineering_manager'])
+    parser.add_argument('--limit', type=int, default=100, help='max_results per search')
+    parser.add_argument('--enrich-batch', type=int, default=10, help='Contacts per enrich_contacts call')
+    parser.add_argument('--with-server', action='store_true', help='Also benchmark server.py endpoints (needs DB)')
+    parser.add_argument('--fake-port', type=int, default=8900)
+    parser.add_argument('--server-port', type=int, default=8901)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    fake_args = fake_apollo.parse_args([
+        '--latency-ms', str(args.latency_ms),
+        '--jitter-ms', str(args.jitter_ms),
+        '--rate-429', str(args.rate_429),
+        '--error-rate', str(args.error_rate)
+    ])
+    fake_apollo.configure(fake_args)
+    start_uvicorn(fake_apollo.app, args.fake_port)
+    base_url = f"http://127.0.0.1:{args.fake_port}"
+
+    # Config reads these at import time, so set them before anything imports it
+    os.environ['APOLLO_API_BASE_URL'] = base_url
+    os.environ.setdefault('APOLLO_API_KEY', 'fake-key')
+    os.environ['LLM_PROVIDER'] = 'mock'
+    os.environ['EMAIL_PROVIDER'] = 'mock'
+
+    print("\n" + "="*60)
+    print("END-TO-END BENCHMARK (fake Apollo)")
+    print("="*60)
+    print(f"Fake Apollo: {base_url} | latency {args.latency_ms}±{args.jitter_ms}ms | "
+          f"429 rate {args.rate_429} | error rate {args.error_rate}")
+    print(f"Iterations: {args.iterations} | Concurrency: {args.concurrency}\n")
+
+    results = run_library_benchmarks(args, base_url)
+    if args.with_server:
+        results += run_server_benchmarks(args, base_url)
+
+    table = [[
+        r['name'], r['calls'], r['errors'],
+        f"{r['p50_ms']:.1f}", f"{r['p95_ms']:.1f}", f"{r['max_ms']:.1f}",
+        f"{r['throughput']:.1f}"
+    ] for r in results]
+
+    print("\n" + tabulate(
+        table,
+        headers=['Benchmark', 'Calls', 'Errors', 'p50 (ms)', 'p95 (ms)', 'max (ms)', 'Calls/s'],
+        tablefmt='grid'
+    ))
+
+
+if __name__ == '__main__':
+    main()
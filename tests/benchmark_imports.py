@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Import-time / startup benchmark.
+
+Runs each target in a fresh interpreter several times and reports the
+median wall time, plus the slowest imports from `python -X importtime`.
+
+Usage:
+    python tests/benchmark_imports.py
+    python tests/benchmark_imports.py --runs 10 --top 15
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+TARGETS: Dict[str, List[str]] = {
+    'python (baseline)': ['-c', 'pass'],
+    'apollo_contacts.py --help': [str(ROOT / 'apollo_contacts.py'), '--help'],
+    'import config': ['-c', 'import config'],
+    'import apollo.api_client': ['-c', 'import apollo.api_client'],
+    'import database': ['-c', 'import database'],
+    'import server': ['-c', 'import server'],
+}
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.*)')
+
+
+def run_once(argv: List[str]) -> Tuple[float, int]:
+    """Run one fresh interpreter; returns (seconds, exit code)."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable] + argv, cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - started, result.returncode
+
+
+def slowest_imports(argv: List[str], top: int) -> List[Tuple[int, str]]:
+    """Cumulative microseconds per top-level import, slowest first."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + argv, cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and not match.group(3).startswith(' '):
+            rows.append((int(match.group(2)), match.group(3).strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure interpreter startup and import times')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per target (median is reported)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list per target')
+    args = parser.parse_args()
+
+    # Keep .env / database settings from changing what gets imported
+    os.environ.setdefault('APOLLO_API_KEY', 'benchmark-key')
+
+    print("\n" + "="*60)
+    print("IMPORT-TIME BENCHMARK")
+    print("="*60)
+
+    for name, argv in TARGETS.items():
+        timings = []
+        exit_code = 0
+        for _ in range(args.runs):
+            elapsed, exit_code = run_once(argv)
+            timings.append(elapsed)
+
+        status = '' if exit_code == 0 else f"  (exit code {exit_code})"
+        print(f"\n{name}: median {statistics.median(timings) * 1000:.0f} ms, "
+              f"min {min(timings) * 1000:.0f} ms{status}")
+
+        for micros, module in slowest_imports(argv, args.top):
+            print(f"    {micros / 1000:8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
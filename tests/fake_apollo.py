@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Apollo API, for load tests that must not burn credits.
+
+Implements the endpoints the tool uses with deterministic synthetic data:
+  POST /api/v1/mixed_people/api_search
+  POST /api/v1/organizations/search   (also /v1/organizations/search)
+  POST /api/v1/mixed_companies/search
+  POST /api/v1/people/match
+  POST /api/v1/people/bulk_match
+
+Latency, 429 injection and error rates are configurable from the command
+line, and at runtime through POST /_fake/config.
+
+Usage:
+    python tests/fake_apollo.py --port 8900 --latency-ms 80 --rate-429 0.02
+    APOLLO_API_BASE_URL=http://127.0.0.1:8900 python apollo_contacts.py "acme.com" --skip-enrichment
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+FIRST_NAMES = [
+    'Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery',
+    'Quinn', 'Drew', 'Sam', 'Robin', 'Priya', 'Wei', 'Fatima', 'Diego',
+    'Olga', 'Kenji', 'Amara', 'Lukas'
+]
+
+LAST_NAMES = [
+    'Smith', 'Chen', 'Garcia', 'Patel', 'Kim', 'Nguyen', 'Okafor', 'Muller',
+    'Rossi', 'Silva', 'Cohen', 'Tanaka', 'Novak', 'Larsen', 'Haddad', 'Brown'
+]
+
+TITLES = [
+    ('Technical Recruiter', 'senior'), ('Recruiter', 'entry'),
+    ('Talent Acquisition Partner', 'senior'), ('Head of Talent Acquisition', 'head'),
+    ('Engineering Manager', 'manager'), ('Senior Engineering Manager', 'manager'),
+    ('Director of Engineering', 'director'), ('VP of Engineering', 'vp'),
+    ('CTO', 'c_suite'), ('CEO', 'c_suite'), ('Co-Founder', 'founder'),
+    ('Staff Engineer', 'senior'), ('Software Engineer', 'entry'),
+    ('Account Executive', 'senior'), ('Marketing Manager', 'manager'),
+    ('Product Designer', 'senior'), ('Data Scientist', 'senior')
+]
+
+CITIES = [
+    ('San Francisco', 'California', 'United States'), ('New York', 'New York', 'United States'),
+    ('Austin', 'Texas', 'United States'), ('London', None, 'United Kingdom'),
+    ('Berlin', None, 'Germany'), ('Toronto', 'Ontario', 'Canada'), ('Bengaluru', 'Karnataka', 'India')
+]
+
+
+class FakeSettings:
+    """Mutable fault-injection settings shared by all handlers."""
+
+    def __init__(self, latency_ms=50.0, jitter_ms=20.0, rate_429=0.0, error_rate=0.0,
+                 retry_after=1, seed=42, people_per_org=250):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.people_per_org = people_per_org
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+
+settings = FakeSettings()
+app = FastAPI(title="Fake Apollo API")
+_fault_rng = random.Random()
+
+
+def _stable_int(*parts: Any) -> int:
+    """Deterministic integer from arbitrary parts (independent of PYTHONHASHSEED)."""
+    digest = hashlib.sha1('|'.join(str(p) for p in (settings.seed,) + parts).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def _org_key(value: str) -> str:
+    value = (value or 'example').strip().lower()
+    for prefix in ('https://', 'http://', 'www.'):
+        if value.startswith(prefix):
+            value = value[len(prefix):]
+    return value.split('/')[0]
+
+
+def make_organization(key: str) -> Dict[str, Any]:
+    """Build a synthetic organization for a name or domain (remembered by its ID)."""
+    key = _org_key(key)
+    base = key.split('.')[0] if '.' in key else key.replace(' ', '')
+    domain = key if '.' in key else f"{base}.com"
+    org = {
+        'id': f"{_stable_int('org', domain):024x}"[:24],
+        'name': base.replace('-', ' ').title(),
+        'primary_domain': domain,
+        'domain': domain,
+        'website_url': f"http://www.{domain}",
+        'estimated_num_employees': 50 + _stable_int('size', domain) % 20000
+    }
+    _issued_orgs[org['id']] = org
+    return org
+
+
+def organization_by_id(org_id: str) -> Dict[str, Any]:
+    """Organization previously returned under `org_id` (a placeholder one if never issued)."""
+    org = _issued_orgs.get(org_id)
+    if org is None:
+        org = dict(make_organization(f"org-{org_id[:8]}.com"), id=org_id)
+        _issued_orgs[org_id] = org
+    return dict(org)
+
+
+def org_size(org: Dict[str, Any]) -> int:
+    return 1 + _stable_int('people', org['id']) % max(1, settings.people_per_org)
+
+
+def make_person(org: Dict[str, Any], index: int, revealed: bool = False) -> Dict[str, Any]:
+    """Build the index-th synthetic person of an organization."""
+    n = _stable_int('person', org['id'], index)
+    first_name = FIRST_NAMES[n % len(FIRST_NAMES)]
+    last_name = LAST_NAMES[(n >> 8) % len(LAST_NAMES)]
+    title, seniority = TITLES[(n >> 16) % len(TITLES)]
+    city, state, country = CITIES[(n >> 24) % len(CITIES)]
+
+    person = {
+        'id': f"{n:024x}"[:24],
+        'first_name': first_name,
+        'last_name_obfuscated': last_name[0] + '***',
+        'name': f"{first_name} {last_name[0]}.",
+        'title': title,
+        'seniority': seniority,
+        'departments': ['engineering'] if 'Engineer' in title or title == 'CTO' else ['other'],
+        'city': city,
+        'state': state,
+        'country': country,
+        'linkedin_url': f"http://www.linkedin.com/in/{first_name.lower()}-{last_name.lower()}-{n % 10000}",
+        'photo_url': None,
+        'headline': f"{title} at {org['name']}",
+        'has_email': (n >> 32) % 10 < 8,
+        'has_direct_phone': 'Yes' if (n >> 36) % 4 == 0 else 'No',
+        'organization': {
+            'id': org['id'],
+            'name': org['name'],
+            'domain': org['domain'],
+            'primary_domain': org['primary_domain'],
+            'website_url': org['website_url'],
+            'estimated_num_employees': org['estimated_num_employees']
+        }
+    }
+
+    if revealed:
+        person['last_name'] = last_name
+        person['name'] = f"{first_name} {last_name}"
+        if person['has_email']:
+            person['email'] = f"{first_name}.{last_name}{n % 100}@{org['domain']}".lower()
+        person['personal_emails'] = []
+        person['phone_numbers'] = []
+
+    return person
+
+
+# person_id -> (organization, index); filled as search results are handed out
+_issued_people: Dict[str, tuple] = {}
+
+# organization_id -> organization; filled as organizations are handed out,
+# so people searches by organization_ids get the real name and domain
+_issued_orgs: Dict[str, Dict[str, Any]] = {}
+
+
+async def _inject_faults() -> Optional[JSONResponse]:
+    """Sleep for the configured latency and maybe return an injected failure."""
+    delay = settings.latency_ms + _fault_rng.uniform(-settings.jitter_ms, settings.jitter_ms)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000.0)
+
+    roll = _fault_rng.random()
+    if roll < settings.rate_429:
+        return JSONResponse(
+            {'error': 'rate limit exceeded (injected)'},
+            status_code=429,
+            headers={'Retry-After': str(settings.retry_after)}
+        )
+    if roll < settings.rate_429 + settings.error_rate:
+        return JSONResponse({'message': 'internal error (injected)'}, status_code=500)
+    return None
+
+
+async def _body(request: Request) -> Dict[str, Any]:
+    """Merge JSON body and query parameters, like Apollo accepts both."""
+    data: Dict[str, Any] = dict(request.query_params)
+    try:
+        payload = await request.json()
+        if isinstance(payload, dict):
+            data.update(payload)
+    except Exception:
+        pass
+    return data
+
+
+def _pagination(page: int, per_page: int, total: int) -> Dict[str, int]:
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total_entries': total,
+        'total_pages': max(1, -(-total // per_page))
+    }
+
+
+@app.post('/api/v1/mixed_people/api_search')
+async def people_search(request: Request):
+    failure = await _inject_faults()
+    if failure:
+        return failure
+
+    data = await _body(request)
+    per_page = min(int(data.get('per_page', 25)), 100)
+    page = max(1, int(data.get('page', 1)))
+
+    org_ids = data.get('organization_ids')
+    if org_ids:
+        org = organization_by_id(org_ids[0] if isinstance(org_ids, list) else org_ids)
+    else:
+        keys = data.get('q_organization_domains') or ['example.com']
+        org = make_organization(keys[0] if isinstance(keys, list) else keys)
+
+    # Title filters shrink the result set deterministically
+    titles = data.get('person_titles') or []
+    total = org_size(org)
+    if titles:
+        total = max(1, total * min(len(titles), 40) // 40)
+
+    start = (page - 1) * per_page
+    people = []
+    for index in range(start, min(start + per_page, total)):
+        person = make_person(org, index)
+        _issued_people[person['id']] = (org, index)
+        people.append(person)
+
+    return {
+        'people': people,
+        'pagination': _pagination(page, per_page, total)
+    }
+
+
+@app.post('/api/v1/organizations/search')
+@app.post('/v1/organizations/search')
+@app.post('/api/v1/mixed_companies/search')
+async def organization_search(request: Request):
+    failure = await _inject_faults()
+    if failure:
+        return failure
+
+    data = await _body(request)
+    name = data.get('q_organization_name') or ''
+    per_page = int(data.get('per_page', 10))
+    org = make_organization(name)
+    organizations = [org] if name else []
+
+    return {
+        'organizations': organizations[:per_page],
+        'accounts': [],
+        'pagination': _pagination(1, per_page, len(organizations))
+    }
+
+
+def _match(details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    issued = _issued_people.get(details.get('id') or '')
+    if issued:
+        org, index = issued
+    else:
+        org = make_organization(details.get('domain') or details.get('organization_name') or 'example.com')
+        index = _stable_int('match', details.get('first_name'), details.get('last_name')) % org_size(org)
+    return make_person(org, index, revealed=True)
+
+
+@app.post('/api/v1/people/match')
+async def people_match(request: Request):
+    failure = await _inject_faults()
+    if failure:
+        return failure
+
+    data = await _body(request)
+    return {'person': _match(data)}
+
+
+@app.post('/api/v1/people/bulk_match')
+async def people_bulk_match(request: Request):
+    failure = await _inject_faults()
+    if failure:
+        return failure
+
+    data = await _body(request)
+    details: List[Dict[str, Any]] = data.get('details') or []
+    matches = [_match(d) for d in details[:10]]
+    return {
+        'status': 'success',
+        'matches': matches,
+        'credits_consumed': sum(1 for m in matches if m and m.get('email'))
+    }
+
+
+@app.get('/_fake/config')
+async def get_fake_config():
+    return settings.as_dict()
+
+
+@app.post('/_fake/config')
+async def set_fake_config(request: Request):
+    data = await _body(request)
+    for key, value in data.items():
+        if hasattr(settings, key):
+            setattr(settings, key, type(getattr(settings, key))(value))
+    return settings.as_dict()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Fake Apollo API server for load testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Mean response latency')
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help='Uniform +/- latency jitter')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Probability of an injected 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of an injected 500')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for synthetic data')
+    parser.add_argument('--people-per-org', type=int, default=250, help='Maximum people per organization')
+    return parser.parse_args(argv)
+
+
+def configure(args) -> None:
+    """Apply parsed command-line options to the shared settings."""
+    settings.latency_ms = args.latency_ms
+    settings.jitter_ms = args.jitter_ms
+    settings.rate_429 = args.rate_429
+    settings.error_rate = args.error_rate
+    settings.retry_after = args.retry_after
+    settings.seed = args.seed
+    settings.people_per_org = args.people_per_org
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    args = parse_args()
+    configure(args)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
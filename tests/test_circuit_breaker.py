@@ -0,0 +1,65 @@
+"""
+Tests for the circuit breaker state machine.
+
+Run with: python -m pytest tests/test_circuit_breaker.py
+"""
+import types
+
+import pytest
+
+from apollo import circuit_breaker
+from apollo.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker('search', failure_threshold=3, recovery_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is None
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock[0] += 10
+    assert breaker.allow_request() == pytest.approx(20)
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker('search', failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker('match', failure_threshold=1, recovery_timeout=5)
+    breaker.record_failure()
+    clock[0] += 5
+
+    assert breaker.allow_request() is None
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() == 1.0
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is None
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker('match', failure_threshold=3, recovery_timeout=5)
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 6
+    assert breaker.allow_request() is None
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() == pytest.approx(5)
@@ -0,0 +1,57 @@
+"""
+Tests for the in-memory company directory.
+
+Run with: python -m pytest tests/test_company_directory.py
+"""
+import pytest
+
+from apollo.company_directory import CompanyDirectory, normalize_company_name
+
+
+@pytest.fixture
+def directory():
+    companies = CompanyDirectory()
+    companies.add_many([
+        ('Stripe, Inc.', 'stripe.com', 'org-stripe'),
+        ('Metabase', 'https://www.metabase.com/', None),
+        ('Snowflake Inc', 'snowflake.com', 'org-snow'),
+        ('Johnson & Johnson', 'jnj.com', None),
+    ])
+    return companies
+
+
+@pytest.mark.parametrize('name, key', [
+    ('The Google, LLC', 'google'),
+    ('Johnson & Johnson', 'johnson and johnson'),
+    ('The Company', 'the company'),
+    (None, ''),
+])
+def test_normalize_company_name(name, key):
+    assert normalize_company_name(name) == key
+
+
+def test_resolve_exact_normalized_name(directory):
+    assert directory.resolve('stripe') == {
+        'domain': 'stripe.com', 'organization_id': 'org-stripe', 'name': 'Stripe, Inc.'
+    }
+    assert directory.resolve('STRIPE LLC')['domain'] == 'stripe.com'
+    assert directory.resolve('Johnson and Johnson')['domain'] == 'jnj.com'
+
+
+@pytest.mark.parametrize('name', ['Meta', 'Snow', 'Stripes', '', 'Unknown Corp'])
+def test_resolve_never_guesses(directory, name):
+    assert directory.resolve(name) is None
+
+
+def test_suggest_prefix_then_fuzzy(directory):
+    assert [c['domain'] for c in directory.suggest('Snow')] == ['snowflake.com']
+    assert [c['domain'] for c in directory.suggest('Stripes')] == ['stripe.com']
+    # Shorter than min_prefix: no autocomplete, and too far for fuzzy
+    assert directory.suggest('Met') == []
+    assert directory.suggest('') == []
+
+
+def test_add_same_domain_updates_entry(directory):
+    directory.add('Stripe', 'stripe.com', None)
+    assert len(directory) == 4
+    assert directory.by_domain('www.stripe.com')['organization_id'] == 'org-stripe'
@@ -0,0 +1,53 @@
+"""
+Tests for decoding people search pages.
+
+Run with: python -m pytest tests/test_contact_search.py
+"""
+import json
+
+import pytest
+
+from apollo.contact_record import ContactRecord
+from apollo.contact_search import decode_people_page, extract_contact_data
+
+PEOPLE = [
+    # Search result: masked last name, explicit null
+    {'id': 'p1', 'first_name': 'Ada', 'last_name': None, 'last_name_obfuscated': 'L***',
+     'title': 'Technical Recruiter', 'organization': {'name': 'Stripe', 'domain': 'stripe.com'},
+     'city': 'Dublin', 'state': None, 'country': 'Ireland', 'has_email': True},
+    # Masked last name, last_name left out
+    {'id': 'p2', 'first_name': 'Grace', 'last_name_obfuscated': 'H***', 'title': 'Engineering Manager'},
+    # Enriched person: real last name wins over the masked one
+    {'id': 'p3', 'first_name': 'Alan', 'last_name': 'Turing', 'last_name_obfuscated': 'T***',
+     'phone_numbers': [{'sanitized_number': '+15550100', 'raw_number': '555-0100'}],
+     'has_direct_phone': 'Yes'},
+    # No last name at all: name falls back to the first name
+    {'id': 'p4', 'first_name': 'Linus', 'last_name': None, 'last_name_obfuscated': None,
+     'organization': None, 'organization_name': 'Kernel', 'organization_domain': 'kernel.org',
+     'city': 'Portland', 'country': 'Portland'},
+    # Only a display name
+    {'id': 'p5', 'name': 'Someone', 'first_name': None, 'last_name': None, 'phone_number': '555-0199'},
+]
+
+
+def _dict_path(people):
+    return [ContactRecord.from_dict(extract_contact_data(person)) for person in people]
+
+
+def test_dict_path_falls_back_to_obfuscated_last_name():
+    contacts = _dict_path(PEOPLE)
+    assert [c['last_name'] for c in contacts[:3]] == ['L***', 'H***', 'Turing']
+    assert contacts[0]['name'] == 'Ada L***'
+    assert contacts[3]['name'] == 'Linus'
+    assert contacts[4]['name'] == 'Someone'
+
+
+@pytest.mark.parametrize('person', PEOPLE, ids=[p['id'] for p in PEOPLE])
+def test_struct_and_dict_paths_agree(person):
+    pytest.importorskip('msgspec')
+    body = json.dumps({'people': [person], 'pagination': {'total_pages': 3}}).encode()
+
+    page = decode_people_page(body)
+
+    assert page['total_pages'] == 3
+    assert page['contacts'][0].to_dict() == _dict_path([person])[0].to_dict()
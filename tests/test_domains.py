@@ -0,0 +1,74 @@
+"""
+Tests for company domain normalization.
+
+Run with: python -m pytest tests/test_domains.py
+"""
+import pytest
+
+from apollo import domains
+from apollo.domains import canonical_domain, is_public_suffix, normalize_host, registrable_domain
+
+
+@pytest.fixture
+def no_psl(monkeypatch):
+    """Behave as if the publicsuffixlist package is not installed."""
+    monkeypatch.setattr(domains, 'PublicSuffixList', None)
+    monkeypatch.setattr(domains, '_psl', None)
+
+
+@pytest.mark.parametrize('value, host', [
+    ('https://Careers.Stripe.com:443/jobs?x=1', 'careers.stripe.com'),
+    ('user:pw@www.acme.io/', 'www.acme.io'),
+    ('stripe.com.', 'stripe.com'),
+    ('bücher.de', 'xn--bcher-kva.de'),
+    ('', ''),
+    ('   ', ''),
+])
+def test_normalize_host(value, host):
+    assert normalize_host(value) == host
+
+
+@pytest.mark.parametrize('host', ['localhost', '10.0.0.1', ''])
+def test_registrable_domain_keeps_ips_and_single_labels(host):
+    assert registrable_domain(host) == host
+
+
+@pytest.mark.parametrize('host, expected', [
+    ('careers.bbc.co.uk', 'bbc.co.uk'),
+    ('www.stripe.com', 'stripe.com'),
+    ('a.b.c.stripe.com', 'stripe.com'),
+    # Shared multi-label suffixes must not merge different companies
+    ('acme.com.do', 'acme.com.do'),
+    ('beta.com.do', 'beta.com.do'),
+    ('foo.s3.amazonaws.com', 'foo.s3.amazonaws.com'),
+    # A public suffix is returned unchanged
+    ('co.uk', 'co.uk'),
+])
+def test_registrable_domain_with_psl(host, expected):
+    pytest.importorskip('publicsuffixlist')
+    assert registrable_domain(host) == expected
+
+
+def test_registrable_domain_without_psl_only_strips_www(no_psl):
+    assert registrable_domain('www.stripe.com') == 'stripe.com'
+    assert registrable_domain('careers.stripe.com') == 'careers.stripe.com'
+    assert registrable_domain('acme.com.do') == 'acme.com.do'
+    assert registrable_domain('www.com') == 'www.com'
+
+
+def test_is_public_suffix():
+    assert is_public_suffix('com')
+    assert is_public_suffix('')
+    if domains.PublicSuffixList is not None:
+        assert is_public_suffix('co.uk')
+        assert is_public_suffix('com.do')
+    assert not is_public_suffix('stripe.com')
+
+
+def test_is_public_suffix_without_psl(no_psl):
+    assert not is_public_suffix('co.uk')
+
+
+def test_canonical_domain():
+    assert canonical_domain('https://www.Stripe.com:8443/') == 'stripe.com'
+    assert canonical_domain(None) == ''
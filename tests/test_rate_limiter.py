@@ -0,0 +1,57 @@
+"""
+Tests for the token-bucket rate limiter.
+
+Run with: python -m pytest tests/test_rate_limiter.py
+"""
+import types
+
+import pytest
+
+from apollo import rate_limiter
+from apollo.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock; sleeping advances it and is recorded."""
+    state = types.SimpleNamespace(now=0.0, sleeps=[])
+
+    def sleep(seconds):
+        state.sleeps.append(seconds)
+        state.now += seconds
+
+    monkeypatch.setattr(rate_limiter, 'time', types.SimpleNamespace(monotonic=lambda: state.now, sleep=sleep))
+    return state
+
+
+def test_burst_then_sustained_rate(clock):
+    limiter = RateLimiter(rate_per_second=2, burst=3)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_tokens_refill_up_to_capacity(clock):
+    limiter = RateLimiter(rate_per_second=1, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+    clock.now += 60
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == []
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_per_minute():
+    limiter = RateLimiter.per_minute(120, burst=0)
+    assert limiter.rate == 2
+    assert limiter.capacity == 1
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
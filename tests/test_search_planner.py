@@ -0,0 +1,75 @@
+"""
+Tests for people-search planning.
+
+Run with: python -m pytest tests/test_search_planner.py
+"""
+from config import RoleFilterIndex
+from apollo.search_planner import MAX_PAGES, RoleYieldStats, plan_search
+
+ROLE_FILTERS = RoleFilterIndex({
+    'recruiter': {'titles': [f'Recruiter {i}' for i in range(30)], 'seniorities': ['senior']},
+    'cto': {'titles': [f'CTO {i}' for i in range(30)], 'seniorities': ['c_suite']},
+    'small': {'titles': ['Tiny'], 'seniorities': []},
+})
+
+
+def _stats(**yields):
+    stats = RoleYieldStats()
+    for role, found in yields.items():
+        stats.record([role], found, limit=None)
+    return stats
+
+
+def test_per_page_sized_from_max_results():
+    plan = plan_search(['recruiter'], 'stripe.com', ROLE_FILTERS, max_results=10)
+    assert len(plan.queries) == 1
+    query = plan.queries[0]
+    assert query['per_page'] == 10
+    assert query['organization_domains'] == ['stripe.com']
+    assert query['include_similar_titles'] is True
+    assert query['person_seniorities'] == ('senior',)
+    assert plan.limits == [10]
+    assert plan.max_pages == MAX_PAGES
+
+
+def test_incremental_keeps_full_pages():
+    plan = plan_search(['recruiter'], 'stripe.com', ROLE_FILTERS, max_results=10, incremental=True)
+    assert plan.queries[0]['per_page'] == 100
+
+
+def test_organization_id_preferred_over_domain():
+    plan = plan_search(['cto'], 'stripe.com', ROLE_FILTERS, company_info={'organization_id': 'org-1'})
+    assert plan.queries[0]['organization_ids'] == ['org-1']
+    assert 'organization_domains' not in plan.queries[0]
+
+
+def test_no_split_without_learned_yields():
+    plan = plan_search(['recruiter', 'cto'], 'stripe.com', ROLE_FILTERS, max_results=500,
+                       stats=_stats(recruiter=300))
+    assert plan.reason == 'single query'
+
+
+def test_split_by_role_when_it_needs_fewer_rounds():
+    plan = plan_search(['recruiter', 'cto'], 'stripe.com', ROLE_FILTERS, max_results=400,
+                       stats=_stats(recruiter=200, cto=200))
+    assert plan.reason.startswith('split by role')
+    assert [q['person_titles'][0] for q in plan.queries] == ['Recruiter 0', 'CTO 0']
+    assert plan.limits == [200, 200]
+    assert plan.expected == 400
+
+
+def test_small_searches_stay_single():
+    plan = plan_search(['recruiter', 'cto'], 'stripe.com', ROLE_FILTERS, max_results=10,
+                       stats=_stats(recruiter=5, cto=5))
+    assert plan.reason == 'single query'
+
+
+def test_role_yield_stats_skip_searches_cut_by_their_limit():
+    stats = RoleYieldStats(max_samples=2)
+    stats.record(['Recruiter', 'cto'], 10)
+    stats.record(['recruiter'], 50, limit=50)
+    assert stats.expected('recruiter') == 5
+    stats.record(['recruiter'], 7)
+    stats.record(['recruiter'], 9)
+    assert stats.expected('recruiter') == 8
+    assert stats.expected('ceo') is None
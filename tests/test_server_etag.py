@@ -0,0 +1,40 @@
+"""
+Tests for the company contacts ETag.
+
+Run with: python -m pytest tests/test_server_etag.py
+(needs the server dependencies from requirements.txt)
+"""
+import types
+
+import pytest
+
+for module in ('fastapi', 'sqlalchemy', 'requests'):
+    pytest.importorskip(module)
+
+from server import company_contacts_etag, etag_matches  # noqa: E402
+
+ETAG = 'W/"0123456789abcdef0123"'
+
+
+@pytest.mark.parametrize('header', [
+    ETAG,
+    '"0123456789abcdef0123"',
+    'W/"other", ' + ETAG,
+    ' * ',
+])
+def test_etag_matches(header):
+    assert etag_matches(ETAG, header)
+
+
+@pytest.mark.parametrize('header', ['', 'W/"other"', '"0123456789abcdef012"'])
+def test_etag_does_not_match(header):
+    assert not etag_matches(ETAG, header)
+
+
+def test_company_contacts_etag_changes_with_contacts():
+    company = types.SimpleNamespace(id=1, updated_at='2024-01-01')
+    etag = company_contacts_etag(company, 3, '2024-01-02')
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == company_contacts_etag(company, 3, '2024-01-02')
+    assert etag != company_contacts_etag(company, 4, '2024-01-02')
+    assert etag != company_contacts_etag(company, 3, '2024-01-03')
@@ -0,0 +1,74 @@
+"""
+Tests for the local job title classifier.
+
+Run with: python -m pytest tests/test_title_classifier.py
+"""
+import pytest
+
+from apollo.title_classifier import TitleClassifier, normalize_job_title
+
+MAPPINGS = {
+    'recruiter': {
+        'titles': ['Recruiter', 'Technical Recruiter', 'Talent Acquisition Manager'],
+        'seniorities': ['senior', 'manager'],
+    },
+    'cto': {'titles': ['CTO', 'Chief Technology Officer', 'VP of Engineering'], 'seniorities': ['c_suite', 'vp']},
+}
+
+
+@pytest.fixture
+def classifier():
+    return TitleClassifier(MAPPINGS)
+
+
+@pytest.mark.parametrize('title, normalized', [
+    ('Sr. Mgr, Talent Acquisition', 'senior manager talent acquisition'),
+    ('Vice President of Engineering', 'vp engineering'),
+    ('Co-Founder & CEO', 'co founder ceo'),
+    (None, ''),
+])
+def test_normalize_job_title(title, normalized):
+    assert normalize_job_title(title) == normalized
+
+
+def test_whole_title_match_scores_one(classifier):
+    match = classifier.classify('Technical Recruiter')
+    assert (match.role, match.score) == ('recruiter', 1.0)
+    assert classifier.classify('VP, Engineering').role == 'cto'
+
+
+def test_partial_match_scores_by_coverage_and_seniority(classifier):
+    match = classifier.classify('Senior Technical Recruiter')
+    assert match.role == 'recruiter'
+    assert match.seniority == 'senior'
+    # 0.4 + 0.6 * 19/26 covered, + 0.1 for an allowed seniority
+    assert match.score == pytest.approx(0.938)
+
+
+def test_longest_phrase_wins(classifier):
+    assert classifier.classify('Technical Recruiter').scores == {'recruiter': 1.0}
+
+
+def test_junior_marker_outside_phrase_halves_score(classifier):
+    match = classifier.classify('Recruiter Intern')
+    assert match.seniority == 'intern'
+    assert match.score == pytest.approx((0.4 + 0.6 * 9 / 16) * 0.5, abs=1e-3)
+
+
+def test_most_senior_level_and_fallback(classifier):
+    assert classifier.classify('Co-Founder & CTO').seniority == 'founder'
+    assert classifier.classify('Staff Recruiter').seniority == 'senior'
+    assert classifier.classify('Recruiter', seniority='manager').seniority == 'manager'
+
+
+def test_no_match_and_role_filter(classifier):
+    match = classifier.classify('Office Dog')
+    assert (match.role, match.score, match.scores) == (None, 0.0, {})
+    assert classifier.classify('CTO', roles=['recruiter']).role is None
+
+
+def test_rank_is_stable_best_first(classifier):
+    contacts = [{'title': 'Barista'}, {'title': 'Technical Recruiter'},
+                {'title': 'Senior Recruiter'}, {'title': 'Chef'}]
+    ranked = classifier.rank(contacts, ['recruiter'])
+    assert [c['title'] for c in ranked] == ['Technical Recruiter', 'Senior Recruiter', 'Barista', 'Chef']